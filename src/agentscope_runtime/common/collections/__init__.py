@@ -2,21 +2,27 @@
 from .base_mapping import Mapping
 from .base_set import SetCollection
 from .base_queue import Queue
+from .base_bindings import SessionBindings
 from .redis_set import RedisSetCollection
 from .redis_queue import RedisQueue
 from .redis_mapping import RedisMapping
+from .redis_bindings import RedisSessionBindings
 from .in_memory_queue import InMemoryQueue
 from .in_memory_set import InMemorySetCollection
 from .in_memory_mapping import InMemoryMapping
+from .in_memory_bindings import InMemorySessionBindings
 
 __all__ = [
     "Mapping",
     "SetCollection",
     "Queue",
+    "SessionBindings",
     "RedisSetCollection",
     "RedisQueue",
     "RedisMapping",
+    "RedisSessionBindings",
     "InMemoryQueue",
     "InMemorySetCollection",
     "InMemoryMapping",
+    "InMemorySessionBindings",
 ]
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from .base_queue import Queue
+
+
+class SessionBindings(ABC):
+    """
+    Atomic updates of the container, session and access mappings of a
+    sandbox manager: a container is registered under its name, listed by
+    the session it is bound to, and has a last access time.
+
+    Each operation is applied as a whole, so that managers sharing these
+    mappings never lose a container of a session list.
+    """
+
+    @abstractmethod
+    def bind(
+        self,
+        container: dict,
+        session_ctx_id: Optional[str] = None,
+        accessed_at: Optional[float] = None,
+    ):
+        """
+        Register a container, add it to the list of its session and record
+        its last access time, the latter two when given.
+        """
+
+    @abstractmethod
+    def bind_from_pool(
+        self,
+        queue: Queue,
+        meta: Optional[dict] = None,
+        accessed_at: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[dict]:
+        """
+        Dequeue a container from a pool and bind it. A container without
+        meta is given ``meta``, and bound to its ``session_ctx_id``.
+
+        With a timeout, an empty pool is waited on for up to ``timeout``
+        seconds.
+
+        Returns:
+            The container, None if the pool is (still) empty.
+        """
+
+    @abstractmethod
+    def unbind(
+        self,
+        container_name: str,
+        session_ctx_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Unregister a container, forget its last access time and remove it
+        from the list of its session, deleted once empty.
+
+        Returns:
+            Whether the container was registered.
+        """
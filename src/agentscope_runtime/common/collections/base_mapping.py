@@ -18,3 +18,10 @@ class Mapping(ABC):
     @abstractmethod
     def scan(self, prefix: str):
         pass
+
+    def scan_items(self, prefix: str = ""):
+        """Yield the ``(key, value)`` pairs whose key starts with prefix."""
+        for key in self.scan(prefix):
+            value = self.get(key)
+            if value is not None:
+                yield key, value
@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
 # file: base_queue.py
 from abc import ABC, abstractmethod
+from typing import Optional
 
 
 class Queue(ABC):
     @abstractmethod
-    def enqueue(self, item: dict):
-        pass
+    def enqueue(self, item: dict) -> bool:
+        """Append an item, unless the queue is full. Returns whether it was
+        appended."""
 
     @abstractmethod
-    def dequeue(self) -> dict:
-        pass
+    def dequeue(self, timeout: Optional[float] = None) -> dict:
+        """Pop the first item, None if the queue is empty. With a timeout,
+        wait up to ``timeout`` seconds for an item first."""
 
     @abstractmethod
     def peek(self) -> dict:
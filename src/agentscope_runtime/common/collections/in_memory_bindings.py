@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import Optional
+
+from .base_bindings import SessionBindings
+from .base_queue import Queue
+from .in_memory_mapping import InMemoryMapping
+
+
+class InMemorySessionBindings(SessionBindings):
+    def __init__(
+        self,
+        container_mapping: InMemoryMapping,
+        session_mapping: InMemoryMapping,
+        access_mapping: InMemoryMapping,
+    ):
+        self.container_mapping = container_mapping
+        self.session_mapping = session_mapping
+        self.access_mapping = access_mapping
+        self._lock = threading.Lock()
+
+    def bind(
+        self,
+        container: dict,
+        session_ctx_id: Optional[str] = None,
+        accessed_at: Optional[float] = None,
+    ):
+        with self._lock:
+            self._bind(container, session_ctx_id, accessed_at)
+
+    def bind_from_pool(
+        self,
+        queue: Queue,
+        meta: Optional[dict] = None,
+        accessed_at: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[dict]:
+        # The queue is thread-safe: a dequeued container belongs to this
+        # call alone
+        container = queue.dequeue(timeout=timeout)
+        if not container:
+            return None
+
+        with self._lock:
+            session_ctx_id = None
+            if meta and not container.get("meta"):
+                container = {**container, "meta": meta}
+                session_ctx_id = meta.get("session_ctx_id")
+            self._bind(container, session_ctx_id, accessed_at)
+            return container
+
+    def unbind(
+        self,
+        container_name: str,
+        session_ctx_id: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            registered = self.container_mapping.get(container_name) is not None
+            self.container_mapping.delete(container_name)
+            self.access_mapping.delete(container_name)
+
+            if session_ctx_id:
+                env_ids = [
+                    eid
+                    for eid in self.session_mapping.get(session_ctx_id) or []
+                    if eid != container_name
+                ]
+                if env_ids:
+                    self.session_mapping.set(session_ctx_id, env_ids)
+                else:
+                    self.session_mapping.delete(session_ctx_id)
+            return registered
+
+    def _bind(self, container, session_ctx_id, accessed_at):
+        container_name = container["container_name"]
+        self.container_mapping.set(container_name, container)
+        if accessed_at is not None:
+            self.access_mapping.set(container_name, accessed_at)
+        if session_ctx_id:
+            env_ids = self.session_mapping.get(session_ctx_id) or []
+            if container_name not in env_ids:
+                self.session_mapping.set(
+                    session_ctx_id,
+                    env_ids + [container_name],
+                )
@@ -25,3 +25,10 @@ class InMemoryMapping(Mapping):
             yield from list(
                 key for key in self.store if key.startswith(prefix)
             )
+
+    def scan_items(self, prefix: str = ""):
+        yield from [
+            (key, value)
+            for key, value in self.store.items()
+            if key.startswith(prefix or "")
+        ]
@@ -1,24 +1,41 @@
 # -*- coding: utf-8 -*-
 # file: in_memory_queue.py
+import threading
+from collections import deque
+from typing import Optional
+
 from .base_queue import Queue
 
 
 class InMemoryQueue(Queue):
-    def __init__(self):
-        self.queue = []
+    """Thread-safe FIFO queue, holding up to ``maxsize`` items if set."""
+
+    def __init__(self, maxsize: int = 0):
+        self.queue = deque()
+        self.maxsize = maxsize
+        self._not_empty = threading.Condition(threading.Lock())
 
-    def enqueue(self, item: dict):
-        self.queue.append(item)
+    def enqueue(self, item: dict) -> bool:
+        with self._not_empty:
+            if 0 < self.maxsize <= len(self.queue):
+                return False
+            self.queue.append(item)
+            self._not_empty.notify()
+            return True
 
-    def dequeue(self):
-        if self.queue:
-            return self.queue.pop(0)
-        return None
+    def dequeue(self, timeout: Optional[float] = None):
+        with self._not_empty:
+            if timeout:
+                self._not_empty.wait_for(lambda: self.queue, timeout)
+            if self.queue:
+                return self.queue.popleft()
+            return None
 
     def peek(self):
-        if self.queue:
-            return self.queue[0]
-        return None
+        with self._not_empty:
+            if self.queue:
+                return self.queue[0]
+            return None
 
     def is_empty(self) -> bool:
         return len(self.queue) == 0
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import json
+from typing import Optional
+
+from .base_bindings import SessionBindings
+from .redis_mapping import RedisMapping
+from .redis_queue import RedisQueue
+
+# Add ARGV[1] to the JSON list of container names stored at KEYS[1]
+_ADD_TO_SESSION = """
+local function add_to_session(key, name)
+    local raw = redis.call('GET', key)
+    local names = raw and cjson.decode(raw) or {}
+    for _, other in ipairs(names) do
+        if other == name then
+            return
+        end
+    end
+    table.insert(names, name)
+    redis.call('SET', key, cjson.encode(names))
+end
+"""
+
+# Store the container ARGV[2], named ARGV[1], at KEYS[1], its last access
+# time ARGV[3] (unless empty) at KEYS[2], and add it to the session list at
+# KEYS[3], if any.
+_BIND_SCRIPT = (
+    _ADD_TO_SESSION
+    + """
+redis.call('SET', KEYS[1], ARGV[2])
+if ARGV[3] ~= '' then
+    redis.call('SET', KEYS[2], ARGV[3])
+end
+if KEYS[3] then
+    add_to_session(KEYS[3], ARGV[1])
+end
+return 1
+"""
+)
+
+# Delete the container at KEYS[1] and its last access time at KEYS[2], and
+# remove its name ARGV[1] from the session list at KEYS[3], if any, deleted
+# once empty. Returns whether the container existed.
+_UNBIND_SCRIPT = """
+local removed = redis.call('DEL', KEYS[1])
+redis.call('DEL', KEYS[2])
+if KEYS[3] then
+    local raw = redis.call('GET', KEYS[3])
+    if raw then
+        local kept = {}
+        for _, name in ipairs(cjson.decode(raw)) do
+            if name ~= ARGV[1] then
+                table.insert(kept, name)
+            end
+        end
+        if #kept > 0 then
+            redis.call('SET', KEYS[3], cjson.encode(kept))
+        else
+            redis.call('DEL', KEYS[3])
+        end
+    end
+end
+return removed
+"""
+
+
+class RedisSessionBindings(SessionBindings):
+    """
+    Session bindings kept in Redis, bindings being written by Lua scripts:
+    a single round trip, atomic with regard to the other managers sharing
+    the same Redis server.
+
+    A container is taken out of a pool by LPOP or BLPOP, which hands it to
+    a single manager, and then bound by a script.
+    """
+
+    def __init__(
+        self,
+        container_mapping: RedisMapping,
+        session_mapping: RedisMapping,
+        access_mapping: RedisMapping,
+    ):
+        self.container_mapping = container_mapping
+        self.session_mapping = session_mapping
+        self.access_mapping = access_mapping
+
+        client = container_mapping.client
+        self._bind = client.register_script(_BIND_SCRIPT)
+        self._unbind = client.register_script(_UNBIND_SCRIPT)
+
+    def bind(
+        self,
+        container: dict,
+        session_ctx_id: Optional[str] = None,
+        accessed_at: Optional[float] = None,
+    ):
+        container_name = container["container_name"]
+        self._bind(
+            keys=self._keys(container_name, session_ctx_id),
+            args=[
+                container_name,
+                json.dumps(container),
+                self._dumps(accessed_at),
+            ],
+        )
+
+    def bind_from_pool(
+        self,
+        queue: RedisQueue,
+        meta: Optional[dict] = None,
+        accessed_at: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[dict]:
+        container = queue.dequeue(timeout=timeout)
+        if not container:
+            return None
+        if meta and not container.get("meta"):
+            container = {**container, "meta": meta}
+            self.bind(container, meta.get("session_ctx_id"), accessed_at)
+        elif accessed_at is not None:
+            self.access_mapping.set(container["container_name"], accessed_at)
+        return container
+
+    def unbind(
+        self,
+        container_name: str,
+        session_ctx_id: Optional[str] = None,
+    ) -> bool:
+        return bool(
+            self._unbind(
+                keys=self._keys(container_name, session_ctx_id),
+                args=[container_name],
+            ),
+        )
+
+    def _keys(self, container_name, session_ctx_id):
+        keys = [
+            self.container_mapping.prefix + container_name,
+            self.access_mapping.prefix + container_name,
+        ]
+        if session_ctx_id:
+            keys.append(self.session_mapping.prefix + session_ctx_id)
+        return keys
+
+    @staticmethod
+    def _dumps(accessed_at):
+        return json.dumps(accessed_at) if accessed_at is not None else ""
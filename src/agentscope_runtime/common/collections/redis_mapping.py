@@ -7,9 +7,18 @@ from .base_mapping import Mapping
 
 
 class RedisMapping(Mapping):
-    def __init__(self, redis_client, prefix: str = ""):
+    """
+    Mapping of JSON values stored in Redis, under ``prefix``.
+
+    ``scan`` and ``scan_items`` iterate over the keys with SCAN, asking for
+    ``scan_count`` keys per round trip. As with SCAN, a key may be yielded
+    more than once, and keys added or removed meanwhile may be missed.
+    """
+
+    def __init__(self, redis_client, prefix: str = "", scan_count: int = 1000):
         self.client = redis_client
         self.prefix = prefix.rstrip(":") + ":" if prefix else ""
+        self.scan_count = scan_count
 
     def _get_full_key(self, key: str) -> str:
         return f"{self.prefix}{key}"
@@ -30,13 +39,34 @@ class RedisMapping(Mapping):
         self.client.delete(self._get_full_key(key))
 
     def scan(self, prefix: str = ""):
-        search_pattern = f"{self._get_full_key(prefix)}*"
-        cursor = 0
+        for keys in self._scan_pages(prefix):
+            for key in keys:
+                yield self._strip_prefix(key)
+
+    def scan_items(self, prefix: str = ""):
+        # One MGET per page of keys
+        for keys in self._scan_pages(prefix):
+            for key, value in zip(keys, self.client.mget(keys)):
+                # Deleted meanwhile, or not a string
+                if value is not None:
+                    yield self._strip_prefix(key), json.loads(value)
+
+    def _scan_pages(self, prefix):
+        """Yield the non-empty pages of full keys starting with prefix."""
+        search_pattern = f"{_escape_pattern(self._get_full_key(prefix))}*"
+        cursor = None
         while cursor != 0:
             cursor, keys = self.client.scan(
-                cursor=cursor,
+                cursor=cursor or 0,
                 match=search_pattern,
+                count=self.scan_count,
             )
-            for key in keys:
-                decoded_key = key.decode("utf-8")
-                yield self._strip_prefix(decoded_key)
+            if keys:
+                yield keys
+
+
+def _escape_pattern(text: str) -> str:
+    """Escape the glob-style special characters of a SCAN pattern."""
+    for char in "\\*?[]":
+        text = text.replace(char, f"\\{char}")
+    return text
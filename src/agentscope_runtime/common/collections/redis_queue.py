@@ -1,19 +1,53 @@
 # -*- coding: utf-8 -*-
 # file: redis_queue.py
 import json
+from typing import Optional
+
 from .base_queue import Queue
 
+# Push ARGV[2] to the list KEYS[1] unless it holds ARGV[1] items already
+_BOUNDED_PUSH_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('RPUSH', KEYS[1], ARGV[2])
+return 1
+"""
+
 
 class RedisQueue(Queue):
-    def __init__(self, redis_client, queue_name: str):
+    """
+    FIFO queue stored in a Redis list, holding up to ``maxsize`` items if
+    set. A blocking dequeue waits with BLPOP.
+    """
+
+    def __init__(self, redis_client, queue_name: str, maxsize: int = 0):
         self.client = redis_client
         self.queue_name = queue_name
+        self.maxsize = maxsize
+        self._bounded_push = (
+            redis_client.register_script(_BOUNDED_PUSH_SCRIPT)
+            if maxsize > 0
+            else None
+        )
 
-    def enqueue(self, item: dict):
-        self.client.rpush(self.queue_name, json.dumps(item))
+    def enqueue(self, item: dict) -> bool:
+        if self._bounded_push is None:
+            self.client.rpush(self.queue_name, json.dumps(item))
+            return True
+        return bool(
+            self._bounded_push(
+                keys=[self.queue_name],
+                args=[self.maxsize, json.dumps(item)],
+            ),
+        )
 
-    def dequeue(self) -> dict:
-        item = self.client.lpop(self.queue_name)
+    def dequeue(self, timeout: Optional[float] = None) -> dict:
+        if timeout:
+            popped = self.client.blpop([self.queue_name], timeout=timeout)
+            item = popped[1] if popped else None
+        else:
+            item = self.client.lpop(self.queue_name)
         return json.loads(item) if item is not None else None
 
     def peek(self) -> dict:
@@ -37,3 +37,13 @@ class BaseClient(ABC):
     @abstractmethod
     def get_status(self, container_id):
         """Get the current status of the specified container."""
+
+    def inspect_status(self, container_id):
+        """
+        Get the status of the specified container, bypassing any cache.
+        Used right after a creation, before its events are received.
+        """
+        return self.get_status(container_id)
+
+    def close(self):
+        """Release the resources held by the client."""
@@ -2,13 +2,16 @@
 import traceback
 import logging
 import socket
+import threading
+import time
+from typing import Dict, Iterable
 
 import docker
 
 from .base_client import BaseClient
+from .port_allocator import InMemoryPortAllocator, RedisPortAllocator
+from .status_cache import ContainerStatusCache, DELETED
 from ..collections import (
-    RedisSetCollection,
-    InMemorySetCollection,
     RedisMapping,
     InMemoryMapping,
 )
@@ -16,6 +19,174 @@ from ..collections import (
 
 logger = logging.getLogger(__name__)
 
+# Container status after each Docker event action, None when removed
+EVENT_STATUS = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "destroy": None,
+}
+
+
+def _normalize_image(image: str) -> str:
+    """Return an image reference with its implicit ``latest`` tag."""
+    if "@" in image or ":" in image.rsplit("/", 1)[-1]:
+        return image
+    return f"{image}:latest"
+
+
+class ImageCache:
+    """
+    Process-wide record of the Docker images verified to be present
+    locally, mapping image references to image ids.
+
+    Entries are dropped on the image events of the daemon (pull, tag,
+    untag, delete), so a reference is checked again after it changed.
+    Verifications and pulls of one reference are serialized, so concurrent
+    creations pull a missing image only once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._images: Dict[str, str] = {}
+        self._ref_locks: Dict[str, threading.Lock] = {}
+
+    def __contains__(self, image: str) -> bool:
+        return _normalize_image(image) in self._images
+
+    def lock(self, image: str) -> threading.Lock:
+        """Return the lock serializing the checks of an image."""
+        with self._lock:
+            return self._ref_locks.setdefault(
+                _normalize_image(image),
+                threading.Lock(),
+            )
+
+    def add(self, image: str, image_id: str) -> None:
+        with self._lock:
+            self._images[_normalize_image(image)] = image_id
+
+    def discard(self, image: str) -> None:
+        with self._lock:
+            self._images.pop(_normalize_image(image), None)
+
+    def discard_id(self, image_id: str) -> None:
+        """Drop every reference to an image id."""
+        with self._lock:
+            for ref, cached_id in list(self._images.items()):
+                if cached_id == image_id:
+                    del self._images[ref]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+
+
+IMAGE_CACHE = ImageCache()
+
+
+class DockerStatusWatch:
+    """
+    Process-wide follower of the Docker events stream, shared by the
+    ``DockerClient`` instances of a process.
+
+    Container statuses are cached from the events, and image events drop
+    the matching ``IMAGE_CACHE`` entries. The watcher thread is started by
+    the first status lookup and stopped once every client is closed, so
+    short-lived clients neither start a watcher nor each run their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = 0
+        self._cache = None
+
+    def acquire(self) -> None:
+        """Register a client."""
+        with self._lock:
+            self._users += 1
+
+    def release(self) -> None:
+        """Unregister a client, stopping the watcher after the last one."""
+        with self._lock:
+            self._users = max(self._users - 1, 0)
+            if self._users or self._cache is None:
+                return
+            cache, self._cache = self._cache, None
+        cache.stop()
+
+    @property
+    def status_cache(self) -> ContainerStatusCache:
+        """The status cache, started on first use."""
+        with self._lock:
+            if self._cache is None:
+                client = docker.from_env()
+                self._cache = ContainerStatusCache(
+                    fetch=lambda container_id: _inspect_status(
+                        client,
+                        container_id,
+                    ),
+                    watch=lambda: client.events(
+                        decode=True,
+                        filters={"type": ["container", "image"]},
+                    ),
+                    parse=self._parse_event,
+                    name="docker-status-watch",
+                )
+                self._cache.start()
+            return self._cache
+
+    def get(self, container_id):
+        return self.status_cache.get(container_id)
+
+    def invalidate(self, *keys) -> None:
+        """Forget the status of a container, if it is being followed."""
+        cache = self._cache
+        if cache is None:
+            return
+        for key in keys:
+            if key:
+                cache.invalidate(key)
+
+    def _parse_event(self, event):
+        action = event.get("Action", "")
+        actor = event.get("Actor") or {}
+        if event.get("Type") == "image":
+            self._on_image_event(action, actor)
+            return None
+        if action not in EVENT_STATUS:
+            return None
+        keys = (actor.get("ID"), (actor.get("Attributes") or {}).get("name"))
+        status = EVENT_STATUS[action]
+        return keys, DELETED if status is None else status
+
+    @staticmethod
+    def _on_image_event(action, actor):
+        name = (actor.get("Attributes") or {}).get("name")
+        if action in ("delete", "untag"):
+            IMAGE_CACHE.discard_id(actor.get("ID"))
+            if name:
+                IMAGE_CACHE.discard(name)
+        elif action in ("pull", "tag", "import", "load"):
+            # The reference may point to another image id now
+            for ref in (actor.get("ID"), name):
+                if ref:
+                    IMAGE_CACHE.discard(ref)
+
+
+STATUS_WATCH = DockerStatusWatch()
+
+
+def _inspect_status(client, container_id):
+    """Return the status of a container, None if it cannot be inspected."""
+    try:
+        return client.containers.get(container_id).attrs["State"]["Status"]
+    except Exception:
+        return None
+
 
 def is_port_available(port):
     """
@@ -60,18 +231,23 @@ class DockerClient(BaseClient):
                     "Unable to connect to the Redis server.",
                 ) from e
 
-            self.port_set = RedisSetCollection(
+            self.port_allocator = RedisPortAllocator(
                 redis_client,
-                set_name=self.config.redis_port_key,
+                port_range=self.port_range,
+                key=self.config.redis_port_key,
             )
             self.ports_cache = RedisMapping(
                 redis_client,
                 prefix=self.config.redis_port_key,
             )
         else:
-            self.port_set = InMemorySetCollection()
+            self.port_allocator = InMemoryPortAllocator(self.port_range)
             self.ports_cache = InMemoryMapping()
 
+        self.port_reconcile_interval = self.config.port_reconcile_interval
+        self._reconcile_lock = threading.Lock()
+        self._last_reconcile = 0.0
+
         try:
             self.client = docker.from_env()
         except Exception as e:
@@ -84,6 +260,20 @@ class DockerClient(BaseClient):
                 "export DOCKER_HOST=unix://$HOME/.colima/docker.sock",
             ) from e
 
+        self.image_cache = IMAGE_CACHE
+
+        # Container statuses and image changes are followed through the
+        # Docker events stream, by one watcher per process
+        self.status_watch = STATUS_WATCH
+        self.status_watch.acquire()
+        self._closed = False
+
+    def close(self):
+        """Stop following the Docker events, unless other clients do."""
+        if not self._closed:
+            self._closed = True
+            self.status_watch.release()
+
     def create(
         self,
         image,
@@ -99,15 +289,56 @@ class DockerClient(BaseClient):
 
         port_mapping = {}
 
-        if ports:
-            free_port = self._find_free_ports(len(ports))
-            for container_port, host_port in zip(ports, free_port):
-                port_mapping[container_port] = host_port
-
         try:
+            if not self.ensure_image(image):
+                return None, None, None
+
+            if ports:
+                self._maybe_reconcile_ports()
+                free_port = self._find_free_ports(len(ports))
+                for container_port, host_port in zip(ports, free_port):
+                    port_mapping[container_port] = host_port
+
+            # Create and run the container
+            container = self.client.containers.run(
+                image,
+                detach=True,
+                ports=port_mapping,
+                name=name,
+                volumes=volumes,
+                environment=environment,
+                **runtime_config,
+            )
+            container.reload()
+            _id = container.id
+            # A container of the same name may have been followed before
+            self.status_watch.invalidate(_id, name)
+
+            self.ports_cache.set(_id, list(port_mapping.values()))
+
+            return _id, list(port_mapping.values()), "localhost"
+        except Exception as e:
+            self.port_allocator.release(port_mapping.values())
+            # The image may be the culprit, check it again next time
+            self.image_cache.discard(image)
+            logger.warning(f"An error occurred: {e}")
+            logger.debug(f"{traceback.format_exc()}")
+            return None, None, None
+
+    def ensure_image(self, image):
+        """
+        Make sure an image is present locally, pulling it if needed.
+        Images already verified by this process are not checked again.
+        """
+        if image in self.image_cache:
+            return True
+
+        with self.image_cache.lock(image):
+            if image in self.image_cache:
+                return True
             try:
                 # Check if the image exists locally
-                self.client.images.get(image)
+                found = self.client.images.get(image)
                 logger.debug(f"Image '{image}' found locally.")
             except docker.errors.ImageNotFound:
                 logger.info(
@@ -119,7 +350,7 @@ class DockerClient(BaseClient):
                         f"Attempting to pull: {image}, "
                         f"it might take several minutes.",
                     )
-                    self.client.images.pull(image)
+                    found = self.client.images.pull(image)
                     logger.debug(
                         f"Image '{image}' successfully pulled.",
                     )
@@ -127,32 +358,35 @@ class DockerClient(BaseClient):
                     logger.error(
                         f"Failed to pull image '{image}': {str(e)}",
                     )
-                    return None, None, None
+                    return False
 
             except docker.errors.APIError as e:
                 logger.error(f"Error occurred while checking the image: {e}")
-                return None, None, None
+                return False
 
-            # Create and run the container
-            container = self.client.containers.run(
-                image,
-                detach=True,
-                ports=port_mapping,
-                name=name,
-                volumes=volumes,
-                environment=environment,
-                **runtime_config,
-            )
-            container.reload()
-            _id = container.id
+            self.image_cache.add(image, getattr(found, "id", None))
+            return True
 
-            self.ports_cache.set(_id, list(port_mapping.values()))
+    def prefetch_images(self, images: Iterable[str]):
+        """Pull the missing images in the background, one at a time."""
+        images = list(dict.fromkeys(image for image in images if image))
+        if not images:
+            return None
 
-            return _id, list(port_mapping.values()), "localhost"
-        except Exception as e:
-            logger.warning(f"An error occurred: {e}")
-            logger.debug(f"{traceback.format_exc()}")
-            return None, None, None
+        def prefetch():
+            for image in images:
+                try:
+                    self.ensure_image(image)
+                except Exception as e:
+                    logger.warning(f"Failed to prefetch image {image}: {e}")
+
+        thread = threading.Thread(
+            target=prefetch,
+            name="docker-image-prefetch",
+            daemon=True,
+        )
+        thread.start()
+        return thread
 
     def start(self, container_id):
         """Start a Docker container."""
@@ -162,6 +396,7 @@ class DockerClient(BaseClient):
             )
 
             container.start()
+            self.status_watch.invalidate(container_id)
             return True
         except Exception as e:
             logger.warning(f"An error occurred: {e}")
@@ -175,6 +410,7 @@ class DockerClient(BaseClient):
                 container_id,
             )
             container.stop(timeout=timeout)
+            self.status_watch.invalidate(container_id)
             return True
         except Exception as e:
             logger.warning(f"An error occurred: {e}")
@@ -192,11 +428,11 @@ class DockerClient(BaseClient):
 
             # Remove container
             container.remove(force=force)
+            self.status_watch.invalidate(container_id)
 
             # Remove ports
             if ports:
-                for host_port in ports:
-                    self.port_set.remove(host_port)
+                self.port_allocator.release(ports)
 
             return True
         except Exception as e:
@@ -216,35 +452,86 @@ class DockerClient(BaseClient):
 
     def get_status(self, container_id):
         """Get the current status of the specified container."""
-        container_attrs = self.inspect(container_id=container_id)
-        if container_attrs:
-            return container_attrs["State"]["Status"]
-        return None
+        return self.status_watch.get(container_id)
+
+    def inspect_status(self, container_id):
+        """Get the status of the specified container from Docker."""
+        return _inspect_status(self.client, container_id)
 
     def _find_free_ports(self, n):
         free_ports = []
-
-        for port in self.port_range:
-            if len(free_ports) >= n:
-                break  # We have found enough ports
-
-            if not self.port_set.add(port):
+        reconciled = False
+
+        while len(free_ports) < n:
+            candidates = self.port_allocator.allocate(n - len(free_ports))
+            if not candidates:
+                if reconciled:
+                    break
+                # Recover the ports leaked before giving up
+                self.reconcile_ports()
+                reconciled = True
                 continue
 
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                try:
-                    s.bind(("", port))
-                    free_ports.append(port)  # Port is available
-
-                except OSError:
-                    # Bind failed, port is in use
-                    self.port_set.remove(port)
-                    # Try the next one
-                    continue
+            for port in candidates:
+                if is_port_available(port):
+                    free_ports.append(port)
+                else:
+                    # Bound outside the manager: the port stays allocated
+                    # until a reconciliation finds it unused
+                    logger.debug(f"Port {port} is in use, skipping it.")
 
         if len(free_ports) < n:
+            self.port_allocator.release(free_ports)
             raise RuntimeError(
                 "Not enough free ports available in the specified range.",
             )
 
         return free_ports
+
+    def _ports_in_use(self):
+        """Return the host ports bound by the existing containers."""
+        ports = set()
+        container_ids = set()
+        for summary in self.client.api.containers(all=True):
+            container_ids.add(summary["Id"])
+            for binding in summary.get("Ports") or []:
+                if binding.get("PublicPort"):
+                    ports.add(binding["PublicPort"])
+        # Stopped containers keep the ports they were created with. Read the
+        # cache in pages rather than once per container.
+        for container_id, cached_ports in self.ports_cache.scan_items():
+            if container_id in container_ids:
+                ports.update(cached_ports or [])
+        return ports
+
+    def reconcile_ports(self):
+        """
+        Synchronize the port allocator with the ports Docker reports in use,
+        releasing the ports leaked by failed or foreign operations.
+        """
+        with self._reconcile_lock:
+            self._last_reconcile = time.monotonic()
+            try:
+                self.port_allocator.reconcile(
+                    self._ports_in_use(),
+                    grace=self.port_reconcile_interval,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to reconcile the ports in use: {e}")
+                logger.debug(f"{traceback.format_exc()}")
+
+    def _maybe_reconcile_ports(self):
+        """Reconcile the ports in the background once the interval elapsed."""
+        if (
+            self.port_reconcile_interval <= 0
+            or time.monotonic() - self._last_reconcile
+            < self.port_reconcile_interval
+            or self._reconcile_lock.locked()
+        ):
+            return
+        self._last_reconcile = time.monotonic()
+        threading.Thread(
+            target=self.reconcile_ports,
+            name="docker-port-reconciler",
+            daemon=True,
+        ).start()
@@ -9,12 +9,36 @@ from typing import Optional, Tuple
 
 from kubernetes import client
 from kubernetes import config as k8s_config
+from kubernetes import watch
 from kubernetes.client.rest import ApiException
 
 from .base_client import BaseClient
+from .status_cache import ContainerStatusCache, DELETED
 
 logger = logging.getLogger(__name__)
 
+# Label set on the pods created by the client
+POD_LABEL_SELECTOR = "created-by=kubernetes-client"
+
+
+def _pod_state(pod):
+    """Return the phase and readiness of a pod."""
+    statuses = pod.status.container_statuses
+    return {
+        "phase": pod.status.phase,
+        "ready": pod.status.phase == "Running"
+        and bool(statuses)
+        and all(container.ready for container in statuses),
+    }
+
+
+def _is_pod_settled(state):
+    return (
+        state is None
+        or state["ready"]
+        or state["phase"] in ["Failed", "Succeeded"]
+    )
+
 
 class KubernetesClient(BaseClient):
     def __init__(
@@ -52,6 +76,24 @@ class KubernetesClient(BaseClient):
                 "• For in-cluster: ensure proper RBAC permissions",
             ) from e
 
+        # Pod states are followed through a watch of the namespace
+        self.status_cache = ContainerStatusCache(
+            fetch=self._read_pod_state,
+            watch=lambda: watch.Watch().stream(
+                self.v1.list_namespaced_pod,
+                namespace=self.namespace,
+                label_selector=POD_LABEL_SELECTOR,
+                timeout_seconds=300,
+            ),
+            parse=self._parse_pod_event,
+            name="k8s-pod-watch",
+        )
+        self.status_cache.start()
+
+    def close(self):
+        """Stop watching the pods."""
+        self.status_cache.stop()
+
     def _is_local_cluster(self):
         """
         Determine if we're connected to a local Kubernetes cluster.
@@ -393,6 +435,7 @@ class KubernetesClient(BaseClient):
                 namespace=self.namespace,
                 body=delete_options,
             )
+            self.status_cache.invalidate(container_id)
             logger.debug(
                 f"Pod '{container_id}' deletion initiated with"
                 f" {grace_period}s grace period",
@@ -424,6 +467,7 @@ class KubernetesClient(BaseClient):
                 namespace=self.namespace,
                 body=delete_options,
             )
+            self.status_cache.invalidate(container_id)
             logger.debug(
                 f"Pod '{container_id}' removed"
                 f" {'forcefully' if force else 'gracefully'}",
@@ -478,11 +522,37 @@ class KubernetesClient(BaseClient):
 
     def get_status(self, container_id):
         """Get the current status of the specified pod."""
-        pod_info = self.inspect(container_id)
-        if pod_info and "status" in pod_info:
-            return pod_info["status"]["phase"].lower()
+        try:
+            state = self.status_cache.get(container_id)
+        except Exception as e:
+            logger.error(f"Failed to get pod status: {e}")
+            return None
+        if state and state["phase"]:
+            return state["phase"].lower()
         return None
 
+    def _read_pod_state(self, container_id):
+        try:
+            pod = self.v1.read_namespaced_pod(
+                name=container_id,
+                namespace=self.namespace,
+            )
+        except ApiException as e:
+            if e.status == 404:
+                return None
+            raise
+        return _pod_state(pod)
+
+    @staticmethod
+    def _parse_pod_event(event):
+        if event["type"] == "ERROR":
+            # e.g. an expired resource version, the watch is restarted
+            raise RuntimeError(f"Pod watch error: {event['raw_object']}")
+        pod = event["object"]
+        if event["type"] == "DELETED":
+            return (pod.metadata.name,), DELETED
+        return (pod.metadata.name,), _pod_state(pod)
+
     def get_logs(
         self,
         container_id,
@@ -525,31 +595,17 @@ class KubernetesClient(BaseClient):
             return []
 
     def wait_for_pod_ready(self, container_id, timeout=300):
-        """Wait for a pod to be ready."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                pod = self.v1.read_namespaced_pod(
-                    name=container_id,
-                    namespace=self.namespace,
-                )
-                if pod.status.phase == "Running":
-                    # Check if all containers are ready
-                    if pod.status.container_statuses:
-                        all_ready = all(
-                            container.ready
-                            for container in pod.status.container_statuses
-                        )
-                        if all_ready:
-                            return True
-                elif pod.status.phase in ["Failed", "Succeeded"]:
-                    return False
-                time.sleep(2)
-            except ApiException as e:
-                if e.status == 404:
-                    return False
-                time.sleep(2)
-        return False
+        """Wait for a pod to be ready, woken up by the pod watch."""
+        try:
+            state = self.status_cache.wait_for(
+                container_id,
+                _is_pod_settled,
+                timeout=timeout,
+            )
+        except ApiException as e:
+            logger.error(f"Failed to read pod '{container_id}': {e.reason}")
+            return False
+        return bool(state and state["ready"])
 
     def _create_multi_port_service(self, pod_name, port_list):
         """Create a single service with multiple ports for the pod."""
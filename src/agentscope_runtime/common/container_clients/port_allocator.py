@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Pop up to ARGV[2] ports from the free list (KEYS[1]) and mark them as
+# allocated at ARGV[1] in the allocation hash (KEYS[2]). Stale entries of the
+# free list, i.e. ports allocated in the meantime, are skipped.
+_ALLOCATE_SCRIPT = """
+local ports = {}
+local wanted = tonumber(ARGV[2])
+while #ports < wanted do
+    local port = redis.call('LPOP', KEYS[1])
+    if not port then
+        break
+    end
+    if redis.call('HSETNX', KEYS[2], port, ARGV[1]) == 1 then
+        table.insert(ports, port)
+    end
+end
+return ports
+"""
+
+# Unmark the ports of ARGV from the allocation hash (KEYS[2]) and push the
+# ones that were allocated back to the free list (KEYS[1]).
+_RELEASE_SCRIPT = """
+local released = 0
+for _, port in ipairs(ARGV) do
+    if redis.call('HDEL', KEYS[2], port) == 1 then
+        redis.call('RPUSH', KEYS[1], port)
+        released = released + 1
+    end
+end
+return released
+"""
+
+# Fill the free list (KEYS[1]) with ARGV, unless the allocator state already
+# exists.
+_INIT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 and
+        redis.call('EXISTS', KEYS[2]) == 0 then
+    for i = 1, #ARGV, 1000 do
+        redis.call('RPUSH', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+    end
+end
+return redis.call('LLEN', KEYS[1])
+"""
+
+
+class PortAllocator(ABC):
+    """
+    Allocates host ports from a fixed range in O(1).
+
+    Free ports are kept in a FIFO free-list, so a port released is reused
+    as late as possible. Every allocated port is recorded with its
+    allocation time; ``reconcile`` compares these records with the ports
+    actually in use, e.g. as reported by Docker, to recover leaked ports.
+    """
+
+    def __init__(self, port_range: range):
+        self.port_range = port_range
+
+    @abstractmethod
+    def allocate(self, n: int) -> List[int]:
+        """Allocate up to ``n`` ports; fewer are returned when exhausted."""
+
+    @abstractmethod
+    def release(self, ports: Iterable[int]) -> None:
+        """Give ports back to the free list."""
+
+    @abstractmethod
+    def mark_allocated(self, ports: Iterable[int]) -> None:
+        """Record ports as allocated, e.g. ports used outside the manager."""
+
+    @abstractmethod
+    def allocations(self) -> Dict[int, float]:
+        """Return the allocated ports with their allocation time."""
+
+    def reconcile(self, in_use: Iterable[int], grace: float = 60.0) -> None:
+        """
+        Synchronize the allocations with the ports actually in use.
+
+        Ports in use are marked as allocated. Ports allocated more than
+        ``grace`` seconds ago but no longer in use are released; the grace
+        period protects the ports of containers still being created.
+
+        Args:
+            in_use: The ports currently bound by the containers.
+            grace: Minimum age, in seconds, of a leaked allocation.
+        """
+        in_use = {port for port in in_use if port in self.port_range}
+        allocations = self.allocations()
+
+        missing = in_use - set(allocations)
+        if missing:
+            self.mark_allocated(missing)
+
+        deadline = time.time() - grace
+        leaked = [
+            port
+            for port, allocated_at in allocations.items()
+            if port not in in_use and allocated_at < deadline
+        ]
+        if leaked:
+            logger.info(f"Releasing {len(leaked)} leaked ports: {leaked}")
+            self.release(leaked)
+
+
+class InMemoryPortAllocator(PortAllocator):
+    """Port allocator local to the process."""
+
+    def __init__(self, port_range: range):
+        super().__init__(port_range)
+        self._lock = threading.Lock()
+        self._free = deque(port_range)
+        # port -> allocation time
+        self._allocated: Dict[int, float] = {}
+
+    def allocate(self, n: int) -> List[int]:
+        ports = []
+        now = time.time()
+        with self._lock:
+            while len(ports) < n and self._free:
+                port = self._free.popleft()
+                # Skip the stale entries of ports marked as allocated
+                if port not in self._allocated:
+                    self._allocated[port] = now
+                    ports.append(port)
+        return ports
+
+    def release(self, ports: Iterable[int]) -> None:
+        with self._lock:
+            for port in ports:
+                if self._allocated.pop(port, None) is not None:
+                    self._free.append(port)
+
+    def mark_allocated(self, ports: Iterable[int]) -> None:
+        now = time.time()
+        with self._lock:
+            for port in ports:
+                self._allocated.setdefault(port, now)
+
+    def allocations(self) -> Dict[int, float]:
+        with self._lock:
+            return dict(self._allocated)
+
+
+class RedisPortAllocator(PortAllocator):
+    """
+    Port allocator shared by the managers of a Docker host through Redis.
+
+    The free-list is a Redis list and the allocations a Redis hash, both
+    updated atomically by Lua scripts, so allocating ports costs a single
+    round trip whatever the number of ports in use.
+    """
+
+    def __init__(self, redis_client, port_range: range, key: str):
+        super().__init__(port_range)
+        self.client = redis_client
+        self.free_key = f"{key}:free"
+        self.allocated_key = f"{key}:allocated"
+        self._allocate = redis_client.register_script(_ALLOCATE_SCRIPT)
+        self._release = redis_client.register_script(_RELEASE_SCRIPT)
+        redis_client.register_script(_INIT_SCRIPT)(
+            keys=[self.free_key, self.allocated_key],
+            args=list(port_range),
+        )
+
+    def allocate(self, n: int) -> List[int]:
+        ports = [
+            int(port)
+            for port in self._allocate(
+                keys=[self.free_key, self.allocated_key],
+                args=[time.time(), n],
+            )
+        ]
+        # Drop the ports of a previous, different, port range
+        stale = [port for port in ports if port not in self.port_range]
+        if stale:
+            self.client.hdel(self.allocated_key, *stale)
+        return [port for port in ports if port in self.port_range]
+
+    def release(self, ports: Iterable[int]) -> None:
+        ports = list(ports)
+        if ports:
+            self._release(
+                keys=[self.free_key, self.allocated_key],
+                args=ports,
+            )
+
+    def mark_allocated(self, ports: Iterable[int]) -> None:
+        now = time.time()
+        with self.client.pipeline() as pipe:
+            for port in ports:
+                pipe.hsetnx(self.allocated_key, port, now)
+            pipe.execute()
+
+    def allocations(self) -> Dict[int, float]:
+        return {
+            int(port): float(allocated_at)
+            for port, allocated_at in self.client.hgetall(
+                self.allocated_key,
+            ).items()
+        }
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The value of a key removed by an event
+DELETED = object()
+
+
+class ContainerStatusCache:
+    """
+    Thread-safe cache of container states, kept up to date by a stream of
+    events from the container backend (Docker events, Kubernetes watch).
+
+    A daemon thread consumes the event stream returned by ``watch()``.
+    ``parse(event)`` turns each event into ``(keys, state)``, where ``keys``
+    are the identifiers of one container (e.g. its id and its name) and
+    ``state`` is ``DELETED`` once it is gone, or into None to ignore the
+    event. While the
+    stream is connected, lookups are answered from memory; a missing key,
+    or any lookup while the stream is down, falls back to ``fetch(key)``,
+    i.e. a direct inspection.
+
+    Events are applied asynchronously: after acting on a container, call
+    ``invalidate`` so that the next lookup inspects it again.
+
+    Args:
+        fetch: Returns the current state of a container, None if missing.
+        watch: Opens the event stream, a blocking iterator. It is closed
+            by ``stop`` when it has a ``close`` method.
+        parse: Converts an event to ``(keys, state)``, or None.
+        name: Name of the watcher thread.
+        retry_interval: Seconds before reconnecting a failed stream, doubled
+            after every failure up to 64 times.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        watch: Callable[[], Iterator[Any]],
+        parse: Callable[[Any], Optional[Tuple[Iterable[str], Any]]],
+        name: str = "container-status-watch",
+        retry_interval: float = 1.0,
+    ):
+        self.fetch = fetch
+        self.watch = watch
+        self.parse = parse
+        self.name = name
+        self.retry_interval = retry_interval
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._states: Dict[str, Any] = {}
+        # key -> every key of the same container
+        self._aliases: Dict[str, Tuple[str, ...]] = {}
+        self._live = False
+        self._stream = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def live(self) -> bool:
+        """Whether the event stream is connected."""
+        return self._live
+
+    def start(self) -> None:
+        """Start consuming the event stream in the background."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=self.name,
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop consuming the event stream."""
+        self._stopped.set()
+        stream = self._stream
+        if stream is not None and hasattr(stream, "close"):
+            try:
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing the event stream: {e}")
+        self._set_live(False)
+
+    def get(self, key: str) -> Any:
+        """Return the state of a container, inspecting it on a miss."""
+        with self._lock:
+            if self._live and key in self._states:
+                return self._states[key]
+            live = self._live
+
+        state = self.fetch(key)
+        if live and state is not None:
+            with self._lock:
+                # An event received meanwhile is more recent
+                if self._live and key not in self._states:
+                    self._states[key] = state
+        return state
+
+    def invalidate(self, key: str) -> None:
+        """Forget the state of a container, under all of its keys."""
+        with self._lock:
+            for alias in self._aliases.pop(key, (key,)):
+                self._states.pop(alias, None)
+                self._aliases.pop(alias, None)
+
+    def wait_for(
+        self,
+        key: str,
+        predicate: Callable[[Any], bool],
+        timeout: float,
+        poll_interval: float = 2.0,
+    ) -> Any:
+        """
+        Wait until the state of a container satisfies ``predicate``.
+
+        Events wake the waiter up as soon as the state changes; while the
+        stream is down, the container is inspected every ``poll_interval``
+        seconds instead.
+
+        Returns:
+            The last known state, which does not satisfy ``predicate`` if
+            the timeout expired.
+        """
+        deadline = time.monotonic() + timeout
+        state = self.get(key)
+        while not predicate(state):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            with self._changed:
+                if self._live:
+                    self._changed.wait(min(remaining, poll_interval))
+                    if self._live and key in self._states:
+                        state = self._states[key]
+                        continue
+            if not self._live:
+                time.sleep(min(remaining, poll_interval))
+            state = self.get(key)
+        return state
+
+    def _set_live(self, live: bool) -> None:
+        with self._changed:
+            self._live = live
+            # States may be missing events while disconnected
+            self._states.clear()
+            self._aliases.clear()
+            self._changed.notify_all()
+
+    def _apply(self, keys: Iterable[str], state: Any) -> None:
+        keys = tuple(key for key in keys if key)
+        with self._changed:
+            for key in keys:
+                for alias in self._aliases.pop(key, ()):
+                    self._aliases.pop(alias, None)
+                    self._states.pop(alias, None)
+            if state is not DELETED:
+                for key in keys:
+                    self._states[key] = state
+                    self._aliases[key] = keys
+            self._changed.notify_all()
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                self._stream = self.watch()
+                self._set_live(True)
+                for event in self._stream:
+                    if self._stopped.is_set():
+                        break
+                    failures = 0
+                    parsed = self.parse(event)
+                    if parsed is not None:
+                        self._apply(*parsed)
+            except Exception as e:
+                if self._stopped.is_set():
+                    break
+                failures += 1
+                logger.warning(
+                    f"Container event stream failed, falling back to "
+                    f"inspection: {e}",
+                )
+                logger.debug(f"{traceback.format_exc()}")
+            finally:
+                self._stream = None
+                self._set_live(False)
+            self._stopped.wait(self.retry_interval * 2 ** min(failures, 6))
@@ -224,6 +224,12 @@ class AgentScopeContextAdapter:
                 content=func_res["content"],
             )
 
+        async def async_func_wrapper(func, **kwargs):
+            func_res = await func.acall(**kwargs)
+            return ToolResponse(
+                content=func_res["content"],
+            )
+
         toolkit = self.attr["agent_config"].get("toolkit", Toolkit())
 
         # Deepcopy to avoid modify the original toolkit
@@ -247,9 +253,9 @@ class AgentScopeContextAdapter:
             activated_tools = self.context.activate_tools
         else:
             # Lazy import
-            from ...sandbox.tools.utils import setup_tools
+            from ...sandbox.tools.utils import asetup_tools
 
-            activated_tools = setup_tools(
+            activated_tools = await asetup_tools(
                 tools=self.attr["tools"],
                 environment_manager=self.context.environment_manager,
                 session_id=self.context.session.id,
@@ -263,7 +269,7 @@ class AgentScopeContextAdapter:
                 source="mcp_server",
                 mcp_name=tool.tool_type,
                 original_func=partial(
-                    func_wrapper,
+                    async_func_wrapper if tool.is_async else func_wrapper,
                     tool,
                 ),
                 json_schema=tool.schema,
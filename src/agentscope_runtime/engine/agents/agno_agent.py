@@ -76,9 +76,9 @@ class AgnoContextAdapter:
             # Only add activated tool
             activated_tools = self.context.activate_tools
         else:
-            from ...sandbox.tools.utils import setup_tools
+            from ...sandbox.tools.utils import asetup_tools
 
-            activated_tools = setup_tools(
+            activated_tools = await asetup_tools(
                 tools=self.attr["tools"],
                 environment_manager=self.context.environment_manager,
                 session_id=self.context.session.id,
@@ -91,7 +91,9 @@ class AgnoContextAdapter:
                 name=tool.name,
                 description=tool.schema["function"]["description"],
                 parameters=tool.schema["function"]["parameters"],
-                entrypoint=tool.__call__,
+                entrypoint=tool.make_function()
+                if tool.is_async
+                else tool.__call__,
             )
             toolkit.append(func)
 
@@ -82,9 +82,9 @@ class AutogenContextAdapter:
             # Only add activated tool
             activated_tools = self.context.activate_tools
         else:
-            from ...sandbox.tools.utils import setup_tools
+            from ...sandbox.tools.utils import asetup_tools
 
-            activated_tools = setup_tools(
+            activated_tools = await asetup_tools(
                 tools=self.attr["tools"],
                 environment_manager=self.context.environment_manager,
                 session_id=self.context.session.id,
@@ -188,9 +188,9 @@ class Runner:
         tools = tools or getattr(self._agent, "tools", None)
         if tools:
             # Lazy import
-            from ..sandbox.tools.utils import setup_tools
+            from ..sandbox.tools.utils import asetup_tools
 
-            activated_tools, schemas = setup_tools(
+            activated_tools, schemas = await asetup_tools(
                 tools=tools,
                 environment_manager=context.environment_manager,
                 session_id=session.id,
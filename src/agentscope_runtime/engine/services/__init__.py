@@ -4,6 +4,6 @@ from .base import (
     ServiceWithLifecycleManager,
     ServiceLifecycleManagerMixin,
 )
-from .sandbox_service import SandboxService
+from .sandbox_service import SandboxService, AsyncSandboxService
 from .memory_service import MemoryService
 from .session_history_service import SessionHistoryService
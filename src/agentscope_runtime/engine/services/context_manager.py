@@ -1,6 +1,17 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import logging
 from contextlib import asynccontextmanager
-from typing import List
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from .manager import ServiceManager
 from .memory_service import MemoryService, InMemoryMemoryService
@@ -18,6 +29,64 @@ from ..schemas.agent_schemas import (
     ContentType,
 )
 
+logger = logging.getLogger(__name__)
+
+
+async def _run_stage(coro, stage: str, timeout: Optional[float]):
+    """Awaits a context stage, returning None if it misses its deadline."""
+    if timeout is None:
+        return await coro
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Context stage '{stage}' exceeded its {timeout}s budget "
+            f"and was skipped",
+        )
+        return None
+
+
+class BackgroundWrites:
+    """
+    Writes of context stages run without being awaited, e.g. the memory
+    writes of a stage with a deadline.
+
+    At most ``max_pending`` writes run at once; further writes wait for a
+    slot, so a slow backend cannot pile up tasks without limit.
+    """
+
+    def __init__(self, max_pending: int = 1000):
+        if max_pending <= 0:
+            raise ValueError("max_pending must be positive")
+        self._slots = asyncio.Semaphore(max_pending)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def spawn(self, coro, stage: str) -> None:
+        """Runs ``coro`` in the background once a slot is free."""
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            coro.close()
+            raise
+
+        def _done(task: asyncio.Task):
+            self._tasks.discard(task)
+            self._slots.release()
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(
+                    f"Background write of context stage '{stage}' failed: "
+                    f"{task.exception()}",
+                )
+
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(_done)
+
+    async def flush(self) -> None:
+        """Waits until the background writes are done."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
 
 class ContextComposer:
     @staticmethod
@@ -27,33 +96,85 @@ class ContextComposer:
         memory_service: MemoryService = None,
         session_history_service: SessionHistoryService = None,
         rag_service: RAGService = None,
+        stage_timeouts: Optional[Dict[str, float]] = None,
+        background_writes: Optional[BackgroundWrites] = None,
     ):
+        """Composes the context of a turn into ``session``.
+
+        Appending to the session history, the memory stage and the rag
+        stage are independent and run concurrently. ``stage_timeouts``
+        maps the ``"memory"`` and ``"rag"`` stages to a deadline in
+        seconds; a stage missing its deadline is skipped and the context
+        is composed without it. With a memory deadline and
+        ``background_writes``, the input is added to the memory in the
+        background, so that a slow memory backend cannot delay the turn
+        either.
+        """
+        stage_timeouts = stage_timeouts or {}
+
         # session
-        if session_history_service:
-            await session_history_service.append_message(
-                session=session,
-                message=request_input,
-            )
-        else:
-            session.messages += request_input
+        async def _session_stage():
+            if session_history_service:
+                await session_history_service.append_message(
+                    session=session,
+                    message=request_input,
+                )
+            else:
+                session.messages += request_input
+
         # memory
-        if memory_service:
-            memories: List[Message] = await memory_service.search_memory(
-                user_id=session.user_id,
-                messages=request_input,
-                filters={"top_k": 5},
+        async def _memory_stage():
+            if not memory_service:
+                return None
+            memories = await _run_stage(
+                memory_service.search_memory(
+                    user_id=session.user_id,
+                    messages=request_input,
+                    filters={"top_k": 5},
+                ),
+                "memory",
+                stage_timeouts.get("memory"),
             )
-            await memory_service.add_memory(
+            # Added after searching so the current input is not recalled.
+            add = memory_service.add_memory(
                 user_id=session.user_id,
                 messages=request_input,
                 session_id=session.id,
             )
-            session.messages = memories + session.messages
+            if (
+                stage_timeouts.get("memory") is None
+                or background_writes is None
+            ):
+                await add
+            else:
+                await background_writes.spawn(add, "memory")
+            return memories
 
         # rag
-        if rag_service:
-            query = await rag_service.get_query_text(request_input[-1])
-            docs = await rag_service.retrieve(query=query, k=5)
+        async def _rag_stage():
+            if not rag_service:
+                return None
+
+            async def _retrieve():
+                query = await rag_service.get_query_text(request_input[-1])
+                return await rag_service.retrieve(query=query, k=5)
+
+            return await _run_stage(
+                _retrieve(),
+                "rag",
+                stage_timeouts.get("rag"),
+            )
+
+        _, memories, docs = await asyncio.gather(
+            _session_stage(),
+            _memory_stage(),
+            _rag_stage(),
+        )
+
+        if memories is not None:
+            session.messages = memories + session.messages
+
+        if docs is not None:
             cooked_doc = "\n".join(docs)
             message = Message(
                 type=MessageType.MESSAGE,
@@ -69,9 +190,133 @@ class ContextComposer:
                 session.messages.append(message)
 
 
+class WriteBehindQueue:
+    """
+    Persists turn outputs in the background.
+
+    Appends are buffered per session and flushed by one worker task per
+    session, which keeps writes of a session in order while different
+    sessions are flushed concurrently. Appends queued while a flush is in
+    progress are merged into a single write. A write runs ``write_steps``
+    in order (e.g. the session history, then the memory); a failed step is
+    retried on its own with exponential backoff up to ``max_retries``
+    times before being dropped, so the steps that succeeded are not
+    repeated. At most ``max_pending`` appends may wait to be written;
+    further appends block until earlier ones are flushed.
+    """
+
+    def __init__(
+        self,
+        write_steps: Sequence[
+            Callable[[Session, List[Message]], Awaitable[None]]
+        ],
+        max_pending: int = 1000,
+        max_retries: int = 3,
+        retry_interval: float = 0.1,
+    ):
+        if max_pending <= 0:
+            raise ValueError("max_pending must be positive")
+        self._write_steps = list(write_steps)
+        self._max_retries = max_retries
+        self._retry_interval = retry_interval
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending: Dict[Tuple[str, str], List[tuple]] = {}
+        self._workers: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    async def put(self, session: Session, messages: List[Message]) -> None:
+        """Queues ``messages`` to be appended to ``session``."""
+        await self._slots.acquire()
+        key = (session.user_id, session.id)
+        self._pending.setdefault(key, []).append((session, list(messages)))
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key))
+
+    async def _drain(self, key: Tuple[str, str]) -> None:
+        try:
+            while self._pending.get(key):
+                batch = self._pending.pop(key)
+                session = batch[-1][0]
+                messages = [msg for _, msgs in batch for msg in msgs]
+                try:
+                    await self._write_with_retry(session, messages)
+                finally:
+                    for _ in batch:
+                        self._slots.release()
+        finally:
+            self._workers.pop(key, None)
+
+    async def _write_with_retry(
+        self,
+        session: Session,
+        messages: List[Message],
+    ) -> None:
+        for step in self._write_steps:
+            await self._run_step_with_retry(step, session, messages)
+
+    async def _run_step_with_retry(
+        self,
+        step: Callable[[Session, List[Message]], Awaitable[None]],
+        session: Session,
+        messages: List[Message],
+    ) -> None:
+        for attempt in range(self._max_retries + 1):
+            try:
+                await step(session, messages)
+                return
+            except Exception as e:
+                if attempt == self._max_retries:
+                    logger.error(
+                        f"Dropping the {getattr(step, '__name__', step)} "
+                        f"write of {len(messages)} message(s) of session "
+                        f"{session.id} after {attempt + 1} failed "
+                        f"attempt(s): {e}",
+                    )
+                    return
+                await asyncio.sleep(self._retry_interval * 2**attempt)
+
+    async def flush(
+        self,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Waits until queued appends have been written.
+
+        Args:
+            user_id: Together with ``session_id``, restricts the flush to a
+                single session. All sessions are flushed if not given.
+            session_id: See ``user_id``.
+        """
+        if user_id is not None and session_id is not None:
+            worker = self._workers.get((user_id, session_id))
+            if worker:
+                await asyncio.shield(worker)
+            return
+        while self._workers:
+            await asyncio.gather(
+                *[asyncio.shield(w) for w in list(self._workers.values())],
+            )
+
+
 class ContextManager(ServiceManager):
     """
     The contextManager class
+
+    Args:
+        history_window: If set, only the most recent ``history_window``
+            messages of a session are loaded by ``compose_session``, so
+            request latency and memory stay flat as sessions grow.
+        stage_timeouts: Optional deadlines in seconds for the ``"memory"``
+            and ``"rag"`` stages of context composition. A stage missing
+            its deadline is skipped instead of delaying the response, and
+            with a memory deadline, the input is added to the memory in
+            the background.
+        write_behind: If True, ``append`` queues the turn output in a
+            ``WriteBehindQueue`` and returns immediately instead of waiting
+            for the session history and memory writes. Queued writes are
+            flushed before a session is loaded again and on exit.
+        write_behind_max_pending: Maximum number of queued appends before
+            ``append`` blocks.
+        write_behind_max_retries: Number of retries of a failed write.
     """
 
     def __init__(
@@ -80,8 +325,27 @@ class ContextManager(ServiceManager):
         session_history_service: SessionHistoryService = None,
         memory_service: MemoryService = None,
         rag_service: RAGService = None,
+        history_window: Optional[int] = None,
+        stage_timeouts: Optional[Dict[str, float]] = None,
+        write_behind: bool = False,
+        write_behind_max_pending: int = 1000,
+        write_behind_max_retries: int = 3,
     ):
+        if history_window is not None and history_window < 0:
+            raise ValueError("history_window must be non-negative")
         self._context_composer_cls = context_composer_cls
+        self._history_window = history_window
+        self._stage_timeouts = stage_timeouts
+        self._background_writes = BackgroundWrites()
+        self._write_behind_queue = (
+            WriteBehindQueue(
+                [self._write_session, self._write_memory],
+                max_pending=write_behind_max_pending,
+                max_retries=write_behind_max_retries,
+            )
+            if write_behind
+            else None
+        )
         self._session_history_service = session_history_service
         self._memory_service = memory_service
         self._rag_service = rag_service
@@ -104,12 +368,17 @@ class ContextManager(ServiceManager):
         session: Session,
         request_input: List[Message],
     ):
+        kwargs = {}
+        if self._stage_timeouts is not None:
+            kwargs["stage_timeouts"] = self._stage_timeouts
+            kwargs["background_writes"] = self._background_writes
         await self._context_composer_cls.compose(
             memory_service=self._memory_service,
             session_history_service=self._session_history_service,
             rag_service=self._rag_service,
             session=session,
             request_input=request_input,
+            **kwargs,
         )
 
     async def compose_session(
@@ -117,10 +386,19 @@ class ContextManager(ServiceManager):
         user_id: str,
         session_id: str,
     ):
+        if self._write_behind_queue:
+            # Make the previous turns of the session visible before
+            # loading it.
+            await self._write_behind_queue.flush(user_id, session_id)
+
         if self._session_history_service:
+            kwargs = {}
+            if self._history_window is not None:
+                kwargs["history_window"] = self._history_window
             session = await self._session_history_service.get_session(
                 user_id=user_id,
                 session_id=session_id,
+                **kwargs,
             )
             if not session:
                 raise RuntimeError(f"Session {session_id} not found")
@@ -133,11 +411,42 @@ class ContextManager(ServiceManager):
         return session
 
     async def append(self, session: Session, event_output: List[Message]):
+        if self._write_behind_queue:
+            await self._write_behind_queue.put(session, event_output)
+        else:
+            await self._write(session, event_output)
+
+    async def flush(self) -> None:
+        """Waits until all write-behind appends, and the memory writes of
+        composition, have been persisted."""
+        if self._write_behind_queue:
+            await self._write_behind_queue.flush()
+        await self._background_writes.flush()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.flush()
+        return await super().__aexit__(exc_type, exc_val, exc_tb)
+
+    async def _write(self, session: Session, event_output: List[Message]):
+        await self._write_session(session, event_output)
+        await self._write_memory(session, event_output)
+
+    async def _write_session(
+        self,
+        session: Session,
+        event_output: List[Message],
+    ):
         if self._session_history_service:
             await self._session_history_service.append_message(
                 session=session,
                 message=event_output,
             )
+
+    async def _write_memory(
+        self,
+        session: Session,
+        event_output: List[Message],
+    ):
         if self._memory_service:
             await self._memory_service.add_memory(
                 user_id=session.user_id,
@@ -152,12 +461,18 @@ async def create_context_manager(
     session_history_service: SessionHistoryService = None,
     rag_service: RAGService = None,
     context_composer_cls=ContextComposer,
+    history_window: Optional[int] = None,
+    stage_timeouts: Optional[Dict[str, float]] = None,
+    write_behind: bool = False,
 ):
     manager = ContextManager(
         memory_service=memory_service,
         session_history_service=session_history_service,
         rag_service=rag_service,
         context_composer_cls=context_composer_cls,
+        history_window=history_window,
+        stage_timeouts=stage_timeouts,
+        write_behind=write_behind,
     )
 
     async with manager:
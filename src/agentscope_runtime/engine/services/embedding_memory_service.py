@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+import hashlib
+from typing import Optional, Dict, Any, List, Callable
+
+import numpy as np
+
+from .memory_service import MemoryService, tokenize
+from ..schemas.agent_schemas import Message, MessageType
+
+EmbeddingFunction = Callable[[List[str]], np.ndarray]
+
+
+class HashingEmbedder:
+    """
+    A deterministic, offline embedder based on the hashing trick.
+
+    Every word token of a text is hashed into one of ``dimension`` buckets
+    with a hash-derived sign. Texts sharing many tokens end up with a high
+    cosine similarity, which is enough for keyword-level recall without
+    any model or network call.
+    """
+
+    def __init__(self, dimension: int = 256):
+        if dimension <= 0:
+            raise ValueError("dimension must be positive")
+        self.dimension = dimension
+
+    def _bucket(self, token: str) -> tuple:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8)
+        value = int.from_bytes(digest.digest(), "little")
+        sign = 1.0 if value >> 63 else -1.0
+        return value % self.dimension, sign
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                bucket, sign = self._bucket(token)
+                vectors[row, bucket] += sign
+        return vectors
+
+
+class _UserVectors:
+    """Embeddings of one user's messages, stored row-wise in a matrix
+    that grows by amortised doubling."""
+
+    def __init__(self, dimension: int, initial_capacity: int):
+        self.matrix = np.zeros(
+            (initial_capacity, dimension),
+            dtype=np.float32,
+        )
+        self.size = 0
+        self.messages: List[Any] = []
+        self.session_ids: List[str] = []
+
+    def append(
+        self,
+        session_id: str,
+        messages: List[Any],
+        vectors: np.ndarray,
+    ) -> None:
+        required = self.size + len(messages)
+        if required > self.matrix.shape[0]:
+            capacity = max(self.matrix.shape[0], 1)
+            while capacity < required:
+                capacity *= 2
+            grown = np.zeros(
+                (capacity, self.matrix.shape[1]),
+                dtype=np.float32,
+            )
+            grown[: self.size] = self.matrix[: self.size]
+            self.matrix = grown
+
+        self.matrix[self.size : required] = vectors
+        self.size = required
+        self.messages.extend(messages)
+        self.session_ids.extend([session_id] * len(messages))
+
+    def remove_session(self, session_id: str) -> None:
+        keep = [
+            i for i, sid in enumerate(self.session_ids) if sid != session_id
+        ]
+        if len(keep) == self.size:
+            return
+        self.matrix[: len(keep)] = self.matrix[keep]
+        self.matrix[len(keep) : self.size] = 0
+        self.size = len(keep)
+        self.messages = [self.messages[i] for i in keep]
+        self.session_ids = [self.session_ids[i] for i in keep]
+
+
+class EmbeddingMemoryService(MemoryService):
+    """
+    An in-process memory service with semantic recall.
+
+    Message embeddings are kept per user in a NumPy matrix and
+    ``search_memory`` scores the whole matrix with a single matrix-vector
+    product, selecting the top-k rows by cosine similarity with
+    ``argpartition``. No external service is involved.
+
+    Args:
+        embedding_function: Callable mapping a list of texts to a
+            ``(len(texts), dimension)`` array. Defaults to a
+            ``HashingEmbedder``, which works offline and is deterministic.
+        dimension: The embedding dimension used by the default embedder.
+        initial_capacity: The number of rows pre-allocated per user.
+    """
+
+    _DEFAULT_SESSION_ID = "default"
+    _DEFAULT_TOP_K = 5
+
+    def __init__(
+        self,
+        embedding_function: Optional[EmbeddingFunction] = None,
+        dimension: int = 256,
+        initial_capacity: int = 64,
+    ):
+        self._embedding_function = embedding_function or HashingEmbedder(
+            dimension,
+        )
+        self._initial_capacity = initial_capacity
+        self._vectors: Dict[str, _UserVectors] = {}
+
+    async def start(self) -> None:
+        """Starts the service."""
+        self._vectors = {}
+
+    async def stop(self) -> None:
+        """Stops the service."""
+        self._vectors = {}
+
+    async def health(self) -> bool:
+        """Checks the health of the service."""
+        return True
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(
+            self._embedding_function(texts),
+            dtype=np.float32,
+        ).reshape(len(texts), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    async def get_query_text(self, message: Message) -> str:
+        """
+        Gets the query text from the messages.
+
+        Args:
+            message: A list of messages.
+
+        Returns:
+            The query text.
+        """
+        if message:
+            if message.type == MessageType.MESSAGE:
+                for content in message.content:
+                    if content.type == "text":
+                        return content.text
+        return ""
+
+    async def add_memory(
+        self,
+        user_id: str,
+        messages: list,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """
+        Embeds the messages in a single batch and adds them to the user's
+        matrix.
+
+        Args:
+            user_id: The user's unique identifier.
+            messages: A list of messages to be added.
+            session_id: An optional session identifier. If not provided,
+            a default session is used.
+        """
+        if not messages:
+            return
+
+        storage_key = session_id if session_id else self._DEFAULT_SESSION_ID
+        texts = [await self.get_query_text(message) for message in messages]
+        vectors = self._embed(texts)
+
+        if user_id not in self._vectors:
+            self._vectors[user_id] = _UserVectors(
+                dimension=vectors.shape[1],
+                initial_capacity=self._initial_capacity,
+            )
+        self._vectors[user_id].append(storage_key, list(messages), vectors)
+
+    async def search_memory(
+        self,
+        user_id: str,
+        messages: list,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> list:
+        """
+        Searches the user's messages that are most similar to the query.
+
+        Args:
+            user_id: The user's unique identifier.
+            messages: A list of messages, where the last message's content
+                is used as the search query.
+            filters: Optional filters, supporting 'top_k' (defaults to 5)
+                and 'score', the minimum cosine similarity of a result
+                (defaults to any positive similarity).
+
+        Returns:
+            The matching messages, most similar first.
+        """
+        user_vectors = self._vectors.get(user_id)
+        if user_vectors is None or user_vectors.size == 0:
+            return []
+
+        if (
+            not messages
+            or not isinstance(messages, list)
+            or len(messages) == 0
+        ):
+            return []
+
+        query = await self.get_query_text(messages[-1])
+        if not query:
+            return []
+
+        filters = filters or {}
+        top_k = filters.get("top_k", self._DEFAULT_TOP_K)
+        if not isinstance(top_k, int) or top_k <= 0:
+            top_k = self._DEFAULT_TOP_K
+        min_score = filters.get("score", 0.0)
+
+        query_vector = self._embed([query])[0]
+        scores = user_vectors.matrix[: user_vectors.size] @ query_vector
+
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            user_vectors.messages[i] for i in ranked if scores[i] > min_score
+        ]
+
+    async def list_memory(
+        self,
+        user_id: str,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> list:
+        """
+        Lists messages with pagination support.
+
+        Args:
+            user_id: The user's unique identifier.
+            filters: Optional filters for pagination, including 'page_num'
+                and 'page_size'.
+
+        Returns:
+            A paginated list of messages.
+        """
+        user_vectors = self._vectors.get(user_id)
+        if user_vectors is None:
+            return []
+
+        # Sort by session id to have a consistent order for pagination
+        order = sorted(
+            range(user_vectors.size),
+            key=lambda i: user_vectors.session_ids[i],
+        )
+
+        page_num = filters.get("page_num", 1) if filters else 1
+        page_size = filters.get("page_size", 10) if filters else 10
+
+        start_index = (page_num - 1) * page_size
+        end_index = start_index + page_size
+
+        return [user_vectors.messages[i] for i in order[start_index:end_index]]
+
+    async def delete_memory(
+        self,
+        user_id: str,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """
+        Deletes messages from the store.
+
+        Args:
+            user_id: The user's unique identifier.
+            session_id: If provided, only deletes the messages for that
+                session. Otherwise, deletes all messages for the user.
+        """
+        if user_id not in self._vectors:
+            return
+
+        if session_id:
+            self._vectors[user_id].remove_session(session_id)
+        else:
+            del self._vectors[user_id]
@@ -1,17 +1,24 @@
 # -*- coding: utf-8 -*-
-from typing import List
+import asyncio
+from typing import List, Union
 from contextlib import asynccontextmanager
 
 from .manager import ServiceManager
-from .sandbox_service import SandboxService
+from .sandbox_service import SandboxService, AsyncSandboxService
 
 
 class EnvironmentManager(ServiceManager):
     """
     The EnvironmentManager class for managing environment-related services.
+
+    With an ``AsyncSandboxService``, sandboxes are connected and released
+    with ``aconnect_sandbox`` and ``arelease_sandbox`` only.
     """
 
-    def __init__(self, sandbox_service: SandboxService = None):
+    def __init__(
+        self,
+        sandbox_service: Union[SandboxService, AsyncSandboxService] = None,
+    ):
         self._sandbox_service = sandbox_service
         super().__init__()
 
@@ -27,6 +34,7 @@ class EnvironmentManager(ServiceManager):
         env_types=None,
         tools=None,
     ) -> List:
+        self._check_sync("connect_sandbox")
         return self._sandbox_service.connect(
             session_id,
             user_id,
@@ -35,12 +43,55 @@ class EnvironmentManager(ServiceManager):
         )
 
     def release_sandbox(self, session_id, user_id):
+        self._check_sync("release_sandbox")
         return self._sandbox_service.release(session_id, user_id)
 
+    async def aconnect_sandbox(
+        self,
+        session_id,
+        user_id,
+        env_types=None,
+        tools=None,
+    ) -> List:
+        """Connect the sandboxes of a session without blocking the event
+        loop. A synchronous service is run in a worker thread."""
+        if isinstance(self._sandbox_service, AsyncSandboxService):
+            return await self._sandbox_service.connect(
+                session_id,
+                user_id,
+                env_types=env_types,
+                tools=tools,
+            )
+        return await asyncio.to_thread(
+            self._sandbox_service.connect,
+            session_id,
+            user_id,
+            env_types=env_types,
+            tools=tools,
+        )
+
+    async def arelease_sandbox(self, session_id, user_id):
+        """Release the sandboxes of a session without blocking the event
+        loop."""
+        if isinstance(self._sandbox_service, AsyncSandboxService):
+            return await self._sandbox_service.release(session_id, user_id)
+        return await asyncio.to_thread(
+            self._sandbox_service.release,
+            session_id,
+            user_id,
+        )
+
+    def _check_sync(self, method: str) -> None:
+        if isinstance(self._sandbox_service, AsyncSandboxService):
+            raise TypeError(
+                f"{method} is not available with an AsyncSandboxService, "
+                f"use a{method} instead.",
+            )
+
 
 @asynccontextmanager
 async def create_environment_manager(
-    sandbox_service: SandboxService = None,
+    sandbox_service: Union[SandboxService, AsyncSandboxService] = None,
 ):
     manager = EnvironmentManager(
         sandbox_service=sandbox_service,
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
+import heapq
+import re
 from abc import abstractmethod
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Set, Tuple
 
 
 from pydantic import Field
@@ -94,21 +97,116 @@ class MemoryService(ServiceWithLifecycleManager):
         """
 
 
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Splits a text into the set of lowercase word tokens it contains."""
+    return set(_TOKEN_PATTERN.findall(text.lower())) if text else set()
+
+
+class KeywordIndex:
+    """
+    An incrementally maintained inverted index over the messages of a
+    single user, mapping each token to the ids of the messages that
+    contain it.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        # message id -> (message, tokens of the message)
+        self._entries: Dict[int, Tuple[Any, Set[str]]] = {}
+        self._session_ids: Dict[str, List[int]] = defaultdict(list)
+        self._next_id = 0
+
+    def add(self, session_id: str, message: Any, text: str) -> None:
+        """
+        Indexes a message under the given session.
+
+        Args:
+            session_id: The session the message belongs to.
+            message: The message to index.
+            text: The searchable text of the message.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return
+        message_id = self._next_id
+        self._next_id += 1
+        self._entries[message_id] = (message, tokens)
+        self._session_ids[session_id].append(message_id)
+        for token in tokens:
+            self._postings[token].add(message_id)
+
+    def remove_session(self, session_id: str) -> None:
+        """
+        Removes all messages of a session from the index.
+
+        Args:
+            session_id: The session whose messages are removed.
+        """
+        for message_id in self._session_ids.pop(session_id, []):
+            _, tokens = self._entries.pop(message_id)
+            for token in tokens:
+                posting = self._postings[token]
+                posting.discard(message_id)
+                if not posting:
+                    del self._postings[token]
+
+    def search(self, query: str, top_k: Optional[int] = None) -> list:
+        """
+        Finds the messages sharing the most tokens with the query.
+
+        Args:
+            query: The query text.
+            top_k: The maximum number of messages to return. All matching
+                messages are returned if not set.
+
+        Returns:
+            The best matching messages, ranked by the number of query
+            tokens they contain with ties going to the most recent
+            messages, and returned in the order they were added.
+        """
+        overlap: Dict[int, int] = defaultdict(int)
+        for token in tokenize(query):
+            for message_id in self._postings.get(token, ()):
+                overlap[message_id] += 1
+
+        if top_k is None:
+            selected = sorted(overlap)
+        else:
+            selected = sorted(
+                heapq.nlargest(
+                    top_k,
+                    overlap,
+                    key=lambda message_id: (overlap[message_id], message_id),
+                ),
+            )
+        return [self._entries[message_id][0] for message_id in selected]
+
+
 class InMemoryMemoryService(MemoryService):
     """
     An in-memory implementation of the memory service.
+
+    Besides the raw messages, a per-user ``KeywordIndex`` is maintained in
+    ``add_memory`` and ``delete_memory``, so that ``search_memory`` only
+    visits messages sharing a token with the query.
     """
 
     _store: Dict[str, Dict[str, list]] = {}
+    _indexes: Dict[str, KeywordIndex] = {}
     _DEFAULT_SESSION_ID = "default"
 
     async def start(self) -> None:
         """Starts the service."""
         self._store = {}
+        self._indexes = {}
 
     async def stop(self) -> None:
         """Stops the service."""
         self._store = {}
+        self._indexes = {}
 
     async def health(self) -> bool:
         """Checks the health of the service."""
@@ -139,6 +237,13 @@ class InMemoryMemoryService(MemoryService):
 
         if messages:
             self._store[user_id][storage_key].extend(messages)
+            index = self._indexes.setdefault(user_id, KeywordIndex())
+            for message in messages:
+                index.add(
+                    storage_key,
+                    message,
+                    await self.get_query_text(message),
+                )
 
     async def search_memory(
         self,
@@ -148,7 +253,8 @@ class InMemoryMemoryService(MemoryService):
     ) -> list:
         """
         Searches messages from the in-memory store for a specific user
-            based on keywords.
+            based on keywords, ranking them by the number of query keywords
+            they contain.
 
         Args:
             user_id: The user's unique identifier.
@@ -160,7 +266,7 @@ class InMemoryMemoryService(MemoryService):
         Returns:
             A list of matching messages from the store.
         """
-        if user_id not in self._store:
+        if user_id not in self._indexes:
             return []
 
         if (
@@ -175,28 +281,15 @@ class InMemoryMemoryService(MemoryService):
         if not query:
             return []
 
-        keywords = set(query.lower().split())
-
-        all_messages = []
-        for session_messages in self._store[user_id].values():
-            all_messages.extend(session_messages)
-
-        matched_messages = []
-        for msg in all_messages:
-            candidate_content = await self.get_query_text(msg)
-            if candidate_content:
-                msg_content_lower = candidate_content.lower()
-                if any(keyword in msg_content_lower for keyword in keywords):
-                    matched_messages.append(msg)
-
+        top_k = None
         if (
             filters
             and "top_k" in filters
             and isinstance(filters["top_k"], int)
         ):
-            return matched_messages[-filters["top_k"] :]
+            top_k = filters["top_k"]
 
-        return matched_messages
+        return self._indexes[user_id].search(query, top_k=top_k)
 
     async def get_query_text(self, message: Message) -> str:
         """
@@ -266,6 +359,9 @@ class InMemoryMemoryService(MemoryService):
         if session_id:
             if session_id in self._store[user_id]:
                 del self._store[user_id][session_id]
+                if user_id in self._indexes:
+                    self._indexes[user_id].remove_session(session_id)
         else:
             if user_id in self._store:
                 del self._store[user_id]
+            self._indexes.pop(user_id, None)
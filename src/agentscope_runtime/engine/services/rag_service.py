@@ -1,13 +1,76 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
 from .base import ServiceWithLifecycleManager
 from ..schemas.agent_schemas import Message, MessageType
 
 
+class _QueryResultCache:
+    """A small LRU cache whose entries expire ``ttl`` seconds after
+    being stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[list]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: list) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def normalize_query(query: str) -> str:
+    """Normalises a query for cache lookups by folding case and
+    collapsing whitespace."""
+    return " ".join(query.split()).casefold()
+
+
 class RAGService(ServiceWithLifecycleManager):
     """
     RAG Service
+
+    Subclasses implement ``_retrieve``; ``retrieve`` serves repeated
+    queries from an LRU cache keyed on the normalised query and ``k``,
+    whose entries expire after ``cache_ttl`` seconds. Hit and miss
+    counters are exposed by ``stats``.
+
+    Args:
+        cache_size: Maximum number of cached queries, 0 disables caching.
+        cache_ttl: Seconds after which a cached result expires.
     """
 
+    def __init__(self, cache_size: int = 128, cache_ttl: float = 60.0):
+        self._cache = (
+            _QueryResultCache(cache_size, cache_ttl)
+            if cache_size > 0
+            else None
+        )
+
     async def get_query_text(self, message: Message) -> str:
         """
         Gets the query text from the messages.
@@ -27,19 +90,67 @@ class RAGService(ServiceWithLifecycleManager):
 
     async def retrieve(self, query: str, k: int = 1) -> list[str]:
         """
-        Retrieves similar documents based on the given query.
+        Retrieves similar documents based on the given query, serving
+        repeated queries from the cache.
 
         Args:
             query (str): The query string to search for similar documents.
             k (int, optional): The number of similar documents to retrieve.
             Defaults to 1.
 
+        Returns:
+            list[str]: A list of document contents that are similar to
+            the query.
+        """
+        cache = getattr(self, "_cache", None)
+        if cache is None:
+            return await self._retrieve(query, k)
+
+        key = (normalize_query(query), k)
+        docs = cache.get(key)
+        if docs is None:
+            docs = await self._retrieve(query, k)
+            cache.put(key, docs)
+        return list(docs)
+
+    async def _retrieve(self, query: str, k: int) -> list[str]:
+        """
+        Retrieves similar documents from the underlying store, bypassing
+        the cache.
+
+        Args:
+            query (str): The query string to search for similar documents.
+            k (int): The number of similar documents to retrieve.
+
         Returns:
             list[str]: A list of document contents that are similar to
             the query.
         """
         raise NotImplementedError
 
+    def clear_cache(self) -> None:
+        """Drops all cached results, e.g. after the index changed."""
+        cache = getattr(self, "_cache", None)
+        if cache is not None:
+            cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache statistics of the service.
+
+        Returns:
+            A dict with the ``cache_hits``, ``cache_misses`` and
+            ``cache_size`` of the result cache.
+        """
+        cache = getattr(self, "_cache", None)
+        if cache is None:
+            return {"cache_hits": 0, "cache_misses": 0, "cache_size": 0}
+        return {
+            "cache_hits": cache.hits,
+            "cache_misses": cache.misses,
+            "cache_size": len(cache),
+        }
+
     async def start(self) -> None:
         """Starts the service."""
 
@@ -63,7 +174,10 @@ class LangChainRAGService(RAGService):
         self,
         vectorstore=None,
         embedding=None,
+        cache_size: int = 128,
+        cache_ttl: float = 60.0,
     ):
+        super().__init__(cache_size=cache_size, cache_ttl=cache_ttl)
         # set default embedding alg.
         if embedding is None:
             from langchain_community.embeddings import DashScopeEmbeddings
@@ -87,9 +201,10 @@ class LangChainRAGService(RAGService):
         else:
             self.vectorstore = vectorstore
 
-    async def retrieve(self, query: str, k: int = 1) -> list[str]:
+    async def _retrieve(self, query: str, k: int = 1) -> list[str]:
         """
         Retrieves similar documents based on the given query using LangChain.
+        The blocking search runs in a worker thread.
 
         Args:
             query (str): The query string to search for similar documents.
@@ -107,7 +222,11 @@ class LangChainRAGService(RAGService):
             raise ValueError(
                 "Vector store not initialized. Call build_index first.",
             )
-        docs = self.vectorstore.similarity_search(query, k=k)
+        docs = await asyncio.to_thread(
+            self.vectorstore.similarity_search,
+            query,
+            k=k,
+        )
         return [doc.page_content for doc in docs]
 
     async def start(self) -> None:
@@ -130,7 +249,10 @@ class LlamaIndexRAGService(RAGService):
         self,
         vectorstore=None,
         embedding=None,
+        cache_size: int = 128,
+        cache_ttl: float = 60.0,
     ):
+        super().__init__(cache_size=cache_size, cache_ttl=cache_ttl)
         # set default embedding alg.
         if embedding is None:
             from langchain_community.embeddings import DashScopeEmbeddings
@@ -163,9 +285,10 @@ class LlamaIndexRAGService(RAGService):
         else:
             self.index = vectorstore
 
-    async def retrieve(self, query: str, k: int = 1) -> list[str]:
+    async def _retrieve(self, query: str, k: int = 1) -> list[str]:
         """
         Retrieves similar documents based on the given query using LlamaIndex.
+        The blocking retrieval runs in a worker thread.
 
         Args:
             query (str): The query string to search for similar documents.
@@ -186,7 +309,7 @@ class LlamaIndexRAGService(RAGService):
 
         # Create query engine and query
         query_engine = self.index.as_retriever(similarity_top_k=k)
-        response = query_engine.retrieve(query)
+        response = await asyncio.to_thread(query_engine.retrieve, query)
 
         # Extract text from nodes
         if len(response) > 0:
@@ -1,16 +1,32 @@
 # -*- coding: utf-8 -*-
-from typing import Optional, Dict, Any
 import json
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
 import redis.asyncio as aioredis
+from redis.exceptions import WatchError
 
 
 from .memory_service import MemoryService
 from ..schemas.agent_schemas import Message, MessageType
 
+# Number of users remembered as migrated by a service
+_MIGRATED_USERS_MAXSIZE = 10000
+
 
 class RedisMemoryService(MemoryService):
     """
     A Redis-based implementation of the memory service.
+
+    Messages of each (user, session) pair are kept in a Redis list, with a
+    parallel list holding the text of every message and a per-user set
+    indexing the sessions. Appending is an RPUSH of the new messages only,
+    search matches on the text lists and only fetches the hits, and
+    listing reads just the requested page with LRANGE.
+
+    Memories written in the former layout, a single hash per user with
+    one JSON blob per session, are migrated on first access of the user,
+    or all at once with ``migrate_legacy_memory``.
     """
 
     def __init__(
@@ -21,6 +37,9 @@ class RedisMemoryService(MemoryService):
         self._redis_url = redis_url
         self._redis = redis_client
         self._DEFAULT_SESSION_ID = "default"
+        # LRU of the users known to be migrated: a user evicted from it
+        # is checked again, which finds nothing left to migrate
+        self._migrated_users: OrderedDict = OrderedDict()
 
     async def start(self) -> None:
         """Starts the Redis connection."""
@@ -47,17 +66,107 @@ class RedisMemoryService(MemoryService):
         except Exception:
             return False
 
-    def _user_key(self, user_id):
-        # Each user is a Redis hash
+    def _index_key(self, user_id):
+        # Set of the session ids holding memories of a user
+        return f"memory_index:{user_id}"
+
+    def _session_key(self, user_id, session_id):
+        # List of the serialized messages of a session
+        return f"memory_session:{user_id}:{session_id}"
+
+    def _text_key(self, user_id, session_id):
+        # List of the message texts of a session, parallel to the message
+        # list, so that search does not need to deserialize messages.
+        return f"memory_text:{user_id}:{session_id}"
+
+    def _legacy_user_key(self, user_id):
+        # Former layout: each user is a Redis hash of session JSON blobs
         return f"user_memory:{user_id}"
 
-    def _serialize(self, messages):
-        return json.dumps([msg.dict() for msg in messages])
+    def _legacy_text_key(self, user_id):
+        return f"user_memory_text:{user_id}"
+
+    def _serialize(self, message) -> str:
+        return json.dumps(message.dict())
+
+    def _deserialize(self, message_json) -> Message:
+        return Message.parse_obj(json.loads(message_json))
+
+    async def _texts(self, messages) -> list:
+        return [await self.get_query_text(msg) for msg in messages]
+
+    async def _ensure_migrated(self, user_id: str) -> None:
+        if user_id in self._migrated_users:
+            self._migrated_users.move_to_end(user_id)
+            return
+        await self._migrate_user(user_id)
+        self._mark_migrated(user_id)
+
+    def _mark_migrated(self, user_id: str) -> None:
+        self._migrated_users[user_id] = True
+        self._migrated_users.move_to_end(user_id)
+        while len(self._migrated_users) > _MIGRATED_USERS_MAXSIZE:
+            self._migrated_users.popitem(last=False)
+
+    async def _migrate_user(self, user_id: str) -> None:
+        """Moves the legacy hash of a user into the list layout."""
+        legacy_key = self._legacy_user_key(user_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    # The lists are written and the hash deleted in a single
+                    # transaction, which fails if another migrator got there
+                    # first: the hash is then gone on retry.
+                    await pipe.watch(legacy_key)
+                    sessions = await pipe.hgetall(legacy_key)
+                    if not sessions:
+                        return
+
+                    pipe.multi()
+                    for session_id, session_json in sessions.items():
+                        raw_messages = (
+                            json.loads(session_json) if session_json else []
+                        )
+                        pipe.sadd(self._index_key(user_id), session_id)
+                        if not raw_messages:
+                            continue
+                        texts = await self._texts(
+                            [Message.parse_obj(m) for m in raw_messages],
+                        )
+                        pipe.rpush(
+                            self._session_key(user_id, session_id),
+                            *[json.dumps(m) for m in raw_messages],
+                        )
+                        pipe.rpush(self._text_key(user_id, session_id), *texts)
+                    pipe.delete(legacy_key, self._legacy_text_key(user_id))
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    async def migrate_legacy_memory(self) -> int:
+        """
+        Migrates the memories of all users stored in the former hash
+        layout to the list layout.
 
-    def _deserialize(self, messages_json):
-        if not messages_json:
-            return []
-        return [Message.parse_obj(m) for m in json.loads(messages_json)]
+        Returns:
+            The number of migrated users.
+        """
+        if not self._redis:
+            raise RuntimeError("Redis connection is not available")
+
+        prefix = self._legacy_user_key("")
+        migrated = 0
+        async for key in self._redis.scan_iter(
+            match=self._legacy_user_key("*"),
+        ):
+            if await self._redis.type(key) != "hash":
+                continue
+            user_id = key[len(prefix) :]
+            await self._migrate_user(user_id)
+            self._mark_migrated(user_id)
+            migrated += 1
+        return migrated
 
     async def add_memory(
         self,
@@ -67,13 +176,25 @@ class RedisMemoryService(MemoryService):
     ) -> None:
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
-        key = self._user_key(user_id)
+        await self._ensure_migrated(user_id)
         field = session_id if session_id else self._DEFAULT_SESSION_ID
 
-        existing_json = await self._redis.hget(key, field)
-        existing_msgs = self._deserialize(existing_json)
-        all_msgs = existing_msgs + messages
-        await self._redis.hset(key, field, self._serialize(all_msgs))
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.sadd(self._index_key(user_id), field)
+        if messages:
+            pipe.rpush(
+                self._session_key(user_id, field),
+                *[self._serialize(msg) for msg in messages],
+            )
+            pipe.rpush(
+                self._text_key(user_id, field),
+                *(await self._texts(messages)),
+            )
+        await pipe.execute()
+
+    async def _session_ids(self, user_id: str) -> List[str]:
+        await self._ensure_migrated(user_id)
+        return sorted(await self._redis.smembers(self._index_key(user_id)))
 
     async def search_memory(
         self,
@@ -81,7 +202,6 @@ class RedisMemoryService(MemoryService):
         messages: list,
         filters: Optional[Dict[str, Any]] = None,
     ) -> list:
-        key = self._user_key(user_id)
         if (
             not messages
             or not isinstance(messages, list)
@@ -96,29 +216,41 @@ class RedisMemoryService(MemoryService):
 
         keywords = set(query.lower().split())
 
-        all_msgs = []
-        hash_keys = await self._redis.hkeys(key)
-        for session_id in hash_keys:
-            msgs_json = await self._redis.hget(key, session_id)
-            msgs = self._deserialize(msgs_json)
-            all_msgs.extend(msgs)
-
-        matched_messages = []
-        for msg in all_msgs:
-            candidate_content = await self.get_query_text(msg)
-            if candidate_content:
-                msg_content_lower = candidate_content.lower()
-                if any(keyword in msg_content_lower for keyword in keywords):
-                    matched_messages.append(msg)
+        session_ids = await self._session_ids(user_id)
+        if not session_ids:
+            return []
+
+        # Match on the text lists, keeping (session, position) of hits.
+        pipe = self._redis.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.lrange(self._text_key(user_id, session_id), 0, -1)
+        matches: List[Tuple[str, int]] = []
+        for session_id, texts in zip(session_ids, await pipe.execute()):
+            for position, text in enumerate(texts):
+                if text:
+                    text_lower = text.lower()
+                    if any(keyword in text_lower for keyword in keywords):
+                        matches.append((session_id, position))
 
         if (
             filters
             and "top_k" in filters
             and isinstance(filters["top_k"], int)
         ):
-            return matched_messages[-filters["top_k"] :]
+            matches = matches[-filters["top_k"] :]
+
+        if not matches:
+            return []
 
-        return matched_messages
+        # Fetch and deserialize only the matched messages.
+        pipe = self._redis.pipeline(transaction=False)
+        for session_id, position in matches:
+            pipe.lindex(self._session_key(user_id, session_id), position)
+        return [
+            self._deserialize(message_json)
+            for message_json in await pipe.execute()
+            if message_json
+        ]
 
     async def get_query_text(self, message: Message) -> str:
         if message:
@@ -133,32 +265,59 @@ class RedisMemoryService(MemoryService):
         user_id: str,
         filters: Optional[Dict[str, Any]] = None,
     ) -> list:
-        key = self._user_key(user_id)
-        all_msgs = []
-        hash_keys = await self._redis.hkeys(key)
-        for session_id in sorted(hash_keys):
-            msgs_json = await self._redis.hget(key, session_id)
-            msgs = self._deserialize(msgs_json)
-            all_msgs.extend(msgs)
-
         page_num = filters.get("page_num", 1) if filters else 1
         page_size = filters.get("page_size", 10) if filters else 10
 
         start_index = (page_num - 1) * page_size
         end_index = start_index + page_size
 
-        return all_msgs[start_index:end_index]
+        # Sort by session id to have a consistent order for pagination
+        session_ids = await self._session_ids(user_id)
+        if not session_ids:
+            return []
+
+        pipe = self._redis.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.llen(self._session_key(user_id, session_id))
+        lengths = await pipe.execute()
+
+        # Read only the slices of the sessions overlapping the page.
+        pipe = self._redis.pipeline(transaction=False)
+        offset = 0
+        for session_id, length in zip(session_ids, lengths):
+            start = max(start_index - offset, 0)
+            stop = min(end_index - offset, length)
+            if start < stop:
+                pipe.lrange(
+                    self._session_key(user_id, session_id),
+                    start,
+                    stop - 1,
+                )
+            offset += length
+            if offset >= end_index:
+                break
+
+        all_msgs = []
+        for messages_json in await pipe.execute():
+            all_msgs.extend(self._deserialize(m) for m in messages_json)
+        return all_msgs
 
     async def delete_memory(
         self,
         user_id: str,
         session_id: Optional[str] = None,
     ) -> None:
-        key = self._user_key(user_id)
         if session_id:
-            await self._redis.hdel(key, session_id)
+            await self._ensure_migrated(user_id)
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.delete(
+                self._session_key(user_id, session_id),
+                self._text_key(user_id, session_id),
+            )
+            pipe.srem(self._index_key(user_id), session_id)
+            await pipe.execute()
         else:
-            await self._redis.delete(key)
+            await self.delete_user_memory(user_id)
 
     async def clear_all_memory(self) -> None:
         """
@@ -168,7 +327,15 @@ class RedisMemoryService(MemoryService):
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
 
-        keys = await self._redis.keys(self._user_key("*"))
+        keys = []
+        for pattern in (
+            self._index_key("*"),
+            self._session_key("*", "*"),
+            self._text_key("*", "*"),
+            self._legacy_user_key("*"),
+            self._legacy_text_key("*"),
+        ):
+            keys += await self._redis.keys(pattern)
         if keys:
             await self._redis.delete(*keys)
 
@@ -183,5 +350,13 @@ class RedisMemoryService(MemoryService):
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
 
-        key = self._user_key(user_id)
-        await self._redis.delete(key)
+        index_key = self._index_key(user_id)
+        keys = [
+            index_key,
+            self._legacy_user_key(user_id),
+            self._legacy_text_key(user_id),
+        ]
+        for session_id in await self._redis.smembers(index_key):
+            keys.append(self._session_key(user_id, session_id))
+            keys.append(self._text_key(user_id, session_id))
+        await self._redis.delete(*keys)
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
+import json
 import uuid
 
 from typing import Optional, Dict, Any, List, Union
 
 import redis.asyncio as aioredis
+from redis.exceptions import WatchError
 
 from .session_history_service import SessionHistoryService, Session
 from ..schemas.agent_schemas import Message
@@ -40,15 +42,78 @@ class RedisSessionHistoryService(SessionHistoryService):
     def _session_key(self, user_id: str, session_id: str):
         return f"session:{user_id}:{session_id}"
 
+    def _messages_key(self, user_id: str, session_id: str):
+        # Messages live in a Redis list next to the session metadata so
+        # that appends are a single RPUSH of the new messages only.
+        return f"session_messages:{user_id}:{session_id}"
+
     def _index_key(self, user_id: str):
         return f"session_index:{user_id}"
 
     def _session_to_json(self, session: Session) -> str:
-        return session.model_dump_json()
+        return session.model_dump_json(exclude={"messages"})
 
     def _session_from_json(self, s: str) -> Session:
         return Session.model_validate_json(s)
 
+    def _message_to_json(self, message: Message) -> str:
+        return message.model_dump_json()
+
+    def _message_from_json(self, s: str) -> Message:
+        return Message.model_validate_json(s)
+
+    @staticmethod
+    def _is_legacy(session_json: str) -> bool:
+        # The metadata of the list layout has no "messages" key: only parse
+        # the blobs that may have one
+        return '"messages":' in session_json and "messages" in json.loads(
+            session_json,
+        )
+
+    async def _migrate_legacy_session(
+        self,
+        user_id: str,
+        session_id: str,
+        session_json: str,
+    ) -> None:
+        """Moves messages of a session stored as a single JSON blob (the
+        previous layout) into the message list of the session."""
+        if not self._is_legacy(session_json):
+            return
+
+        key = self._session_key(user_id, session_id)
+        messages_key = self._messages_key(user_id, session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    # Another worker may migrate the session meanwhile, and
+                    # append messages right after: only migrate while the
+                    # legacy blob is still stored
+                    await pipe.watch(key)
+                    session_json = await pipe.get(key)
+                    if not session_json or not self._is_legacy(session_json):
+                        return
+
+                    session = self._session_from_json(session_json)
+                    messages = [
+                        msg
+                        if isinstance(msg, Message)
+                        else Message.model_validate(msg)
+                        for msg in session.messages
+                    ]
+                    pipe.multi()
+                    pipe.delete(messages_key)
+                    if messages:
+                        pipe.rpush(
+                            messages_key,
+                            *[self._message_to_json(msg) for msg in messages],
+                        )
+                    pipe.set(key, self._session_to_json(session))
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
     async def create_session(
         self,
         user_id: str,
@@ -60,38 +125,68 @@ class RedisSessionHistoryService(SessionHistoryService):
             sid = str(uuid.uuid4())
 
         session = Session(id=sid, user_id=user_id, messages=[])
-        key = self._session_key(user_id, sid)
 
-        await self._redis.set(key, self._session_to_json(session))
-        await self._redis.sadd(self._index_key(user_id), sid)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.set(
+            self._session_key(user_id, sid),
+            self._session_to_json(session),
+        )
+        pipe.delete(self._messages_key(user_id, sid))
+        pipe.sadd(self._index_key(user_id), sid)
+        await pipe.execute()
         return session
 
     async def get_session(
         self,
         user_id: str,
         session_id: str,
+        history_window: Optional[int] = None,
     ) -> Optional[Session]:
         key = self._session_key(user_id, session_id)
         session_json = await self._redis.get(key)
         if session_json is None:
             session = Session(id=session_id, user_id=user_id)
-            await self._redis.set(key, self._session_to_json(session))
-            await self._redis.sadd(self._index_key(user_id), session_id)
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.set(key, self._session_to_json(session))
+            pipe.sadd(self._index_key(user_id), session_id)
+            await pipe.execute()
+            return session
+
+        await self._migrate_legacy_session(user_id, session_id, session_json)
+        session = self._session_from_json(session_json)
+        if history_window is not None and history_window <= 0:
             return session
-        return self._session_from_json(session_json)
+
+        # LRANGE with a negative start only transfers the requested tail.
+        start = 0 if history_window is None else -history_window
+        messages_json = await self._redis.lrange(
+            self._messages_key(user_id, session_id),
+            start,
+            -1,
+        )
+        session.messages = [self._message_from_json(m) for m in messages_json]
+        return session
 
     async def delete_session(self, user_id: str, session_id: str):
-        key = self._session_key(user_id, session_id)
-        await self._redis.delete(key)
-        await self._redis.srem(self._index_key(user_id), session_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(
+            self._session_key(user_id, session_id),
+            self._messages_key(user_id, session_id),
+        )
+        pipe.srem(self._index_key(user_id), session_id)
+        await pipe.execute()
 
     async def list_sessions(self, user_id: str) -> list[Session]:
         idx_key = self._index_key(user_id)
-        session_ids = await self._redis.smembers(idx_key)
+        session_ids = list(await self._redis.smembers(idx_key))
+        if not session_ids:
+            return []
+
+        sessions_json = await self._redis.mget(
+            [self._session_key(user_id, sid) for sid in session_ids],
+        )
         sessions = []
-        for sid in session_ids:
-            key = self._session_key(user_id, sid)
-            session_json = await self._redis.get(key)
+        for session_json in sessions_json:
             if session_json:
                 session = self._session_from_json(session_json)
                 session.messages = []
@@ -125,10 +220,20 @@ class RedisSessionHistoryService(SessionHistoryService):
 
         session_json = await self._redis.get(key)
         if session_json:
-            stored_session = self._session_from_json(session_json)
-            stored_session.messages.extend(norm_message)
-            await self._redis.set(key, self._session_to_json(stored_session))
-            await self._redis.sadd(self._index_key(user_id), session_id)
+            await self._migrate_legacy_session(
+                user_id,
+                session_id,
+                session_json,
+            )
+            if not norm_message:
+                return
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.rpush(
+                self._messages_key(user_id, session_id),
+                *[self._message_to_json(msg) for msg in norm_message],
+            )
+            pipe.sadd(self._index_key(user_id), session_id)
+            await pipe.execute()
         else:
             print(
                 f"Warning: Session {session.id} not found in storage for "
@@ -149,8 +254,9 @@ class RedisSessionHistoryService(SessionHistoryService):
         index_key = self._index_key(user_id)
         session_ids = await self._redis.smembers(index_key)
 
+        keys = [index_key]
         for session_id in session_ids:
-            key = self._session_key(user_id, session_id)
-            await self._redis.delete(key)
+            keys.append(self._session_key(user_id, session_id))
+            keys.append(self._messages_key(user_id, session_id))
 
-        await self._redis.delete(index_key)
+        await self._redis.delete(*keys)
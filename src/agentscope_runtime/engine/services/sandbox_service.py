@@ -1,15 +1,86 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=too-many-branches
-from typing import List
+import asyncio
+import logging
+from typing import List, Optional
 
+from ...sandbox.box.sandbox import AsyncSandbox
 from ...sandbox.enums import SandboxType
-from ...sandbox.manager import SandboxManager
+from ...sandbox.manager import SandboxManager, AsyncSandboxManager
 from ...sandbox.registry import SandboxRegistry
 from ...sandbox.tools.mcp_tool import MCPTool
 from ...sandbox.tools.sandbox_tool import SandboxTool
 from ...sandbox.tools.function_tool import FunctionTool
 from ...engine.services.base import ServiceWithLifecycleManager
 
+logger = logging.getLogger(__name__)
+
+
+def _resolve_env_types(env_types=None, tools=None):
+    """Validate the tools and merge the sandbox types they require into
+    ``env_types``."""
+    if tools:
+        for tool in tools:
+            if not isinstance(tool, (SandboxTool, FunctionTool, MCPTool)):
+                raise ValueError(
+                    "tools must be instances of SandboxTool, "
+                    "FunctionTool, or MCPTool",
+                )
+
+    if env_types is None:
+        assert (
+            tools is not None
+        ), "tools must be specified when env_types is not set"
+
+    if tools:
+        tool_env_types = set()
+        for tool in tools:
+            tool_env_types.add(tool.sandbox_type)
+        if env_types is None:
+            env_types = []
+
+        env_types = set(env_types) | tool_env_types
+
+    return env_types
+
+
+def _merge_mcp_server_configs(tools, box_type: SandboxType) -> Optional[dict]:
+    """Merge the MCP server configs of the tools targeting ``box_type``."""
+    server_config_list = []
+    if tools:
+        for tool in tools:
+            if isinstance(tool, MCPTool) and SandboxType(
+                tool.sandbox_type,
+            ) == SandboxType(box_type):
+                server_config_list.append(tool.server_configs)
+    if not server_config_list:
+        return None
+
+    server_configs = {"mcpServers": {}}
+    for server_config in server_config_list:
+        if server_config is not None and "mcpServers" in server_config:
+            server_configs["mcpServers"].update(
+                server_config["mcpServers"],
+            )
+    return server_configs
+
+
+def _sandbox_type_from_version(version: str) -> Optional[SandboxType]:
+    """Infer the sandbox type from the image of a container."""
+    for x in SandboxType:
+        if x.value in version:
+            return x
+    return None
+
+
+def _is_agentbay_session_id(session_id: str) -> bool:
+    """
+    Check if a session ID belongs to AgentBay.
+
+    AgentBay session IDs typically start with 'session-' prefix.
+    """
+    return session_id.startswith("session-")
+
 
 class SandboxService(ServiceWithLifecycleManager):
     def __init__(self, base_url=None, bearer_token=None):
@@ -37,7 +108,7 @@ class SandboxService(ServiceWithLifecycleManager):
 
         if self.base_url is None:
             # Embedded mode
-            self.manager_api.cleanup()
+            self.manager_api.close()
 
     async def health(self) -> bool:
         return True
@@ -72,27 +143,7 @@ class SandboxService(ServiceWithLifecycleManager):
         env_types=None,
         tools=None,
     ):
-        if tools:
-            for tool in tools:
-                if not isinstance(tool, (SandboxTool, FunctionTool, MCPTool)):
-                    raise ValueError(
-                        "tools must be instances of SandboxTool, "
-                        "FunctionTool, or MCPTool",
-                    )
-
-        if env_types is None:
-            assert (
-                tools is not None
-            ), "tools must be specified when env_types is not set"
-
-        if tools:
-            tool_env_types = set()
-            for tool in tools:
-                tool_env_types.add(tool.sandbox_type)
-            if env_types is None:
-                env_types = []
-
-            env_types = set(env_types) | tool_env_types
+        env_types = _resolve_env_types(env_types, tools)
 
         sandboxes = []
         for env_type in env_types:
@@ -125,23 +176,8 @@ class SandboxService(ServiceWithLifecycleManager):
                 box.manager_api = self.manager_api
 
             # Add MCP to the sandbox
-            server_config_list = []
-            if tools:
-                for tool in tools:
-                    if isinstance(tool, MCPTool) and SandboxType(
-                        tool.sandbox_type,
-                    ) == SandboxType(box_type):
-                        server_config_list.append(tool.server_configs)
-            if server_config_list:
-                server_configs = {"mcpServers": {}}
-                for server_config in server_config_list:
-                    if (
-                        server_config is not None
-                        and "mcpServers" in server_config
-                    ):
-                        server_configs["mcpServers"].update(
-                            server_config["mcpServers"],
-                        )
+            server_configs = _merge_mcp_server_configs(tools, box_type)
+            if server_configs:
                 box.add_mcp_servers(server_configs, overwrite=False)
 
             sandboxes.append(box)
@@ -177,19 +213,10 @@ class SandboxService(ServiceWithLifecycleManager):
 
             # Standard sandbox connection
             info = self.manager_api.get_info(env_id)
-            version = info.get("version", "")
-
-            env_type = None
-            for x in SandboxType:
-                if x.value in version:
-                    env_type = x.value
-                    break
-
-            if env_type is None:
+            wb_type = _sandbox_type_from_version(info.get("version", ""))
+            if wb_type is None:
                 continue
 
-            wb_type = SandboxType(env_type)
-
             box_cls = SandboxRegistry.get_classes_by_type(wb_type)
 
             box = box_cls(
@@ -217,7 +244,7 @@ class SandboxService(ServiceWithLifecycleManager):
         Returns:
             True if this appears to be an AgentBay session ID
         """
-        return session_id.startswith("session-")
+        return _is_agentbay_session_id(session_id)
 
     def release(self, session_id, user_id):
         session_ctx_id = self._create_session_ctx_id(session_id, user_id)
@@ -239,3 +266,186 @@ class SandboxService(ServiceWithLifecycleManager):
     def _create_session_ctx_id(self, session_id, user_id):
         # Create a composite key from session_id and user_id
         return f"{session_id}_{user_id}"
+
+
+class AsyncSandboxService(ServiceWithLifecycleManager):
+    """
+    Async counterpart of ``SandboxService``.
+
+    Containers are created, looked up and released through an
+    ``AsyncSandboxManager``, so connecting a session never blocks the event
+    loop, and the sandboxes of one session are created concurrently. The
+    returned boxes are ``AsyncSandbox`` objects sharing the manager of the
+    service, so tool calls are awaited too (see ``SandboxTool.acall``).
+    AgentBay sandboxes, which are managed by the cloud, are returned as
+    regular ``AgentbaySandbox`` objects.
+    """
+
+    def __init__(self, base_url=None, bearer_token=None):
+        self.manager_api = AsyncSandboxManager(
+            base_url=base_url,
+            bearer_token=bearer_token,
+        )
+
+        self.base_url = base_url
+        self.bearer_token = bearer_token
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        # Release all environments
+        session_keys = await self.manager_api.list_session_keys()
+
+        for session_ctx_id in session_keys or []:
+            env_ids = await self.manager_api.get_session_mapping(
+                session_ctx_id,
+            )
+            await asyncio.gather(
+                *(
+                    self.manager_api.release(env_id)
+                    for env_id in env_ids or []
+                ),
+            )
+
+        if self.base_url is None:
+            # Embedded mode
+            await self.manager_api.close()
+        await self.manager_api.aclose()
+
+    async def health(self) -> bool:
+        return True
+
+    async def connect(
+        self,
+        session_id,
+        user_id,
+        env_types=None,
+        tools=None,
+    ) -> List:
+        session_ctx_id = self._create_session_ctx_id(session_id, user_id)
+
+        env_ids = await self.manager_api.get_session_mapping(session_ctx_id)
+
+        if env_ids:
+            return await self._connect_existing_environment(env_ids)
+        return await self._create_new_environment(
+            session_ctx_id,
+            env_types,
+            tools,
+        )
+
+    def _build_box(self, sandbox_id, sandbox_type):
+        # Every box shares the manager of the service
+        return AsyncSandbox(
+            sandbox_id=sandbox_id,
+            base_url=self.manager_api.base_url,
+            bearer_token=self.bearer_token,
+            sandbox_type=sandbox_type,
+            manager_api=self.manager_api,
+        )
+
+    def _build_agentbay_box(self, sandbox_id=None):
+        # Lazy import
+        from ...sandbox.box.agentbay.agentbay_sandbox import AgentbaySandbox
+
+        return AgentbaySandbox(
+            sandbox_id=sandbox_id,
+            base_url=self.base_url,
+            bearer_token=self.bearer_token,
+            sandbox_type=SandboxType.AGENTBAY,
+        )
+
+    async def _create_box(self, session_ctx_id, box_type, tools=None):
+        server_configs = _merge_mcp_server_configs(tools, box_type)
+
+        # AgentBay sandboxes are created by the cloud, not from the pool
+        if box_type == SandboxType.AGENTBAY:
+            box = await asyncio.to_thread(self._build_agentbay_box)
+            if server_configs:
+                await asyncio.to_thread(
+                    box.add_mcp_servers,
+                    server_configs,
+                    overwrite=False,
+                )
+            return box
+
+        box_id = await self.manager_api.create_from_pool(
+            sandbox_type=box_type.value,
+            meta={"session_ctx_id": session_ctx_id},
+        )
+        if box_id is None:
+            raise RuntimeError(
+                f"No sandbox of type {box_type.value} available.",
+            )
+        box = self._build_box(box_id, box_type)
+        if server_configs:
+            await box.add_mcp_servers(server_configs, overwrite=False)
+        return box
+
+    async def _create_new_environment(
+        self,
+        session_ctx_id: str,
+        env_types=None,
+        tools=None,
+    ):
+        env_types = _resolve_env_types(env_types, tools)
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self._create_box(
+                        session_ctx_id,
+                        SandboxType(env_type),
+                        tools,
+                    )
+                    for env_type in env_types
+                    if env_type is not None
+                ),
+            ),
+        )
+
+    async def _connect_box(self, env_id: str):
+        if _is_agentbay_session_id(env_id):
+            try:
+                return await asyncio.to_thread(
+                    self._build_agentbay_box,
+                    env_id,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to connect to AgentBay session {env_id}: {e}",
+                )
+                return None
+
+        info = await self.manager_api.get_info(env_id)
+        wb_type = _sandbox_type_from_version(info.get("version", ""))
+        if wb_type is None:
+            return None
+        return self._build_box(env_id, wb_type)
+
+    async def _connect_existing_environment(self, env_ids: List[str]):
+        boxes = await asyncio.gather(
+            *(self._connect_box(env_id) for env_id in env_ids),
+        )
+        return [box for box in boxes if box is not None]
+
+    async def release(self, session_id, user_id):
+        session_ctx_id = self._create_session_ctx_id(session_id, user_id)
+
+        env_ids = await self.manager_api.get_session_mapping(session_ctx_id)
+
+        # AgentBay sessions are cleaned up automatically when the sandbox
+        # object is destroyed
+        await asyncio.gather(
+            *(
+                self.manager_api.release(env_id)
+                for env_id in env_ids or []
+                if not _is_agentbay_session_id(env_id)
+            ),
+        )
+        return True
+
+    def _create_session_ctx_id(self, session_id, user_id):
+        # Create a composite key from session_id and user_id
+        return f"{session_id}_{user_id}"
@@ -28,6 +28,24 @@ class Session(BaseModel):
     messages: List[Union[Message, Dict[str, Any]]] = []
 
 
+def tail_messages(messages: list, history_window: Optional[int]) -> list:
+    """Returns the last ``history_window`` items of ``messages``.
+
+    Args:
+        messages: The full, chronologically ordered message list.
+        history_window: The number of most recent messages to keep, or
+            ``None`` to keep all of them.
+
+    Returns:
+        A new list holding the requested tail.
+    """
+    if history_window is None:
+        return list(messages)
+    if history_window <= 0:
+        return []
+    return messages[-history_window:]
+
+
 class SessionHistoryService(ServiceWithLifecycleManager):
     """Abstract base class for session history management services.
 
@@ -65,12 +83,16 @@ class SessionHistoryService(ServiceWithLifecycleManager):
         self,
         user_id: str,
         session_id: str,
+        history_window: Optional[int] = None,
     ) -> (Session | None):
         """Retrieves a specific session.
 
         Args:
             user_id: The identifier for the user.
             session_id: The identifier for the session to retrieve.
+            history_window: If set, only the most recent ``history_window``
+                messages are loaded into the returned session. ``None``
+                loads the complete history.
 
         Returns:
             The Session object if found, otherwise should raise an error or
@@ -123,6 +145,11 @@ class InMemorySessionHistoryService(SessionHistoryService):
     This service stores all session data in a dictionary, making it suitable
     for development, testing, and scenarios where persistence is not required.
 
+    Sessions handed out by this service are snapshots: each one owns its
+    message list, but the messages themselves are shared with the stored
+    session instead of being deep-copied. Stored messages are copied once
+    when appended and must be treated as immutable by callers.
+
     Attributes:
         _sessions: A dictionary holding all session objects, keyed by user ID
             and then by session ID.
@@ -132,6 +159,19 @@ class InMemorySessionHistoryService(SessionHistoryService):
         """Initializes the InMemorySessionHistoryService."""
         self._sessions: Dict[str, Dict[str, Session]] = {}
 
+    @staticmethod
+    def _snapshot(
+        session: Session,
+        history_window: Optional[int] = None,
+    ) -> Session:
+        """Returns a copy of ``session`` with its own message list that
+        shares the (immutable) message objects with the stored session."""
+        return session.model_copy(
+            update={
+                "messages": tail_messages(session.messages, history_window),
+            },
+        )
+
     async def create_session(
         self,
         user_id: str,
@@ -144,7 +184,7 @@ class InMemorySessionHistoryService(SessionHistoryService):
             session_id: The identifier for the session to delete.
 
         Returns:
-            A deep copy of the newly created Session object.
+            A snapshot of the newly created Session object.
         """
         session_id = (
             session_id.strip()
@@ -153,28 +193,31 @@ class InMemorySessionHistoryService(SessionHistoryService):
         )
         session = Session(id=session_id, user_id=user_id)
         self._sessions.setdefault(user_id, {})[session_id] = session
-        return copy.deepcopy(session)
+        return self._snapshot(session)
 
     async def get_session(
         self,
         user_id: str,
         session_id: str,
+        history_window: Optional[int] = None,
     ) -> Session | None:
         """Retrieves a specific session from memory.
 
         Args:
             user_id: The identifier for the user.
             session_id: The identifier for the session to retrieve.
+            history_window: If set, only the most recent ``history_window``
+                messages are included in the returned session.
 
         Returns:
-            A deep copy of the Session object if found, otherwise None.
+            A snapshot of the Session object if found, otherwise None.
         """
 
         session = self._sessions.get(user_id, {}).get(session_id)
         if not session:
             session = Session(id=session_id, user_id=user_id)
             self._sessions.setdefault(user_id, {})[session_id] = session
-        return copy.deepcopy(session) if session else None
+        return self._snapshot(session, history_window)
 
     async def delete_session(self, user_id: str, session_id: str) -> None:
         """Deletes a specific session from memory.
@@ -203,12 +246,10 @@ class InMemorySessionHistoryService(SessionHistoryService):
         user_sessions = self._sessions.get(user_id, {})
         # Return sessions without their potentially large history for
         # efficiency.
-        sessions_without_history = []
-        for session in user_sessions.values():
-            copied_session = copy.deepcopy(session)
-            copied_session.messages = []
-            sessions_without_history.append(copied_session)
-        return sessions_without_history
+        return [
+            self._snapshot(session, history_window=0)
+            for session in user_sessions.values()
+        ]
 
     async def append_message(
         self,
@@ -249,7 +290,11 @@ class InMemorySessionHistoryService(SessionHistoryService):
             session.id,
         )
         if storage_session:
-            storage_session.messages.extend(message)
+            # Copy once on write so that snapshots can share the stored
+            # messages without copying them on every read.
+            storage_session.messages.extend(
+                copy.deepcopy(msg) for msg in message
+            )
         else:
             print(
                 f"Warning: Session {session.id} not found in storage for "
@@ -46,8 +46,11 @@ class TablestoreRAGService(RAGService):
         text_field: Optional[str] = "text",
         embedding_field: Optional[str] = "embedding",
         vector_metric_type: VectorMetricType = VectorMetricType.VM_COSINE,
+        cache_size: int = 128,
+        cache_ttl: float = 60.0,
         **kwargs: Any,
     ):
+        super().__init__(cache_size=cache_size, cache_ttl=cache_ttl)
         self._embedding_model = (
             embedding_model if embedding_model else DashScopeEmbeddings()
         )
@@ -129,13 +132,18 @@ class TablestoreRAGService(RAGService):
             for doc, embedding in zip(docs, embeddings)
         ]
         await asyncio.gather(*put_tasks)
+        self.clear_cache()
 
-    async def retrieve(self, query: str, k: int = 1) -> list[str]:
+    async def _retrieve(self, query: str, k: int = 1) -> list[str]:
+        query_vector = await asyncio.to_thread(
+            self._embedding_model.embed_query,
+            query,
+        )
         matched_text = [
             hit.document.text
             for hit in (
                 await self._knowledge_store.vector_search(
-                    query_vector=self._embedding_model.embed_query(query),
+                    query_vector=query_vector,
                     top_k=k,
                 )
             ).hits
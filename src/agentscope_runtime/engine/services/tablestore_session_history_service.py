@@ -151,12 +151,15 @@ class TablestoreSessionHistoryService(SessionHistoryService):
         self,
         user_id: str,
         session_id: str,
+        history_window: Optional[int] = None,
     ) -> Session | None:
         """Retrieves a specific session from memory.
 
         Args:
             user_id: The identifier for the user.
             session_id: The identifier for the session to retrieve.
+            history_window: If set, only the most recent ``history_window``
+                messages are read from tablestore.
 
         Returns:
             A Session object if found, otherwise None.
@@ -174,6 +177,21 @@ class TablestoreSessionHistoryService(SessionHistoryService):
             )
             await self._memory_store.put_session(tablestore_session)
             tablestore_messages = None
+        elif history_window is not None:
+            if history_window > 0:
+                # Read the newest messages first and restore the
+                # chronological order afterwards.
+                messages_iterator = await self._memory_store.list_messages(
+                    session_id=session_id,
+                    order=Order.DESC,
+                    max_count=history_window,
+                )
+                tablestore_messages = [
+                    message async for message in messages_iterator
+                ]
+                tablestore_messages.reverse()
+            else:
+                tablestore_messages = []
         else:
             messages_iterator = await self._memory_store.list_messages(
                 session_id=session_id,
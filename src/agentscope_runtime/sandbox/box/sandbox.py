@@ -6,6 +6,7 @@ from typing import Any, Optional
 
 from ..enums import SandboxType
 from ..manager.sandbox_manager import SandboxManager
+from ..manager.async_sandbox_manager import AsyncSandboxManager
 
 
 logging.basicConfig(level=logging.INFO)
@@ -169,3 +170,134 @@ class Sandbox:
             server_configs,
             overwrite,
         )
+
+
+class AsyncSandbox:
+    """
+    Asynchronous sandbox interface.
+
+    The sandbox is acquired when entering the ``async with`` block (or on
+    ``await box.start()``) and released on exit. Every operation is
+    awaitable and goes through an ``AsyncSandboxManager``, so concurrent
+    agent streams do not block each other.
+    """
+
+    def __init__(
+        self,
+        sandbox_id: Optional[str] = None,
+        base_url: Optional[str] = None,
+        bearer_token: Optional[str] = None,
+        sandbox_type: SandboxType = SandboxType.BASE,
+        manager_api: Optional[AsyncSandboxManager] = None,
+    ) -> None:
+        """
+        Initialize the async sandbox interface.
+        """
+        self.base_url = base_url
+        self._owns_manager = manager_api is None
+        if manager_api is not None:
+            self.embed_mode = False
+            self.manager_api = manager_api
+        elif base_url:
+            self.embed_mode = False
+            self.manager_api = AsyncSandboxManager(
+                base_url=base_url,
+                bearer_token=bearer_token,
+            )
+        else:
+            # Launch a local manager
+            self.embed_mode = True
+            self.manager_api = AsyncSandboxManager(
+                default_type=sandbox_type,
+            )
+
+        self._sandbox_id = sandbox_id
+        self.sandbox_type = sandbox_type
+
+    async def start(self) -> "AsyncSandbox":
+        """Acquire a sandbox from the manager if none is bound yet."""
+        if self._sandbox_id is None:
+            sandbox_id = await self.manager_api.create_from_pool(
+                sandbox_type=SandboxType(self.sandbox_type).value,
+            )
+            if sandbox_id is None:
+                raise RuntimeError(
+                    "No sandbox available. "
+                    "Please check if sandbox images exist, build or pull "
+                    "missing images in sandbox server.",
+                )
+            self._sandbox_id = sandbox_id
+        return self
+
+    async def close(self) -> None:
+        """
+        Release the sandbox. In embed mode, all resources of the local
+        manager are cleaned up.
+        """
+        try:
+            if self.embed_mode:
+                await self.manager_api.close()
+            elif self._sandbox_id is not None:
+                await self.manager_api.release(self._sandbox_id)
+        except Exception as e:
+            import traceback
+
+            logger.error(
+                f"Cleanup {self._sandbox_id} error: {e}\n"
+                f"{traceback.format_exc()}",
+            )
+        finally:
+            if self._owns_manager:
+                await self.manager_api.aclose()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def sandbox_id(self) -> Optional[str]:
+        """Get the sandbox ID."""
+        return self._sandbox_id
+
+    @sandbox_id.setter
+    def sandbox_id(self, value: str) -> None:
+        """Set the sandbox ID."""
+        if not value:
+            raise ValueError("Sandbox ID cannot be empty.")
+        self._sandbox_id = value
+
+    async def get_info(self) -> dict:
+        return await self.manager_api.get_info(self.sandbox_id)
+
+    async def list_tools(self, tool_type: Optional[str] = None) -> dict:
+        return await self.manager_api.list_tools(
+            self.sandbox_id,
+            tool_type=tool_type,
+        )
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        if arguments is None:
+            arguments = {}
+
+        return await self.manager_api.call_tool(
+            self.sandbox_id,
+            name,
+            arguments,
+        )
+
+    async def add_mcp_servers(
+        self,
+        server_configs: dict,
+        overwrite=False,
+    ):
+        return await self.manager_api.add_mcp_servers(
+            self.sandbox_id,
+            server_configs,
+            overwrite,
+        )
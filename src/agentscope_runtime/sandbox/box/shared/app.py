@@ -5,6 +5,7 @@ from fastapi import FastAPI, Response, Depends
 from routers import (
     generic_router,
     mcp_router,
+    reset_router,
     watcher_router,
     workspace_router,
 )
@@ -37,6 +38,7 @@ app.include_router(
     workspace_router,
     dependencies=[Depends(verify_secret_token)],
 )
+app.include_router(reset_router, dependencies=[Depends(verify_secret_token)])
 
 if __name__ == "__main__":
     import uvicorn
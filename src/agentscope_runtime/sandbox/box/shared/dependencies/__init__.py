@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from .deps import verify_secret_token
+from .deps import verify_secret_token, set_secret_token
 
 
-__all__ = ["verify_secret_token"]
+__all__ = ["verify_secret_token", "set_secret_token"]
@@ -7,6 +7,12 @@ from fastapi import Header, HTTPException, status
 SECRET_TOKEN = os.getenv("SECRET_TOKEN", "secret_token123")
 
 
+def set_secret_token(token: str) -> None:
+    """Rotate the token required by every endpoint."""
+    global SECRET_TOKEN
+    SECRET_TOKEN = token
+
+
 async def verify_secret_token(authorization: Optional[str] = Header(None)):
     if authorization is None or not authorization.startswith("Bearer "):
         raise HTTPException(
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 from .generic import generic_router
 from .mcp import mcp_router
+from .reset import reset_router
 from .runtime_watcher import watcher_router
 from .workspace import workspace_router
 
 __all__ = [
     "mcp_router",
     "generic_router",
+    "reset_router",
     "watcher_router",
     "workspace_router",
 ]
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import io
+import os
 import sys
 import logging
 import subprocess
@@ -17,6 +18,7 @@ generic_router = APIRouter()
 
 # Initialize IPython shell
 ipy = InteractiveShell.instance()
+_INITIAL_CWD = os.getcwd()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -190,3 +192,10 @@ async def run_shell_command(
             status_code=500,
             detail=f"{str(e)}: {traceback.format_exc()}",
         ) from e
+
+
+def reset_ipython_shell() -> None:
+    """Drop every variable, import and history entry of the IPython shell,
+    and restore the initial working directory."""
+    ipy.reset(new_session=True)
+    os.chdir(_INITIAL_CWD)
@@ -183,6 +183,12 @@ async def cleanup_servers() -> None:
     _MCP_SERVERS = {}
 
 
+async def reset_mcp_servers() -> None:
+    """Stop every MCP server and start the default ones again."""
+    await cleanup_servers()
+    await startup_event()
+
+
 @mcp_router.on_event("startup")
 async def startup_event():
     # Load MCP server configs
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import logging
+import traceback
+from typing import Optional
+
+from fastapi import APIRouter, Body, HTTPException, Response
+
+from dependencies import set_secret_token
+from .generic import reset_ipython_shell
+from .mcp import reset_mcp_servers
+from .workspace import wipe_workspace
+
+reset_router = APIRouter()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@reset_router.post(
+    "/reset",
+    summary="Reset the sandbox to a clean state for a new session",
+)
+async def reset(
+    secret_token: Optional[str] = Body(
+        None,
+        embed=True,
+    ),
+):
+    """
+    Wipe /workspace, reset the IPython shell and restart the default MCP
+    servers. If ``secret_token`` is given, it replaces the token required
+    by every endpoint, so the previous session loses access.
+    """
+    try:
+        wipe_workspace()
+        reset_ipython_shell()
+        await reset_mcp_servers()
+        if secret_token:
+            set_secret_token(secret_token)
+        return Response(content="OK", status_code=200)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"{str(e)}: {traceback.format_exc()}",
+        ) from e
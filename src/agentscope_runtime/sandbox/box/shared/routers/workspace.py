@@ -42,6 +42,20 @@ def ensure_within_workspace(
     return full_path
 
 
+def wipe_workspace(base_directory: str = "/workspace") -> None:
+    """
+    Remove everything inside the workspace, keeping the directory itself as
+    it is usually a mount point.
+    """
+    if not os.path.isdir(base_directory):
+        return
+    for entry in os.scandir(base_directory):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.remove(entry.path)
+
+
 @workspace_router.get(
     "/workspace/files",
     summary="Retrieve a file within the /workspace directory",
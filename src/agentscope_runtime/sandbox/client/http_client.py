@@ -91,6 +91,8 @@ class SandboxHttpClient:
         self.session = requests.Session()
         self.built_in_tools = []
         self.secret = model.runtime_token
+        # Set once a request failed, until the next successful health check
+        self.needs_health_check = False
 
         # Update headers with secret if provided
         headers = {
@@ -107,12 +109,20 @@ class SandboxHttpClient:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its connections."""
+        self.session.close()
 
     def _request(self, method: str, url: str, **kwargs):
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
-        return self.session.request(method, url, **kwargs)
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.needs_health_check = True
+            raise
 
     def check_health(self) -> bool:
         """
@@ -125,9 +135,11 @@ class SandboxHttpClient:
         endpoint = f"{self.base_url}/healthz"
         try:
             response_api = self.session.get(endpoint)
-            return response_api.status_code == 200
+            healthy = response_api.status_code == 200
         except requests.RequestException:
-            return False
+            healthy = False
+        self.needs_health_check = not healthy
+        return healthy
 
     def wait_until_healthy(self) -> None:
         """
@@ -265,6 +277,33 @@ class SandboxHttpClient:
                 "content": [{"type": "text", "text": str(e)}],
             }
 
+    def reset(self, secret_token: Optional[str] = None) -> dict:
+        """
+        Reset the sandbox for a new session: wipe /workspace, reset the
+        IPython shell and restart the default MCP servers. If
+        ``secret_token`` is given, it becomes the token of the sandbox.
+        """
+        try:
+            endpoint = f"{self.base_url}/reset"
+            response = self._request(
+                "post",
+                endpoint,
+                json={"secret_token": secret_token},
+            )
+            response.raise_for_status()
+            if secret_token:
+                self.secret = secret_token
+                self.session.headers.update(
+                    {"Authorization": f"Bearer {secret_token}"},
+                )
+            return {"isError": False, "content": []}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"An error occurred while resetting sandbox: {e}")
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
     @property
     def generic_tools(self) -> dict:
         return self._generic_tools
@@ -19,6 +19,8 @@ class TrainingSandboxClient:
         self.base_url = base_url.rstrip("/")
         self.timeout = 100
         self.session = requests.Session()
+        # Set once a request failed, until the next successful health check
+        self.needs_health_check = False
 
     def __enter__(self):
         # Wait for the runtime api server to be healthy
@@ -26,7 +28,11 @@ class TrainingSandboxClient:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its connections."""
+        self.session.close()
 
     def wait_until_healthy(self) -> None:
         """
@@ -53,10 +59,11 @@ class TrainingSandboxClient:
 
         try:
             response_api = self.session.get(endpoint)
-
-            return response_api.status_code == 200
+            healthy = response_api.status_code == 200
         except requests.RequestException:
-            return False
+            healthy = False
+        self.needs_health_check = not healthy
+        return healthy
 
     def _make_request(
         self,
@@ -76,7 +83,11 @@ class TrainingSandboxClient:
             "messages": messages or {},
             "params": params or {},
         }
-        response = self.session.post(url, json=data)
+        try:
+            response = self.session.post(url, json=data)
+        except requests.RequestException:
+            self.needs_health_check = True
+            raise
         try:
             response.raise_for_status()
         except HTTPError as e:
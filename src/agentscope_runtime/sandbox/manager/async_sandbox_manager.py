@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import inspect
+import json
+import logging
+from functools import wraps
+from typing import Optional, Dict, Union, List, AsyncIterator
+
+import httpx
+
+from .sandbox_manager import SandboxManager, format_http_error
+from ..enums import SandboxType
+from ..model import SandboxManagerEnvConfig
+
+logger = logging.getLogger(__name__)
+
+
+def async_remote_wrapper(
+    method: str = "POST",
+    success_key: str = "data",
+):
+    """
+    Async counterpart of ``remote_wrapper``.
+
+    In remote mode the call is sent to the manager server through the
+    pooled ``httpx.AsyncClient``; otherwise the decorated coroutine runs
+    locally.
+    """
+
+    def decorator(func):
+        endpoint = "/" + func.__name__
+        # Resolve the parameter names once, at decoration time
+        param_names = list(inspect.signature(func).parameters)[1:]
+
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if not self.http_client:
+                # Execute the original function locally
+                return await func(self, *args, **kwargs)
+
+            # Prepare data for remote call
+            data = dict(zip(param_names, args))
+            data.update(kwargs)
+
+            # Make the remote HTTP request
+            response = await self._make_request(method, endpoint, data)
+
+            # Process response
+            if success_key:
+                return response.get(success_key)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class AsyncSandboxManager:
+    """
+    Asynchronous sandbox manager exposing the same API as
+    ``SandboxManager``.
+
+    In remote mode, requests go through a single ``httpx.AsyncClient`` whose
+    connections are pooled and kept alive across calls. In embedded mode,
+    an in-process ``SandboxManager`` does the work and its blocking calls
+    (container creation, tool calls, ...) run in worker threads, so the
+    event loop is never blocked.
+
+    Args:
+        config: Manager configuration, used in embedded mode only.
+        base_url: URL of a sandbox manager server. Enables remote mode.
+        bearer_token: Token used to authenticate against the server.
+        default_type: The sandbox type(s) managed in embedded mode.
+        timeout: Timeout in seconds of remote requests.
+        max_connections: Maximum number of pooled connections to the
+            server.
+        max_keepalive_connections: Maximum number of idle connections kept
+            alive in the pool.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SandboxManagerEnvConfig] = None,
+        base_url=None,
+        bearer_token=None,
+        default_type: Union[
+            SandboxType,
+            str,
+            List[Union[SandboxType, str]],
+        ] = SandboxType.BASE,
+        timeout: float = 30,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+    ):
+        if base_url:
+            # Initialize a pooled HTTP client for remote mode with bearer
+            # token authentication
+            headers = {}
+            if bearer_token:
+                headers["Authorization"] = f"Bearer {bearer_token}"
+            self.base_url = base_url.rstrip("/")
+            self.http_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+            )
+            self._manager = None
+        else:
+            self.base_url = None
+            self.http_client = None
+            self._manager = SandboxManager(
+                config=config,
+                default_type=default_type,
+            )
+
+    @property
+    def sync_manager(self) -> Optional[SandboxManager]:
+        """The in-process manager used in embedded mode."""
+        return self._manager
+
+    async def __aenter__(self):
+        logger.debug(
+            "Entering AsyncSandboxManager context. "
+            "Cleanup will be performed automatically on exit.",
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        logger.debug(
+            "Exiting AsyncSandboxManager context. Cleaning up resources.",
+        )
+        try:
+            await self.close()
+        finally:
+            await self.aclose()
+
+    async def close(self):
+        """
+        Release every container. An embedded manager also stops its
+        background tasks, for good (see ``SandboxManager.close``).
+        """
+        if self.http_client:
+            return await self.cleanup()
+        return await self._run_local(self._manager.close)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections, if any."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
+    async def _make_request(self, method: str, endpoint: str, data: dict):
+        """
+        Make an HTTP request to the specified endpoint.
+        """
+        if method.upper() == "GET":
+            response = await self.http_client.get(endpoint, params=data)
+        else:
+            response = await self.http_client.request(
+                method,
+                endpoint,
+                json=data,
+            )
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            error = format_http_error(response, e)
+            logger.error(f"Error making request: {error}")
+            return {"data": f"Error: {error}"}
+
+        return response.json()
+
+    async def _stream_request(
+        self,
+        endpoint: str,
+        data: dict,
+    ) -> AsyncIterator[dict]:
+        """
+        Make an HTTP request to an endpoint streaming JSON lines.
+        """
+        async with self.http_client.stream(
+            "POST",
+            endpoint,
+            json=data,
+        ) as response:
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                await response.aread()
+                error = format_http_error(response, e)
+                logger.error(f"Error making request: {error}")
+                raise RuntimeError(error) from e
+
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    @staticmethod
+    async def _run_local(func, *args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    @async_remote_wrapper()
+    async def cleanup(self):
+        return await self._run_local(self._manager.cleanup)
+
+    @async_remote_wrapper()
+    async def create_from_pool(
+        self,
+        sandbox_type=None,
+        meta: Optional[Dict] = None,
+    ):
+        """Try to get a container from runtime pool"""
+        return await self._run_local(
+            self._manager.create_from_pool,
+            sandbox_type=sandbox_type,
+            meta=meta,
+        )
+
+    @async_remote_wrapper()
+    async def create(
+        self,
+        sandbox_type=None,
+        mount_dir=None,
+        storage_path=None,
+        environment: Optional[Dict] = None,
+        meta: Optional[Dict] = None,
+    ):
+        return await self._run_local(
+            self._manager.create,
+            sandbox_type=sandbox_type,
+            mount_dir=mount_dir,
+            storage_path=storage_path,
+            environment=environment,
+            meta=meta,
+        )
+
+    async def iter_create_batch(
+        self,
+        sandbox_type=None,
+        count: int = 1,
+        meta: Optional[Dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Create ``count`` sandboxes concurrently, taking them from the pool
+        when possible. Yields ``{"index": ..., "container_name": ...}`` as
+        soon as each sandbox is ready, in completion order; the name is
+        None when the creation failed.
+        """
+        if self.http_client:
+            async for item in self._stream_request(
+                "/create_batch_stream",
+                {"sandbox_type": sandbox_type, "count": count, "meta": meta},
+            ):
+                yield item
+            return
+
+        if count > self._manager.config.max_batch_size:
+            raise ValueError(
+                f"Cannot create {count} sandboxes at once, the maximum is "
+                f"{self._manager.config.max_batch_size}.",
+            )
+        semaphore = asyncio.Semaphore(self._manager.create_concurrency)
+        started = set()
+
+        async def create_one(index):
+            async with semaphore:
+                started.add(index)
+                try:
+                    container_name = await self.create_from_pool(
+                        sandbox_type=sandbox_type,
+                        meta=meta,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to create container: {e}")
+                    container_name = None
+            return {"index": index, "container_name": container_name}
+
+        tasks = [asyncio.ensure_future(create_one(i)) for i in range(count)]
+        yielded = set()
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                yielded.add(item["index"])
+                yield item
+        finally:
+            # Drop the creations not started yet. Let the others complete,
+            # so that their containers are registered, and release those
+            # nobody received.
+            for index, task in enumerate(tasks):
+                if index not in started:
+                    task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            abandoned = [
+                result["container_name"]
+                for result in results
+                if isinstance(result, dict)
+                and result["index"] not in yielded
+                and result["container_name"]
+            ]
+            if abandoned:
+                await self.release_batch(abandoned)
+
+    @async_remote_wrapper()
+    async def create_batch(
+        self,
+        sandbox_type=None,
+        count: int = 1,
+        meta: Optional[Dict] = None,
+    ) -> list:
+        """
+        Create ``count`` sandboxes concurrently. Returns their container
+        names in order, None for the failed ones.
+        """
+        return await self._run_local(
+            self._manager.create_batch,
+            sandbox_type=sandbox_type,
+            count=count,
+            meta=meta,
+        )
+
+    @async_remote_wrapper()
+    async def release_batch(self, identities: list) -> dict:
+        """
+        Release several sandboxes concurrently. Returns whether each one was
+        released, by identity.
+        """
+        return await self._run_local(self._manager.release_batch, identities)
+
+    @async_remote_wrapper()
+    async def release(self, identity):
+        return await self._run_local(self._manager.release, identity)
+
+    @async_remote_wrapper()
+    async def start(self, identity):
+        return await self._run_local(self._manager.start, identity)
+
+    @async_remote_wrapper()
+    async def stop(self, identity):
+        return await self._run_local(self._manager.stop, identity)
+
+    @async_remote_wrapper()
+    async def get_status(self, identity):
+        """Get container status by container_name or container_id."""
+        return await self._run_local(self._manager.get_status, identity)
+
+    @async_remote_wrapper()
+    async def get_info(self, identity):
+        """Get container information by container_name or container_id."""
+        return await self._run_local(self._manager.get_info, identity)
+
+    @async_remote_wrapper()
+    async def check_health(self, identity):
+        """Check health"""
+        return await self._run_local(self._manager.check_health, identity)
+
+    @async_remote_wrapper()
+    async def list_tools(self, identity, tool_type=None, **kwargs):
+        """List tool"""
+        return await self._run_local(
+            self._manager.list_tools,
+            identity,
+            tool_type=tool_type,
+            **kwargs,
+        )
+
+    @async_remote_wrapper()
+    async def call_tool(self, identity, tool_name=None, arguments=None):
+        """Call tool"""
+        return await self._run_local(
+            self._manager.call_tool,
+            identity,
+            tool_name=tool_name,
+            arguments=arguments,
+        )
+
+    @async_remote_wrapper()
+    async def add_mcp_servers(self, identity, server_configs, overwrite=False):
+        """
+        Add MCP servers to runtime.
+        """
+        return await self._run_local(
+            self._manager.add_mcp_servers,
+            identity,
+            server_configs=server_configs,
+            overwrite=overwrite,
+        )
+
+    @async_remote_wrapper()
+    async def get_session_mapping(self, session_ctx_id: str) -> list:
+        """Get all container names bound to a session context"""
+        return await self._run_local(
+            self._manager.get_session_mapping,
+            session_ctx_id,
+        )
+
+    @async_remote_wrapper()
+    async def list_session_keys(self) -> list:
+        """Return all session_ctx_id keys currently in mapping"""
+        return await self._run_local(self._manager.list_session_keys)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class ClientCache:
+    """
+    Thread-safe cache of the HTTP clients connected to sandbox containers,
+    keyed by container name.
+
+    A cached client keeps its HTTP session, and thus its keep-alive
+    connections, across tool calls. Its health is only verified again once
+    a request through it failed (``client.needs_health_check``). Clients
+    unused for ``idle_timeout`` seconds are closed and dropped.
+
+    Args:
+        idle_timeout: Seconds after which an unused client is evicted.
+    """
+
+    def __init__(self, idle_timeout: float = 300.0):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # key -> [client, last used], least recently used first
+        self._clients: "OrderedDict[str, List[Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._clients
+
+    @staticmethod
+    def _close(client) -> None:
+        try:
+            close = getattr(client, "close", None)
+            if close is not None:
+                close()
+        except Exception as e:
+            logger.debug(f"Error closing sandbox client: {e}")
+
+    def _pop_expired(self, now: float) -> list:
+        expired = []
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self._clients[key]
+            expired.append(client)
+        return expired
+
+    def get(self, key: str, factory: Callable[[], Any]):
+        """
+        Return the cached client of ``key``, creating it with ``factory``
+        when missing or unhealthy.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = self._pop_expired(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry[1] = now
+                self._clients.move_to_end(key)
+        for client in expired:
+            self._close(client)
+
+        if entry is not None:
+            client = entry[0]
+            if not getattr(client, "needs_health_check", False):
+                return client
+            if client.check_health():
+                return client
+            logger.warning(f"Connection to {key} is unhealthy, reconnecting.")
+            self.evict(key)
+
+        # Built outside the lock, as it waits for the container to be healthy
+        client = factory()
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is None:
+                self._clients[key] = [client, time.monotonic()]
+                return client
+
+        # Another thread connected in the meantime
+        self._close(client)
+        return entry[0]
+
+    def evict(self, key: str) -> None:
+        """Close and drop the client of ``key``, if cached."""
+        with self._lock:
+            entry = self._clients.pop(key, None)
+        if entry is not None:
+            self._close(entry[0])
+
+    def clear(self) -> None:
+        """Close and drop every cached client."""
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+        for client, _ in entries:
+            self._close(client)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import traceback
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IdleReaper:
+    """
+    Periodically releases the sandbox containers of a ``SandboxManager``
+    that stayed idle longer than their TTL.
+
+    The work itself is done by ``SandboxManager.reap_idle_containers``;
+    this class only runs it every ``interval`` seconds on a daemon thread.
+
+    Args:
+        manager: The ``SandboxManager`` owning the containers.
+        interval: Seconds between two sweeps.
+    """
+
+    def __init__(self, manager, interval: float = 60.0):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.manager = manager
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background thread."""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="sandbox-idle-reaper",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting for a running sweep."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                reaped = self.manager.reap_idle_containers()
+                if reaped:
+                    logger.info(f"Released idle containers: {reaped}")
+            except Exception as e:
+                logger.error(f"Error releasing idle containers: {e}")
+                logger.debug(f"{traceback.format_exc()}")
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+import logging
+import math
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from ..enums import SandboxType
+
+logger = logging.getLogger(__name__)
+
+# Drop the leases of the pooled containers being created for this long,
+# e.g. when the process creating them died
+CREATION_LEASE_TTL = 600.0
+
+# Remove the expired leases of the sorted set KEYS[2], then lease, until
+# ARGV[3], as many creations as the pool KEYS[1] lacks to hold ARGV[2]
+# containers, naming them after ARGV[4]. Returns the number of leases.
+_RESERVE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local missing = tonumber(ARGV[2]) - redis.call('LLEN', KEYS[1])
+    - redis.call('ZCARD', KEYS[2])
+for i = 1, missing do
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4] .. ':' .. i)
+end
+return math.max(missing, 0)
+"""
+
+
+class InFlightCreations:
+    """
+    Counts the pooled containers being created, per sandbox type, so that
+    a pool is not refilled twice. The count is kept in this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[SandboxType, int] = {}
+
+    def reserve(
+        self,
+        sandbox_type: SandboxType,
+        queue,
+        pool_size: int,
+    ) -> List[Optional[str]]:
+        """
+        Reserve the creations the pool ``queue`` lacks to hold
+        ``pool_size`` containers.
+
+        Returns:
+            One lease per creation, to be released once it is done.
+        """
+        with self._lock:
+            in_flight = self._counts.get(sandbox_type, 0)
+            missing = pool_size - queue.size() - in_flight
+            if missing <= 0:
+                return []
+            self._counts[sandbox_type] = in_flight + missing
+        return [None] * missing
+
+    def release(
+        self,
+        sandbox_type: SandboxType,
+        queue,
+        lease: Optional[str],
+    ) -> None:
+        """Release the lease of a finished creation."""
+        with self._lock:
+            self._counts[sandbox_type] -= 1
+
+    def pending(self, pools: Dict[SandboxType, object]) -> int:
+        """The number of creations in flight for ``pools``."""
+        with self._lock:
+            return sum(self._counts.get(t, 0) for t in pools)
+
+
+class RedisInFlightCreations(InFlightCreations):
+    """
+    Counts the pooled containers being created in Redis, so that all the
+    managers sharing a pool share a single creation budget.
+
+    Every creation holds a lease, in a sorted set next to the pool, which
+    expires after ``lease_ttl`` seconds so that the creations of a dead
+    process are not counted forever.
+    """
+
+    def __init__(self, redis_client, lease_ttl: float = CREATION_LEASE_TTL):
+        super().__init__()
+        self.client = redis_client
+        self.lease_ttl = lease_ttl
+        self._reserve = redis_client.register_script(_RESERVE_SCRIPT)
+
+    @staticmethod
+    def _leases_key(queue) -> str:
+        return f"{queue.queue_name}:creating"
+
+    def reserve(
+        self,
+        sandbox_type: SandboxType,
+        queue,
+        pool_size: int,
+    ) -> List[Optional[str]]:
+        now = time.time()
+        prefix = uuid.uuid4().hex
+        missing = self._reserve(
+            keys=[queue.queue_name, self._leases_key(queue)],
+            args=[now, pool_size, now + self.lease_ttl, prefix],
+        )
+        return [f"{prefix}:{i}" for i in range(1, int(missing) + 1)]
+
+    def release(
+        self,
+        sandbox_type: SandboxType,
+        queue,
+        lease: Optional[str],
+    ) -> None:
+        self.client.zrem(self._leases_key(queue), lease)
+
+    def pending(self, pools: Dict[SandboxType, object]) -> int:
+        now = time.time()
+        return sum(
+            self.client.zcount(self._leases_key(queue), now, "+inf")
+            for queue in pools.values()
+        )
+
+
+class PoolReplenisher:
+    """
+    Keeps the warm container pools of a ``SandboxManager`` filled in the
+    background.
+
+    A daemon thread checks every pool each ``interval`` seconds, or as soon
+    as ``notify()`` is called after a dequeue. When a pool holds
+    ``low_watermark`` containers or fewer, the missing containers (up to
+    ``pool_size``) are created on a bounded thread pool, so container
+    start-up never happens on the request path.
+
+    Args:
+        manager: The ``SandboxManager`` owning the pools.
+        pool_size: The target number of containers per pool.
+        low_watermark: Refill a pool once its size drops to this value.
+            Defaults to ``pool_size - 1``, i.e. refill on every dequeue.
+        max_concurrency: Maximum number of containers created at once.
+        interval: Seconds between two periodic checks. The wait doubles
+            after every failed creation, up to 64 times the interval.
+        in_flight: The count of the containers being created. Defaults to
+            a count kept in this process; managers sharing their pools in
+            Redis pass a ``RedisInFlightCreations``.
+    """
+
+    def __init__(
+        self,
+        manager,
+        pool_size: int,
+        low_watermark: Optional[int] = None,
+        max_concurrency: int = 4,
+        interval: float = 5.0,
+        in_flight: Optional[InFlightCreations] = None,
+    ):
+        if low_watermark is None:
+            low_watermark = pool_size - 1
+        if not 0 <= low_watermark < pool_size:
+            raise ValueError(
+                "low_watermark must be in the range [0, pool_size)",
+            )
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+
+        self.manager = manager
+        self.pool_size = pool_size
+        self.low_watermark = low_watermark
+        self.max_concurrency = max_concurrency
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._progress = threading.Condition(self._lock)
+        self._in_flight = in_flight or InFlightCreations()
+        self._failures = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background thread."""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="sandbox-pool",
+        )
+        self._thread = threading.Thread(
+            target=self._run,
+            name="sandbox-pool-replenisher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop refilling and, optionally, wait for pending creations."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def notify(self) -> None:
+        """Ask for an immediate check, e.g. after a container was taken."""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.replenish()
+            except Exception as e:
+                logger.error(f"Error replenishing container pool: {e}")
+                logger.debug(f"{traceback.format_exc()}")
+            self._wakeup.wait(self.interval * 2 ** min(self._failures, 6))
+            self._wakeup.clear()
+
+    def _ready_count(self) -> int:
+        return sum(
+            min(queue.size(), self.pool_size)
+            for queue in self.manager.pool_queues.values()
+        )
+
+    def wait_until_ready(
+        self,
+        min_ready: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Block until ``min_ready`` (a fraction) of all the pool slots hold a
+        container, logging the progress. The remaining containers keep
+        being created in the background.
+
+        Returns:
+            Whether the requested fraction was reached. ``False`` means the
+            timeout expired, or every pending creation failed.
+        """
+        total = self.pool_size * len(self.manager.pool_queues)
+        required = math.ceil(total * min_ready)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        self.replenish(force=True)
+
+        reported = None
+        while True:
+            # Read the pending count first: a container is enqueued before
+            # its creation is marked as done
+            pending = self._in_flight.pending(self.manager.pool_queues)
+            ready = self._ready_count()
+
+            if ready != reported:
+                logger.info(
+                    f"Sandbox pool warm-up: {ready}/{total} containers ready.",
+                )
+                reported = ready
+            if ready >= required:
+                return True
+            if pending == 0:
+                logger.warning(
+                    f"Sandbox pool warm-up stopped with {ready}/{total} "
+                    f"containers ready, container creation failed.",
+                )
+                return False
+
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        f"Sandbox pool warm-up timed out with "
+                        f"{ready}/{total} containers ready, the rest is "
+                        f"created in the background.",
+                    )
+                    return False
+
+            with self._progress:
+                self._progress.wait(
+                    1.0 if remaining is None else min(remaining, 1.0),
+                )
+
+    def replenish(self, force: bool = False) -> None:
+        """
+        Schedule the creations needed to refill every pool. Pools above the
+        low watermark are skipped unless ``force`` is set.
+        """
+        for sandbox_type, queue in self.manager.pool_queues.items():
+            if queue.size() > self.low_watermark and not force:
+                continue
+
+            leases = self._in_flight.reserve(
+                sandbox_type,
+                queue,
+                self.pool_size,
+            )
+            for lease in leases:
+                try:
+                    self._executor.submit(self._fill_one, sandbox_type, lease)
+                except RuntimeError:
+                    # The executor was shut down by ``stop``
+                    self._done(sandbox_type, lease)
+
+    def _done(
+        self,
+        sandbox_type: SandboxType,
+        lease: Optional[str],
+        succeeded=None,
+    ) -> None:
+        try:
+            self._in_flight.release(
+                sandbox_type,
+                self.manager.pool_queues[sandbox_type],
+                lease,
+            )
+        except Exception as e:
+            logger.error(f"Error releasing container creation lease: {e}")
+        with self._progress:
+            if succeeded is not None:
+                self._failures = 0 if succeeded else self._failures + 1
+            self._progress.notify_all()
+
+    def _fill_one(
+        self,
+        sandbox_type: SandboxType,
+        lease: Optional[str],
+    ) -> None:
+        succeeded = None
+        try:
+            if self._stopped.is_set():
+                return
+            succeeded = self.manager.add_to_pool(sandbox_type)
+        except Exception as e:
+            succeeded = False
+            logger.error(f"Error adding container to pool: {e}")
+            logger.debug(f"{traceback.format_exc()}")
+        finally:
+            self._done(sandbox_type, lease, succeeded)
@@ -7,15 +7,26 @@ import json
 import logging
 import os
 import secrets
+import threading
+import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from functools import wraps
-from typing import Optional, Dict, Union, List
+from typing import Optional, Dict, Union, List, Iterator
 
 import requests
 import shortuuid
 
 from ..client import SandboxHttpClient, TrainingSandboxClient
 from ..enums import SandboxType
+from .client_cache import ClientCache
+from .idle_reaper import IdleReaper
+from .pool_replenisher import (
+    InFlightCreations,
+    PoolReplenisher,
+    RedisInFlightCreations,
+)
 from ..manager.storage import (
     LocalStorage,
     OSSStorage,
@@ -28,13 +39,36 @@ from ..registry import SandboxRegistry
 from ...common.collections import (
     RedisMapping,
     RedisQueue,
+    RedisSessionBindings,
     InMemoryMapping,
     InMemoryQueue,
+    InMemorySessionBindings,
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Container names must be valid DNS labels, hence lowercase only
+SESSION_ID_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Default number of pool containers created at once, per backend. A local
+# Docker daemon saturates quickly while cluster and cloud backends create
+# containers on remote capacity.
+POOL_CONCURRENCY_BY_BACKEND = {
+    "docker": 4,
+    "k8s": 16,
+    "agentrun": 8,
+}
+
+# The VNC server of these images keeps the password it was started with, so
+# a reset cannot lock the previous session out of the desktop. They are
+# destroyed on release instead of being recycled.
+NON_RECYCLABLE_TYPES = (
+    SandboxType.BROWSER,
+    SandboxType.FILESYSTEM,
+    SandboxType.GUI,
+)
+
 
 def remote_wrapper(
     method: str = "POST",
@@ -45,17 +79,17 @@ def remote_wrapper(
     """
 
     def decorator(func):
+        endpoint = "/" + func.__name__
+        # Resolve the parameter names once, at decoration time
+        param_names = list(inspect.signature(func).parameters)[1:]
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             if not self.http_session:
                 # Execute the original function locally
                 return func(self, *args, **kwargs)
 
-            endpoint = "/" + func.__name__
-
             # Prepare data for remote call
-            sig = inspect.signature(func)
-            param_names = list(sig.parameters.keys())[1:]  # Skip 'self'
             data = dict(zip(param_names, args))
             data.update(kwargs)
 
@@ -69,13 +103,46 @@ def remote_wrapper(
 
         wrapper._is_remote_wrapper = True
         wrapper._http_method = method
-        wrapper._path = "/" + func.__name__
+        wrapper._path = endpoint
 
         return wrapper
 
     return decorator
 
 
+def format_http_error(response, error: Exception) -> str:
+    """
+    Build a readable message from a failed manager server response.
+
+    Works with both ``requests`` and ``httpx`` responses.
+    """
+    error_components = [
+        f"HTTP {response.status_code} Error: {str(error)}",
+    ]
+
+    try:
+        server_response = response.json()
+        if "detail" in server_response:
+            error_components.append(
+                f"Server Detail: {server_response['detail']}",
+            )
+        elif "error" in server_response:
+            error_components.append(
+                f"Server Error: {server_response['error']}",
+            )
+        else:
+            error_components.append(
+                f"Server Response: {server_response}",
+            )
+    except (ValueError, json.JSONDecodeError):
+        if response.text:
+            error_components.append(
+                f"Server Response: {response.text}",
+            )
+
+    return " | ".join(error_components)
+
+
 class SandboxManager:
     def __init__(
         self,
@@ -154,21 +221,48 @@ class SandboxManager:
                 redis_client,
                 prefix="session_mapping",
             )
+            self.access_mapping = RedisMapping(
+                redis_client,
+                prefix="container_last_access",
+            )
+            self.bindings = RedisSessionBindings(
+                self.container_mapping,
+                self.session_mapping,
+                self.access_mapping,
+            )
 
             # Init multi sand box pool
             for t in self.default_type:
                 queue_key = f"{self.config.redis_container_pool_key}:{t.value}"
-                self.pool_queues[t] = RedisQueue(redis_client, queue_key)
+                self.pool_queues[t] = RedisQueue(
+                    redis_client,
+                    queue_key,
+                    maxsize=self.pool_size,
+                )
+            # Shared by the managers filling the same pools
+            self._pool_in_flight = RedisInFlightCreations(redis_client)
         else:
             self.container_mapping = InMemoryMapping()
             self.session_mapping = InMemoryMapping()
+            self.access_mapping = InMemoryMapping()
+            self.bindings = InMemorySessionBindings(
+                self.container_mapping,
+                self.session_mapping,
+                self.access_mapping,
+            )
 
             # Init multi sand box pool
             for t in self.default_type:
-                self.pool_queues[t] = InMemoryQueue()
+                self.pool_queues[t] = InMemoryQueue(maxsize=self.pool_size)
+            self._pool_in_flight = InFlightCreations()
 
         self.container_deployment = self.config.container_deployment
 
+        self._client_cache = ClientCache(
+            idle_timeout=self.config.client_idle_timeout,
+        )
+        self.recycle_on_release = self.config.recycle_on_release
+
         if base_url is None:
             if self.container_deployment == "docker":
                 from ...common.container_clients.docker_client import (
@@ -200,11 +294,64 @@ class SandboxManager:
                 self.config.oss_access_key_secret,
                 self.config.oss_endpoint,
                 self.config.oss_bucket_name,
+                max_workers=self.config.storage_sync_workers,
             )
         else:
-            self.storage = LocalStorage()
+            self.storage = LocalStorage(
+                max_workers=self.config.storage_sync_workers,
+                provisioning=self.config.workspace_provisioning,
+            )
+
+        # Workspace uploads running in the background, by storage path
+        self._uploads: Dict[str, Future] = {}
+        self._uploads_lock = threading.Lock()
+        self._upload_executor = None
+        if self.config.background_upload:
+            self._upload_executor = ThreadPoolExecutor(
+                max_workers=2,
+                thread_name_prefix="sandbox-upload",
+            )
+
+        # Idle containers are only tracked and released when a TTL is set
+        self.idle_ttl = self.config.idle_ttl
+        self.idle_ttl_by_type = {
+            SandboxType(t): ttl
+            for t, ttl in (self.config.idle_ttl_by_type or {}).items()
+        }
+        # Tool calls running in this process, per container name
+        self._calls_lock = threading.Lock()
+        self._calls_in_flight: Dict[str, int] = {}
+        self.idle_reaper = None
+        if self.idle_ttl is not None or self.idle_ttl_by_type:
+            self.idle_reaper = IdleReaper(
+                self,
+                interval=self.config.idle_reap_interval,
+            )
+            self.idle_reaper.start()
 
+        if (
+            self.config.image_prefetch != "none"
+            and self.container_deployment == "docker"
+            and self.client
+        ):
+            self.client.prefetch_images(self._images_to_prefetch())
+
+        # Bound of the containers created at once by the pool and batches
+        self.create_concurrency = (
+            self.config.pool_max_concurrency
+            or POOL_CONCURRENCY_BY_BACKEND.get(self.container_deployment, 4)
+        )
+
+        self.pool_replenisher = None
         if self.pool_size > 0:
+            self.pool_replenisher = PoolReplenisher(
+                self,
+                pool_size=self.pool_size,
+                low_watermark=self.config.pool_low_watermark,
+                max_concurrency=self.create_concurrency,
+                interval=self.config.pool_replenish_interval,
+                in_flight=self._pool_in_flight,
+            )
             self._init_container_pool()
 
         logger.debug(str(config))
@@ -220,7 +367,29 @@ class SandboxManager:
         logger.debug(
             "Exiting SandboxManager context (sync). Cleaning up resources.",
         )
-        self.cleanup()
+        self.close()
+
+    def _images_to_prefetch(self) -> List[str]:
+        """Return the sandbox images selected by ``image_prefetch``."""
+        if self.config.image_prefetch == "all":
+            configs = SandboxRegistry.list_all_sandboxes().values()
+        elif self.config.image_prefetch == "default":
+            configs = [
+                SandboxRegistry.get_config(
+                    SandboxRegistry.get_classes_by_type(t),
+                )
+                for t in self.default_type
+            ]
+        else:
+            return []
+        return [
+            config.image_name
+            for config in configs
+            if config is not None
+            # Sandboxes without a Docker image
+            and config.sandbox_type
+            not in (SandboxType.DUMMY, SandboxType.AGENTBAY)
+        ]
 
     def _generate_container_key(self, session_id):
         return f"{self.prefix}{session_id}"
@@ -238,75 +407,108 @@ class SandboxManager:
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
-            error_components = [
-                f"HTTP {response.status_code} Error: {str(e)}",
-            ]
+            error = format_http_error(response, e)
+            logger.error(f"Error making request: {error}")
+            return {"data": f"Error: {error}"}
+
+        return response.json()
 
+    def _stream_request(self, endpoint: str, data: dict) -> Iterator[dict]:
+        """
+        Make an HTTP request to an endpoint streaming JSON lines.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        with self.http_session.post(url, json=data, stream=True) as response:
             try:
-                server_response = response.json()
-                if "detail" in server_response:
-                    error_components.append(
-                        f"Server Detail: {server_response['detail']}",
-                    )
-                elif "error" in server_response:
-                    error_components.append(
-                        f"Server Error: {server_response['error']}",
-                    )
-                else:
-                    error_components.append(
-                        f"Server Response: {server_response}",
-                    )
-            except (ValueError, json.JSONDecodeError):
-                if response.text:
-                    error_components.append(
-                        f"Server Response: {response.text}",
-                    )
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                error = format_http_error(response, e)
+                logger.error(f"Error making request: {error}")
+                raise RuntimeError(error) from e
 
-            error = " | ".join(error_components)
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
 
-            logger.error(f"Error making request: {error}")
+    def _init_container_pool(self):
+        """
+        Init runtime pool. The containers are created concurrently in the
+        background; this returns once ``pool_warmup_min_ready`` of them are
+        ready, so traffic can be served while the rest warms up.
+        """
+        self.pool_replenisher.start()
+        self.pool_replenisher.wait_until_ready(
+            min_ready=self.config.pool_warmup_min_ready,
+            timeout=self.config.pool_warmup_timeout,
+        )
 
-            return {"data": f"Error: {error}"}
+    def add_to_pool(self, sandbox_type) -> bool:
+        """
+        Create a container and put it into the pool of its type. Returns
+        whether the pool received a new container.
+        """
+        sandbox_type = SandboxType(sandbox_type)
+        queue = self.pool_queues[sandbox_type]
 
-        return response.json()
+        container_name = self.create(sandbox_type=sandbox_type.value)
+        container_model = (
+            self.container_mapping.get(container_name)
+            if container_name
+            else None
+        )
+        if not container_model:
+            logger.error("Failed to create container for pool")
+            return False
 
-    def _init_container_pool(self):
+        # Pooled containers are not subject to the idle TTL until they are
+        # handed out
+        self.access_mapping.delete(container_name)
+
+        # The queue is bounded by the pool size, which avoids race condition
+        if queue.enqueue(container_model):
+            return True
+
+        # The pool size has reached the limit
+        self.release(container_name)
+        return False
+
+    def close(self):
         """
-        Init runtime pool
+        Release every container and stop the background tasks, for good.
+
+        Unlike ``cleanup``, it is not exposed by the manager server, which
+        calls it on shutdown. A remote manager only runs ``cleanup``.
         """
-        for t in self.default_type:
-            queue = self.pool_queues[t]
-            while queue.size() < self.pool_size:
-                try:
-                    container_name = self.create(sandbox_type=t.value)
-                    container_model = self.container_mapping.get(
-                        container_name,
-                    )
-                    if container_model:
-                        # Check the pool size again to avoid race condition
-                        if queue.size() < self.pool_size:
-                            queue.enqueue(container_model)
-                        else:
-                            # The pool size has reached the limit
-                            self.release(container_name)
-                            break
-                    else:
-                        logger.error("Failed to create container for pool")
-                        break
-                except Exception as e:
-                    logger.error(f"Error initializing runtime pool: {e}")
-                    break
+        if self.http_session:
+            self.cleanup()
+            return
+
+        # Destroy released containers instead of recycling them
+        self.recycle_on_release = False
+        # Stop the background tasks before releasing everything
+        if self.idle_reaper is not None:
+            self.idle_reaper.stop()
+        if self.pool_replenisher is not None:
+            self.pool_replenisher.stop()
+        self.cleanup()
+
+        if self._upload_executor is not None:
+            self._upload_executor.shutdown(wait=True)
+        if self.client is not None:
+            self.client.close()
 
     @remote_wrapper()
     def cleanup(self):
+        """Destroy the pooled containers and the containers in use."""
         logger.debug(
             "Cleaning up resources.",
         )
 
-        # Clean up pool first
+        # Clean up pool first. The replenisher keeps refilling it, unless
+        # closing, so only the containers pooled now are destroyed.
         for queue in self.pool_queues.values():
             try:
-                while queue.size() > 0:
+                for _ in range(queue.size()):
                     container_json = queue.dequeue()
                     if container_json:
                         container_model = ContainerModel(**container_json)
@@ -314,25 +516,43 @@ class SandboxManager:
                             f"Destroy container"
                             f" {container_model.container_id}",
                         )
-                        self.release(container_model.session_id)
+                        self._release(
+                            container_model.session_id,
+                            recycle=False,
+                        )
             except Exception as e:
                 logger.error(f"Error cleaning up runtime pool: {e}")
 
         # Clean up rest container
-        for key in self.container_mapping.scan(self.prefix):
+        for key, container_json in list(
+            self.container_mapping.scan_items(self.prefix),
+        ):
             try:
-                container_json = self.container_mapping.get(key)
                 if container_json:
                     container_model = ContainerModel(**container_json)
                     logger.debug(
                         f"Destroy container {container_model.container_id}",
                     )
-                    self.release(container_model.session_id)
+                    self._release(
+                        container_model.session_id,
+                        recycle=False,
+                    )
             except Exception as e:
                 logger.error(
                     f"Error cleaning up container {key}: {e}",
                 )
 
+        self._client_cache.clear()
+
+        # Let the background uploads complete
+        with self._uploads_lock:
+            uploads = list(self._uploads.values())
+        for future in uploads:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Background upload failed: {e}")
+
     @remote_wrapper()
     def create_from_pool(self, sandbox_type=None, meta: Optional[Dict] = None):
         """Try to get a container from runtime pool"""
@@ -344,62 +564,35 @@ class SandboxManager:
 
         queue = self.pool_queues[sandbox_type]
 
-        cnt = 0
+        # Wait for a container being created in the background rather than
+        # creating one more
+        timeout = None
+        if self.pool_replenisher is not None:
+            timeout = self.config.pool_wait_timeout
+            if timeout and queue.is_empty():
+                self.pool_replenisher.notify()
+
         try:
             while True:
-                if cnt > self.pool_size:
-                    raise RuntimeError(
-                        "No container available in pool after check the pool.",
-                    )
-                cnt += 1
-
-                # Add a new one to container
-                container_name = self.create(sandbox_type=sandbox_type)
-                new_container_model = self.container_mapping.get(
-                    container_name,
+                # Bound at once, so that no other manager can take it
+                container_json = self.bindings.bind_from_pool(
+                    queue,
+                    meta=meta,
+                    accessed_at=self._access_time(),
+                    timeout=timeout,
                 )
-
-                if new_container_model:
-                    queue.enqueue(
-                        new_container_model,
-                    )
-
-                container_json = queue.dequeue()
+                if self.pool_replenisher is not None:
+                    self.pool_replenisher.notify()
 
                 if not container_json:
-                    raise RuntimeError(
-                        "No container available in pool.",
+                    logger.debug(
+                        f"Pool of {sandbox_type.value} is empty, "
+                        f"create a new container.",
                     )
+                    break
 
                 container_model = ContainerModel(**container_json)
 
-                # Add meta field to container
-                if meta and not container_model.meta:
-                    container_model.meta = meta
-                    self.container_mapping.set(
-                        container_model.container_name,
-                        container_model.model_dump(),
-                    )
-                    # Update session mapping
-                    if "session_ctx_id" in meta:
-                        env_ids = (
-                            self.session_mapping.get(
-                                meta["session_ctx_id"],
-                            )
-                            or []
-                        )
-                        if container_model.container_name not in env_ids:
-                            env_ids.append(container_model.container_name)
-                        self.session_mapping.set(
-                            meta["session_ctx_id"],
-                            env_ids,
-                        )
-
-                logger.debug(
-                    f"Retrieved container from pool:"
-                    f" {container_model.session_id}",
-                )
-
                 if (
                     container_model.version
                     != SandboxRegistry.get_image_by_type(
@@ -413,32 +606,31 @@ class SandboxManager:
                     self.release(container_model.session_id)
                     continue
 
-                if self.client.inspect(container_model.container_id) is None:
-                    logger.warning(
-                        f"Container {container_model.container_id} not found "
-                        f"or unexpected error happens.",
-                    )
-                    continue
-
                 if (
                     self.client.get_status(container_model.container_id)
-                    == "running"
+                    != "running"
                 ):
-                    return container_model.container_name
-                else:
                     logger.error(
                         f"Container {container_model.container_id} is not "
                         f"running. Trying next one in pool.",
                     )
                     # Destroy the stopped container
                     self.release(container_model.session_id)
+                    continue
+
+                logger.debug(
+                    f"Retrieved container from pool:"
+                    f" {container_model.session_id}",
+                )
+                return container_model.container_name
 
         except Exception as e:
             logger.warning(
                 "Error getting container from pool, create a new one.",
             )
             logger.debug(f"{e}: {traceback.format_exc()}")
-            return self.create()
+
+        return self.create(sandbox_type=sandbox_type.value, meta=meta)
 
     @remote_wrapper()
     def create(
@@ -477,8 +669,7 @@ class SandboxManager:
                 )
                 return None
 
-        alphabet = "0123456789abcdefghijklmnopqrstuvwxyz"
-        short_uuid = shortuuid.ShortUUID(alphabet=alphabet).uuid()
+        short_uuid = shortuuid.ShortUUID(alphabet=SESSION_ID_ALPHABET).uuid()
         session_id = str(short_uuid)
 
         if not mount_dir:
@@ -502,6 +693,7 @@ class SandboxManager:
             and storage_path
             and self.container_deployment != "agentrun"
         ):
+            self._wait_for_upload(storage_path)
             self.storage.download_folder(storage_path, mount_dir)
 
         # Check for an existing container with the same name
@@ -552,15 +744,17 @@ class SandboxManager:
                 http_protocol = "https"
 
             if _id is None:
+                self.storage.release_folder(mount_dir)
                 return None
 
-            # Check the container status
-            status = self.client.get_status(container_name)
-            if self.client.get_status(container_name) != "running":
+            # Check the container status, not yet known from its events
+            status = self.client.inspect_status(container_name)
+            if status != "running":
                 logger.warning(
                     f"Container {container_name} is not running. Current "
                     f"status: {status}",
                 )
+                self.storage.release_folder(mount_dir)
                 return None
 
             # TODO: update ContainerModel according to images & backend
@@ -578,23 +772,13 @@ class SandboxManager:
                 timeout=config.timeout,
             )
 
-            # Register in mapping
-            self.container_mapping.set(
-                container_model.container_name,
+            # Register in mapping, bound to its session_ctx_id
+            self.bindings.bind(
                 container_model.model_dump(),
+                session_ctx_id=(meta or {}).get("session_ctx_id"),
+                accessed_at=self._access_time(),
             )
 
-            # Build mapping session_ctx_id to container_name
-            if meta and "session_ctx_id" in meta:
-                env_ids = (
-                    self.session_mapping.get(
-                        meta["session_ctx_id"],
-                    )
-                    or []
-                )
-                env_ids.append(container_model.container_name)
-                self.session_mapping.set(meta["session_ctx_id"], env_ids)
-
             logger.debug(
                 f"Created container {container_name}"
                 f":{container_model.model_dump()}",
@@ -606,12 +790,133 @@ class SandboxManager:
             )
             logger.debug(f"{traceback.format_exc()}")
             self.release(identity=container_name)
+            if mount_dir:
+                self.storage.release_folder(mount_dir)
             return None
 
+    def iter_create_batch(
+        self,
+        sandbox_type=None,
+        count: int = 1,
+        meta: Optional[Dict] = None,
+    ) -> Iterator[dict]:
+        """
+        Create ``count`` sandboxes concurrently, taking them from the pool
+        when possible. Yields ``{"index": ..., "container_name": ...}`` as
+        soon as each sandbox is ready, in completion order; the name is
+        None when the creation failed.
+
+        Closing the iterator early cancels the creations not started yet
+        and releases the sandboxes that were not yielded.
+        """
+        data = {"sandbox_type": sandbox_type, "count": count, "meta": meta}
+        if self.http_session:
+            yield from self._stream_request("/create_batch_stream", data)
+            return
+
+        if count <= 0:
+            return
+        if count > self.config.max_batch_size:
+            raise ValueError(
+                f"Cannot create {count} sandboxes at once, the maximum is "
+                f"{self.config.max_batch_size}.",
+            )
+
+        # Not a ``with`` block, which would wait for every creation when the
+        # iterator is closed early
+        executor = ThreadPoolExecutor(
+            max_workers=min(count, self.create_concurrency),
+            thread_name_prefix="sandbox-batch",
+        )
+        futures = {
+            executor.submit(
+                self.create_from_pool,
+                sandbox_type=sandbox_type,
+                meta=meta,
+            ): index
+            for index in range(count)
+        }
+        pending = set(futures)
+        try:
+            for future in as_completed(futures):
+                pending.discard(future)
+                try:
+                    container_name = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to create container: {e}")
+                    container_name = None
+                yield {
+                    "index": futures[future],
+                    "container_name": container_name,
+                }
+        except GeneratorExit:
+            for future in pending:
+                if not future.cancel():
+                    # Release it once created, from the worker thread
+                    future.add_done_callback(self._release_created)
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release_created(self, future: Future) -> None:
+        """Release the sandbox created by an abandoned batch creation."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        container_name = future.result()
+        if not container_name:
+            return
+        try:
+            self.release(container_name)
+        except Exception as e:
+            logger.warning(
+                f"Failed to release abandoned container "
+                f"{container_name}: {e}",
+            )
+
+    @remote_wrapper()
+    def create_batch(
+        self,
+        sandbox_type=None,
+        count: int = 1,
+        meta: Optional[Dict] = None,
+    ) -> list:
+        """
+        Create ``count`` sandboxes concurrently. Returns their container
+        names in order, None for the failed ones.
+        """
+        container_names = [None] * max(count, 0)
+        for item in self.iter_create_batch(
+            sandbox_type=sandbox_type,
+            count=count,
+            meta=meta,
+        ):
+            container_names[item["index"]] = item["container_name"]
+        return container_names
+
+    @remote_wrapper()
+    def release_batch(self, identities: list) -> dict:
+        """
+        Release several sandboxes concurrently. Returns whether each one was
+        released, by identity.
+        """
+        if not identities:
+            return {}
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(identities), self.create_concurrency),
+            thread_name_prefix="sandbox-batch",
+        ) as executor:
+            results = executor.map(self.release, identities)
+            return dict(zip(identities, results))
+
     @remote_wrapper()
     def release(self, identity):
+        return self._release(identity)
+
+    def _release(self, identity, recycle=True):
+        """Release a container, recycling it into its pool if possible."""
         try:
-            container_json = self.get_info(identity)
+            container_json = self._get_info(identity)
 
             if not container_json:
                 logger.warning(
@@ -622,21 +927,20 @@ class SandboxManager:
             container_info = ContainerModel(**container_json)
 
             # remove key in mapping before we remove container
-            self.container_mapping.delete(container_json.get("container_name"))
-
-            # remove key in mapping
-            session_ctx_id = container_info.meta.get("session_ctx_id")
-            if session_ctx_id:
-                env_ids = self.session_mapping.get(session_ctx_id) or []
-                env_ids = [
-                    eid
-                    for eid in env_ids
-                    if eid != container_info.container_name
-                ]
-                if env_ids:
-                    self.session_mapping.set(session_ctx_id, env_ids)
-                else:
-                    self.session_mapping.delete(session_ctx_id)
+            unbound = self.bindings.unbind(
+                container_info.container_name,
+                session_ctx_id=(container_info.meta or {}).get(
+                    "session_ctx_id",
+                ),
+            )
+            self._client_cache.evict(container_info.container_name)
+            if not unbound:
+                logger.debug(f"Container for {identity} already released.")
+                return True
+
+            if recycle and self._recycle(container_info):
+                logger.debug(f"Container for {identity} recycled.")
+                return True
 
             self.client.stop(container_info.container_id, timeout=1)
             self.client.remove(container_info.container_id, force=True)
@@ -645,7 +949,7 @@ class SandboxManager:
 
             # Upload to storage
             if container_info.mount_dir and container_info.storage_path:
-                self.storage.upload_folder(
+                self._upload_workspace(
                     container_info.mount_dir,
                     container_info.storage_path,
                 )
@@ -658,10 +962,146 @@ class SandboxManager:
             logger.debug(f"{traceback.format_exc()}")
             return False
 
+    def _upload_workspace(self, mount_dir, storage_path):
+        """
+        Upload a workspace to the storage, in the background when
+        ``background_upload`` is enabled.
+        """
+        if self._upload_executor is None:
+            self.storage.upload_folder(mount_dir, storage_path)
+            self.storage.release_folder(mount_dir)
+            return
+
+        def upload():
+            try:
+                self.storage.upload_folder(mount_dir, storage_path)
+                self.storage.release_folder(mount_dir)
+            except Exception as e:
+                logger.error(f"Failed to upload {mount_dir}: {e}")
+                logger.debug(f"{traceback.format_exc()}")
+            finally:
+                with self._uploads_lock:
+                    if self._uploads.get(storage_path) is future:
+                        del self._uploads[storage_path]
+
+        with self._uploads_lock:
+            # Uploads of the same path run one after the other
+            previous = self._uploads.get(storage_path)
+            if previous is not None:
+                future = self._upload_executor.submit(
+                    lambda: (previous.result(), upload()),
+                )
+            else:
+                future = self._upload_executor.submit(upload)
+            self._uploads[storage_path] = future
+
+    def _overlay_workspaces(self) -> bool:
+        """Whether workspaces are provisioned as overlay mounts."""
+        return (
+            isinstance(self.storage, LocalStorage)
+            and self.storage.provisioning == "overlay"
+        )
+
+    def _wait_for_upload(self, storage_path):
+        """Wait for a background upload to a storage path, if any."""
+        with self._uploads_lock:
+            future = self._uploads.get(storage_path)
+        if future is not None:
+            logger.debug(f"Waiting for the upload to {storage_path}.")
+            future.result()
+
+    def _recycle(self, container_info: ContainerModel) -> bool:
+        """
+        Reset a released container and put it back into its pool. Returns
+        False when the container has to be destroyed instead: recycling is
+        disabled, the container reached ``max_recycles``, it runs a VNC
+        server (see ``NON_RECYCLABLE_TYPES``), its workspace is an overlay,
+        its pool is full, or the reset failed.
+        """
+        if (
+            not self.recycle_on_release
+            or container_info.recycle_count >= self.config.max_recycles
+        ):
+            return False
+        if container_info.mount_dir and self._overlay_workspaces():
+            # The overlay has to be unmounted to save the workspace
+            return False
+
+        sandbox_type = next(
+            (
+                t
+                for t in self.pool_queues
+                if SandboxRegistry.get_image_by_type(t)
+                == container_info.version
+            ),
+            None,
+        )
+        if sandbox_type is None or sandbox_type in NON_RECYCLABLE_TYPES:
+            return False
+        queue = self.pool_queues[sandbox_type]
+        if queue.size() >= self.pool_size:
+            return False
+
+        try:
+            client = self._connect(container_info)
+            if not isinstance(client, SandboxHttpClient):
+                # Training sandboxes have no reset endpoint
+                client.close()
+                return False
+
+            # Persist the workspace of the finished session before wiping it
+            if container_info.mount_dir and container_info.storage_path:
+                self.storage.upload_folder(
+                    container_info.mount_dir,
+                    container_info.storage_path,
+                )
+
+            # A new token locks the previous session out of the container
+            runtime_token = secrets.token_hex(16)
+            try:
+                result = client.reset(secret_token=runtime_token)
+            finally:
+                client.close()
+            if result.get("isError"):
+                return False
+        except Exception as e:
+            logger.warning(
+                f"Failed to recycle container "
+                f"{container_info.container_name}: {e}",
+            )
+            logger.debug(f"{traceback.format_exc()}")
+            return False
+
+        # Give the next session its own storage path
+        storage_path = None
+        if container_info.storage_path and self.storage_folder:
+            storage_path = self.storage.path_join(
+                self.storage_folder,
+                shortuuid.ShortUUID(alphabet=SESSION_ID_ALPHABET).uuid(),
+            )
+
+        recycled = container_info.model_copy(
+            update={
+                "meta": {},
+                "runtime_token": runtime_token,
+                "storage_path": storage_path,
+                "recycle_count": container_info.recycle_count + 1,
+            },
+        )
+        self.container_mapping.set(
+            recycled.container_name,
+            recycled.model_dump(),
+        )
+        if not queue.enqueue(recycled.model_dump()):
+            # Filled up meanwhile
+            self.container_mapping.delete(recycled.container_name)
+            return False
+        return True
+
     @remote_wrapper()
     def start(self, identity):
         try:
-            container_json = self.get_info(identity)
+            container_json = self._get_info(identity)
 
             if not container_json:
                 logger.warning(
@@ -693,7 +1133,7 @@ class SandboxManager:
     @remote_wrapper()
     def stop(self, identity):
         try:
-            container_json = self.get_info(identity)
+            container_json = self._get_info(identity)
 
             if not container_json:
                 logger.warning(f"No container found for {identity}.")
@@ -728,6 +1168,13 @@ class SandboxManager:
     @remote_wrapper()
     def get_info(self, identity):
         """Get container information by container_name or container_id."""
+        container_model = self._get_info(identity)
+        if isinstance(container_model, dict):
+            self._touch(container_model.get("container_name"))
+        return container_model
+
+    def _get_info(self, identity):
+        """Look a container up, without counting it as an access."""
         container_model = self.container_mapping.get(identity)
         if container_model is None:
             container_model = self.container_mapping.get(
@@ -740,9 +1187,90 @@ class SandboxManager:
 
         return container_model
 
+    def _touch(self, container_name: Optional[str]) -> None:
+        """Record the last access time of a container."""
+        if self.idle_reaper is not None and container_name:
+            self.access_mapping.set(container_name, time.time())
+
+    def _access_time(self) -> Optional[float]:
+        """Last access time to record for a container, if tracked."""
+        return time.time() if self.idle_reaper is not None else None
+
+    def _get_idle_ttl(self, container_model: ContainerModel):
+        for sandbox_type, ttl in self.idle_ttl_by_type.items():
+            if container_model.version == SandboxRegistry.get_image_by_type(
+                sandbox_type,
+            ):
+                return ttl
+        return self.idle_ttl
+
+    def reap_idle_containers(self) -> List[str]:
+        """
+        Release the containers that were not accessed for longer than the
+        TTL of their sandbox type. Returns the released container names.
+        """
+        now = time.time()
+        reaped = []
+        for container_name, last_access in list(
+            self.access_mapping.scan_items(),
+        ):
+            container_json = self.container_mapping.get(container_name)
+            if not container_json:
+                # Released in the meantime
+                self.access_mapping.delete(container_name)
+                continue
+
+            ttl = self._get_idle_ttl(ContainerModel(**container_json))
+            if ttl is None or now - last_access < ttl:
+                continue
+            with self._calls_lock:
+                if self._calls_in_flight.get(container_name):
+                    continue
+
+            logger.info(
+                f"Container {container_name} idle for "
+                f"{now - last_access:.0f}s, releasing it.",
+            )
+            if self.release(container_name):
+                reaped.append(container_name)
+        return reaped
+
     def _establish_connection(self, identity):
-        container_model = ContainerModel(**self.get_info(identity))
+        container_model = ContainerModel(**self._get_info(identity))
+        return self._client_cache.get(
+            container_model.container_name,
+            lambda: self._connect(container_model),
+        )
 
+    @contextmanager
+    def _serving(self, identity):
+        """
+        Connect to a container for a client call. The call counts as an
+        access, and the idle reaper leaves the container alone until it
+        returns.
+        """
+        container_model = ContainerModel(**self._get_info(identity))
+        container_name = container_model.container_name
+        with self._calls_lock:
+            self._calls_in_flight[container_name] = (
+                self._calls_in_flight.get(container_name, 0) + 1
+            )
+        self._touch(container_name)
+        try:
+            yield self._client_cache.get(
+                container_name,
+                lambda: self._connect(container_model),
+            )
+        finally:
+            with self._calls_lock:
+                self._calls_in_flight[container_name] -= 1
+                if not self._calls_in_flight[container_name]:
+                    del self._calls_in_flight[container_name]
+            # Idle from the end of the call on
+            self._touch(container_name)
+
+    @staticmethod
+    def _connect(container_model: ContainerModel):
         # TODO: remake docker name
         if (
             "sandbox-appworld" in container_model.version
@@ -765,25 +1293,25 @@ class SandboxManager:
     @remote_wrapper()
     def list_tools(self, identity, tool_type=None, **kwargs):
         """List tool"""
-        client = self._establish_connection(identity)
-        return client.list_tools(tool_type=tool_type, **kwargs)
+        with self._serving(identity) as client:
+            return client.list_tools(tool_type=tool_type, **kwargs)
 
     @remote_wrapper()
     def call_tool(self, identity, tool_name=None, arguments=None):
         """Call tool"""
-        client = self._establish_connection(identity)
-        return client.call_tool(tool_name, arguments)
+        with self._serving(identity) as client:
+            return client.call_tool(tool_name, arguments)
 
     @remote_wrapper()
     def add_mcp_servers(self, identity, server_configs, overwrite=False):
         """
         Add MCP servers to runtime.
         """
-        client = self._establish_connection(identity)
-        return client.add_mcp_servers(
-            server_configs=server_configs,
-            overwrite=overwrite,
-        )
+        with self._serving(identity) as client:
+            return client.add_mcp_servers(
+                server_configs=server_configs,
+                overwrite=overwrite,
+            )
 
     @remote_wrapper()
     def get_session_mapping(self, session_ctx_id: str) -> list:
@@ -2,8 +2,10 @@
 # pylint: disable=protected-access, unused-argument
 import asyncio
 import inspect
+import json
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import httpx
@@ -12,7 +14,7 @@ import websockets
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from ...manager.server.config import get_settings
@@ -66,8 +68,26 @@ def get_config() -> SandboxManagerEnvConfig:
             default_mount_dir=settings.DEFAULT_MOUNT_DIR,
             readonly_mounts=settings.READONLY_MOUNTS,
             storage_folder=settings.STORAGE_FOLDER,
+            storage_sync_workers=settings.STORAGE_SYNC_WORKERS,
+            background_upload=settings.BACKGROUND_UPLOAD,
+            workspace_provisioning=settings.WORKSPACE_PROVISIONING,
             port_range=settings.PORT_RANGE,
+            port_reconcile_interval=settings.PORT_RECONCILE_INTERVAL,
+            client_idle_timeout=settings.CLIENT_IDLE_TIMEOUT,
+            recycle_on_release=settings.RECYCLE_ON_RELEASE,
+            max_recycles=settings.MAX_RECYCLES,
+            idle_ttl=settings.IDLE_TTL,
+            idle_ttl_by_type=settings.IDLE_TTL_BY_TYPE,
+            idle_reap_interval=settings.IDLE_REAP_INTERVAL,
             pool_size=settings.POOL_SIZE,
+            image_prefetch=settings.IMAGE_PREFETCH,
+            pool_low_watermark=settings.POOL_LOW_WATERMARK,
+            pool_max_concurrency=settings.POOL_MAX_CONCURRENCY,
+            max_batch_size=settings.MAX_BATCH_SIZE,
+            pool_replenish_interval=settings.POOL_REPLENISH_INTERVAL,
+            pool_wait_timeout=settings.POOL_WAIT_TIMEOUT,
+            pool_warmup_min_ready=settings.POOL_WARMUP_MIN_READY,
+            pool_warmup_timeout=settings.POOL_WARMUP_TIMEOUT,
             oss_endpoint=settings.OSS_ENDPOINT,
             oss_access_key_id=settings.OSS_ACCESS_KEY_ID,
             oss_access_key_secret=settings.OSS_ACCESS_KEY_SECRET,
@@ -203,10 +223,63 @@ async def shutdown_event():
     global _sandbox_manager
     settings = get_settings()
     if _sandbox_manager and settings.AUTO_CLEANUP:
-        _sandbox_manager.cleanup()
+        _sandbox_manager.close()
         _sandbox_manager = None
 
 
+@app.post("/create_batch_stream")
+async def create_batch_stream(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Depends(verify_token),
+):
+    """
+    Create sandboxes concurrently and stream one JSON line per sandbox as
+    soon as it is ready.
+    """
+    data = await request.json()
+    logger.info(f"Calling create_batch_stream with data: {data}")
+    max_batch_size = _sandbox_manager.config.max_batch_size
+    if data.get("count", 1) > max_batch_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"count must not exceed {max_batch_size}",
+        )
+    iterator = _sandbox_manager.iter_create_batch(**data)
+
+    # The iterator is advanced and closed from a single thread, so that it is
+    # never closed on the event loop nor while a step is still running
+    executor = ThreadPoolExecutor(
+        max_workers=1,
+        thread_name_prefix="sandbox-batch-stream",
+    )
+
+    async def stream():
+        step = None
+        try:
+            while True:
+                step = executor.submit(next, iterator, None)
+                item = await asyncio.wrap_future(step)
+                if item is None:
+                    break
+                step = None
+                yield json.dumps(item) + "\n"
+        finally:
+            # Runs after the step in progress, if the client went away
+            executor.submit(_close_batch_stream, iterator, step)
+            executor.shutdown(wait=False)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _close_batch_stream(iterator, step):
+    """Close a batch stream, releasing the sandbox of an undelivered step."""
+    if step is not None and not step.cancelled() and not step.exception():
+        item = step.result()
+        if item and item["container_name"]:
+            _sandbox_manager.release(item["container_name"])
+    iterator.close()
+
+
 @app.get(
     "/health",
     response_model=HealthResponse,
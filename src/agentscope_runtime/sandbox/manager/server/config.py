@@ -21,6 +21,14 @@ class Settings(BaseSettings):
     # Runtime Manager settings
     DEFAULT_SANDBOX_TYPE: Union[str, List[str]] = "base"
     POOL_SIZE: int = 1
+    POOL_LOW_WATERMARK: Optional[int] = None
+    POOL_MAX_CONCURRENCY: Optional[int] = None
+    MAX_BATCH_SIZE: int = 64
+    POOL_WARMUP_MIN_READY: float = 1.0
+    POOL_WARMUP_TIMEOUT: Optional[float] = None
+    POOL_REPLENISH_INTERVAL: float = 5.0
+    POOL_WAIT_TIMEOUT: float = 0.0
+    IMAGE_PREFETCH: Literal["none", "default", "all"] = "default"
     AUTO_CLEANUP: bool = True
     CONTAINER_PREFIX_KEY: str = "runtime_sandbox_container_"
     CONTAINER_DEPLOYMENT: Literal[
@@ -36,7 +44,18 @@ class Settings(BaseSettings):
     # "\/etc\/timezone"}
     READONLY_MOUNTS: Optional[Dict[str, str]] = None
     STORAGE_FOLDER: str = "runtime_sandbox_storage"
+    STORAGE_SYNC_WORKERS: int = 8
+    BACKGROUND_UPLOAD: bool = False
+    WORKSPACE_PROVISIONING: Literal["copy", "clone", "overlay"] = "copy"
     PORT_RANGE: Tuple[int, int] = (49152, 59152)
+    PORT_RECONCILE_INTERVAL: float = 300.0
+    CLIENT_IDLE_TIMEOUT: float = 300.0
+    RECYCLE_ON_RELEASE: bool = False
+    MAX_RECYCLES: int = 10
+    # Idle container TTLs in seconds, e.g. IDLE_TTL_BY_TYPE={"browser": 600}
+    IDLE_TTL: Optional[float] = None
+    IDLE_TTL_BY_TYPE: Optional[Dict[str, float]] = None
+    IDLE_REAP_INTERVAL: float = 60.0
 
     # Redis settings
     REDIS_ENABLED: bool = False
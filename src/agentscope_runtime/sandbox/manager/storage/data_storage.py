@@ -11,6 +11,9 @@ class DataStorage(abc.ABC):
     def upload_folder(self, source_path, destination_path):
         """Upload a local folder to storage."""
 
+    def release_folder(self, path):
+        """Release the resources of a folder provisioned by download."""
+
     @abc.abstractmethod
     def path_join(self, *args):
         """Joins multiple path components into a single path string."""
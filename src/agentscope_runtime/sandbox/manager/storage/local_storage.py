@@ -1,12 +1,91 @@
 # -*- coding: utf-8 -*-
+import errno
+import logging
 import os
 import shutil
+import stat as statmod
+import subprocess
 
 from .data_storage import DataStorage
+from .manifest import FileEntry, is_up_to_date, run_concurrently
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ioctl cloning a whole file on Btrfs, XFS, bcachefs, ... (linux/fs.h)
+FICLONE = 0x40049409
+
+# Errors meaning the file system cannot clone between these paths
+_CLONE_UNSUPPORTED = {
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+}
+
+# Suffix of the directory holding the writable layer of an overlay
+OVERLAY_SUFFIX = ".overlay"
+
+# Whiteouts and opaque directories of overlayfs and fuse-overlayfs
+WHITEOUT_PREFIX = ".wh."
+OPAQUE_MARKER = ".wh..wh..opq"
+OPAQUE_XATTRS = (
+    "trusted.overlay.opaque",
+    "user.overlay.opaque",
+    "user.fuseoverlayfs.opaque",
+)
 
 
 class LocalStorage(DataStorage):
+    """
+    Workspace storage in a local directory.
+
+    ``provisioning`` selects how a workspace is provisioned from its
+    storage folder:
+
+    - ``copy``: files are copied.
+    - ``clone``: files are cloned with reflinks, which share their data
+      blocks until written, on file systems supporting it (Btrfs, XFS,
+      ...); they are copied elsewhere.
+    - ``overlay``: the workspace is an overlay mount, with the storage
+      folder as its read-only lower layer, so provisioning takes the same
+      time whatever the workspace size. It requires root or
+      ``fuse-overlayfs``, and falls back to ``clone``. Uploading the
+      workspace back to its storage folder unmounts it first, then applies
+      its writable layer (deletions included) to the storage folder.
+    """
+
+    def __init__(self, max_workers: int = 8, provisioning: str = "copy"):
+        self.max_workers = max_workers
+        self.provisioning = provisioning
+        # (source device, destination device) pairs that cannot clone
+        self._clone_unsupported = set()
+
     def download_folder(self, source_path, destination_path):
+        """Provision destination_path from the folder source_path."""
+        abs_source_path = os.path.abspath(source_path)
+        abs_destination_path = os.path.abspath(destination_path)
+
+        if abs_source_path == abs_destination_path:
+            return
+
+        if not os.path.exists(source_path):
+            return
+
+        if self.provisioning == "overlay" and self._mount_overlay(
+            abs_source_path,
+            abs_destination_path,
+        ):
+            return
+
+        self._copy_folder(source_path, destination_path)
+
+    def upload_folder(self, source_path, destination_path):
         """Copy a folder from source_path to destination_path."""
         abs_source_path = os.path.abspath(source_path)
         abs_destination_path = os.path.abspath(destination_path)
@@ -17,10 +96,40 @@ class LocalStorage(DataStorage):
         if not os.path.exists(source_path):
             return
 
+        if _overlay_lower(abs_source_path) == abs_destination_path:
+            # The storage folder is the lower layer of the workspace, which
+            # must not change while the overlay is mounted
+            self._merge_overlay(abs_source_path, abs_destination_path)
+            return
+
+        self._copy_folder(source_path, destination_path)
+
+    def release_folder(self, path):
+        """Unmount the overlay of a workspace and drop its writable layer."""
+        layers = os.path.abspath(path) + OVERLAY_SUFFIX
+        if not os.path.isdir(layers):
+            return
+
+        if not _unmount(path):
+            logger.warning(f"Failed to unmount the overlay of {path}.")
+            return
+        shutil.rmtree(layers, ignore_errors=True)
+
+    def path_join(self, *args):
+        """Join path components."""
+        return os.path.join(*args)
+
+    def _copy_folder(self, source_path, destination_path):
+        """
+        Copy a folder. Files already at the destination with the same size
+        and modification time are skipped, the others are copied (or
+        cloned) concurrently.
+        """
         # Ensure the destination path exists
         os.makedirs(destination_path, exist_ok=True)
 
-        # Copy the directory structure and files
+        # Copy the directory structure, and list the files to copy
+        copies = []
         for root, _, files in os.walk(source_path):
             relative_path = os.path.relpath(root, source_path)
             dest_dir = os.path.join(destination_path, relative_path)
@@ -28,17 +137,205 @@ class LocalStorage(DataStorage):
             # Ensure the destination directory exists
             os.makedirs(dest_dir, exist_ok=True)
 
-            # Copy files
             for file in files:
                 src_file = os.path.join(root, file)
                 dest_file = os.path.join(dest_dir, file)
-                shutil.copy2(src_file, dest_file)
+                # Copies keep the modification time, so a file copied
+                # before is identified by its size and modification time
+                stat = os.stat(src_file)
+                if not is_up_to_date(
+                    dest_file,
+                    FileEntry(stat.st_size, stat.st_mtime),
+                ):
+                    copies.append((src_file, dest_file))
 
-    def upload_folder(self, source_path, destination_path):
-        """Copy a folder from source_path to destination_path."""
-        # This is essentially a symmetric operation of download_folder
-        self.download_folder(source_path, destination_path)
+        if self.provisioning == "copy":
+            copy = shutil.copy2
+        else:
+            copy = self._clone_file
+        run_concurrently(lambda pair: copy(*pair), copies, self.max_workers)
 
-    def path_join(self, *args):
-        """Join path components."""
-        return os.path.join(*args)
+    def _merge_overlay(self, path, lower):
+        """
+        Unmount the overlay workspace ``path`` and apply its writable layer
+        to its lower layer ``lower``.
+        """
+        if not _unmount(path):
+            raise RuntimeError(
+                f"Failed to unmount the overlay of {path}, not uploading it.",
+            )
+
+        layers = path + OVERLAY_SUFFIX
+        upper = os.path.join(layers, "upper")
+        copies = []
+        for root, dirs, files in os.walk(upper):
+            relative_path = os.path.relpath(root, upper)
+            dest_dir = os.path.normpath(os.path.join(lower, relative_path))
+            if relative_path != "." and _is_opaque(root):
+                # The directory replaced the lower one
+                _remove(dest_dir)
+            if not os.path.isdir(dest_dir):
+                _remove(dest_dir)
+                os.makedirs(dest_dir)
+
+            links = [d for d in dirs if os.path.islink(os.path.join(root, d))]
+            for name in files + links:
+                src_file = os.path.join(root, name)
+                if name == OPAQUE_MARKER:
+                    continue
+                if name.startswith(WHITEOUT_PREFIX):
+                    _remove(
+                        os.path.join(dest_dir, name[len(WHITEOUT_PREFIX) :]),
+                    )
+                    continue
+                dest_file = os.path.join(dest_dir, name)
+                if _is_whiteout(src_file):
+                    _remove(dest_file)
+                elif os.path.islink(src_file):
+                    _remove(dest_file)
+                    os.symlink(os.readlink(src_file), dest_file)
+                else:
+                    if os.path.isdir(dest_file):
+                        _remove(dest_file)
+                    copies.append((src_file, dest_file))
+
+        if self.provisioning == "copy":
+            copy = shutil.copy2
+        else:
+            copy = self._clone_file
+        run_concurrently(lambda pair: copy(*pair), copies, self.max_workers)
+        shutil.rmtree(layers, ignore_errors=True)
+
+    def _clone_file(self, source, destination):
+        """Clone a file with a reflink, or copy it if not supported."""
+        devices = (
+            os.stat(source).st_dev,
+            os.stat(os.path.dirname(destination)).st_dev,
+        )
+        if fcntl is not None and devices not in self._clone_unsupported:
+            try:
+                with open(source, "rb") as src, open(destination, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, destination)
+                return
+            except OSError as e:
+                if e.errno not in _CLONE_UNSUPPORTED:
+                    raise
+                logger.debug(
+                    f"Reflinks not supported from {source} to "
+                    f"{destination}, copying instead.",
+                )
+                self._clone_unsupported.add(devices)
+        shutil.copy2(source, destination)
+
+    def _mount_overlay(self, lower, target) -> bool:
+        """Mount an overlay of ``lower`` on the empty directory ``target``."""
+        os.makedirs(target, exist_ok=True)
+        if os.listdir(target):
+            # Mounting would hide the existing files
+            return False
+
+        layers = target + OVERLAY_SUFFIX
+        upper = os.path.join(layers, "upper")
+        work = os.path.join(layers, "work")
+        os.makedirs(upper, exist_ok=True)
+        os.makedirs(work, exist_ok=True)
+
+        with open(
+            os.path.join(layers, "lower"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            f.write(lower)
+
+        options = f"lowerdir={lower},upperdir={upper},workdir={work}"
+        commands = []
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            commands.append(
+                ["mount", "-t", "overlay", "overlay", "-o", options, target],
+            )
+        if shutil.which("fuse-overlayfs"):
+            commands.append(["fuse-overlayfs", "-o", options, target])
+
+        for command in commands:
+            if _run(command):
+                logger.debug(f"Mounted an overlay of {lower} on {target}.")
+                return True
+
+        logger.warning(
+            f"Unable to mount an overlay on {target}, cloning the "
+            f"workspace instead.",
+        )
+        shutil.rmtree(layers, ignore_errors=True)
+        return False
+
+
+def _overlay_lower(path):
+    """Return the lower layer of an overlay workspace, None if not one."""
+    try:
+        with open(
+            os.path.join(path + OVERLAY_SUFFIX, "lower"),
+            encoding="utf-8",
+        ) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _unmount(path) -> bool:
+    """Unmount path if it is a mount point."""
+    if not os.path.ismount(path):
+        return True
+    return any(
+        _run(command)
+        for command in (
+            ["umount", path],
+            ["fusermount3", "-u", path],
+            ["fusermount", "-u", path],
+        )
+    )
+
+
+def _is_whiteout(path) -> bool:
+    """Whether path is an overlay whiteout, a 0/0 character device."""
+    stat = os.lstat(path)
+    return statmod.S_ISCHR(stat.st_mode) and stat.st_rdev == 0
+
+
+def _is_opaque(path) -> bool:
+    """Whether a directory of an overlay hides the lower one."""
+    if os.path.lexists(os.path.join(path, OPAQUE_MARKER)):
+        return True
+    for name in OPAQUE_XATTRS:
+        try:
+            if os.getxattr(path, name, follow_symlinks=False) == b"y":
+                return True
+        except (AttributeError, OSError):
+            continue
+    return False
+
+
+def _remove(path) -> None:
+    """Remove a file, link or directory tree, if any."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _run(command) -> bool:
+    try:
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            check=False,
+            timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Failed to run {command[0]}: {e}")
+        return False
+    if result.returncode != 0:
+        logger.debug(
+            f"{command[0]} failed: {result.stderr.decode(errors='ignore')}",
+        )
+    return result.returncode == 0
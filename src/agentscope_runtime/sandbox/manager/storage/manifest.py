@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# Name of the manifest kept next to the synced files in storage
+MANIFEST_NAME = ".sandbox_manifest.json"
+
+
+class FileEntry(NamedTuple):
+    """State of a synced file."""
+
+    size: int
+    mtime: float
+    hash: Optional[str] = None
+
+
+class Manifest:
+    """
+    Record of the files of a folder as of its last sync, keyed by their
+    path relative to the folder, with ``/`` separators.
+
+    A file whose size and modification time match its entry is unchanged
+    and is not even read; otherwise its MD5 hash tells whether its content
+    actually changed.
+    """
+
+    def __init__(
+        self,
+        files: Optional[Dict[str, FileEntry]] = None,
+        dirs: Iterable[str] = (),
+    ):
+        self.files: Dict[str, FileEntry] = files or {}
+        self.dirs = set(dirs)
+
+    @classmethod
+    def loads(cls, text) -> "Manifest":
+        """Parse a manifest, an empty one if it is invalid."""
+        try:
+            data = json.loads(text)
+            return cls(
+                files={
+                    path: FileEntry(*entry)
+                    for path, entry in data["files"].items()
+                },
+                dirs=data.get("dirs", []),
+            )
+        except (ValueError, TypeError, KeyError):
+            return cls()
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "files": {
+                    path: list(entry) for path, entry in self.files.items()
+                },
+                "dirs": sorted(self.dirs),
+            },
+        )
+
+    def changes(self, current: "Manifest") -> List[str]:
+        """Return the files of ``current`` that differ from this manifest."""
+        return [
+            path
+            for path, entry in current.files.items()
+            if self.files.get(path, FileEntry(0, 0)).hash != entry.hash
+        ]
+
+
+def calculate_md5(file_path):
+    """Calculate the MD5 checksum of a file."""
+    with open(file_path, "rb") as f:
+        md5 = hashlib.md5()
+        while chunk := f.read(1024 * 1024):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def scan_folder(root, previous: Optional[Manifest] = None) -> Manifest:
+    """
+    Build the manifest of a local folder. The hashes of ``previous`` are
+    reused for the files whose size and modification time did not change.
+    """
+    previous = previous or Manifest()
+    manifest = Manifest()
+    for current_root, dirs, files in os.walk(root):
+        relative_root = os.path.relpath(current_root, root)
+        for d in dirs:
+            manifest.dirs.add(_join(relative_root, d))
+        for file in files:
+            path = _join(relative_root, file)
+            if path == MANIFEST_NAME:
+                continue
+            stat = os.stat(os.path.join(current_root, file))
+            entry = previous.files.get(path)
+            if (
+                entry is None
+                or entry.size != stat.st_size
+                or entry.mtime != stat.st_mtime
+            ):
+                entry = FileEntry(
+                    stat.st_size,
+                    stat.st_mtime,
+                    calculate_md5(os.path.join(current_root, file)),
+                )
+            manifest.files[path] = entry
+    return manifest
+
+
+def is_up_to_date(local_path, entry: FileEntry) -> bool:
+    """Whether a local file has the size and modification time of entry."""
+    try:
+        stat = os.stat(local_path)
+    except OSError:
+        return False
+    return stat.st_size == entry.size and stat.st_mtime == entry.mtime
+
+
+def run_concurrently(
+    func: Callable,
+    items: Iterable,
+    max_workers: int,
+) -> None:
+    """Call ``func`` on every item on a thread pool, raising any error."""
+    items = list(items)
+    if not items:
+        return
+    if max_workers <= 1 or len(items) == 1:
+        for item in items:
+            func(item)
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)),
+        thread_name_prefix="storage-sync",
+    ) as executor:
+        for future in [executor.submit(func, item) for item in items]:
+            future.result()
+
+
+def _join(relative_root, name):
+    if relative_root == ".":
+        return name
+    return f"{relative_root.replace(os.sep, '/')}/{name}"
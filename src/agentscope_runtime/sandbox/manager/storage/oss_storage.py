@@ -1,88 +1,150 @@
 # -*- coding: utf-8 -*-
 import os
-import hashlib
 import oss2
 
 from .data_storage import DataStorage
+from .manifest import (
+    MANIFEST_NAME,
+    Manifest,
+    is_up_to_date,
+    run_concurrently,
+    scan_folder,
+)
 
 
-def calculate_md5(file_path):
-    """Calculate the MD5 checksum of a file."""
-    with open(file_path, "rb") as f:
-        md5 = hashlib.md5()
-        while chunk := f.read(8192):
-            md5.update(chunk)
-    return md5.hexdigest()
+class OSSStorage(DataStorage):
+    """
+    Workspace storage in an OSS bucket.
 
+    Each uploaded folder holds a manifest of its files (size, modification
+    time, MD5), so that only the files changed since the previous sync are
+    transferred, without a request per unchanged file. Transfers run
+    concurrently on ``max_workers`` threads, and files larger than
+    ``multipart_threshold`` bytes go through resumable multipart transfers.
+    """
 
-class OSSStorage(DataStorage):
     def __init__(
         self,
         access_key_id,
         access_key_secret,
         endpoint,
         bucket_name,
+        max_workers: int = 8,
+        multipart_threshold: int = 32 * 1024 * 1024,
     ):
         self.auth = oss2.Auth(access_key_id, access_key_secret)
         self.bucket = oss2.Bucket(self.auth, endpoint, bucket_name)
+        self.max_workers = max_workers
+        self.multipart_threshold = multipart_threshold
+
+    def _load_manifest(self, path) -> Manifest:
+        try:
+            result = self.bucket.get_object(
+                self.path_join(path, MANIFEST_NAME),
+            )
+            return Manifest.loads(result.read())
+        except oss2.exceptions.NoSuchKey:
+            return Manifest()
 
     def download_folder(self, source_path, destination_path):
         """Download a folder from OSS to the local filesystem."""
         if not os.path.exists(destination_path):
             os.makedirs(destination_path)
 
-        for obj in oss2.ObjectIterator(self.bucket, prefix=source_path):
+        prefix = source_path.rstrip("/") + "/"
+        manifest = self._load_manifest(source_path)
+
+        downloads = []
+        for obj in oss2.ObjectIterator(self.bucket, prefix=prefix):
+            relative_path = obj.key[len(prefix) :]
+            if not relative_path or relative_path == MANIFEST_NAME:
+                continue
             local_path = os.path.join(
                 destination_path,
-                os.path.relpath(obj.key, source_path),
+                *relative_path.rstrip("/").split("/"),
             )
 
-            if obj.is_prefix():
+            if obj.key.endswith("/"):
                 # Create local directory
                 os.makedirs(local_path, exist_ok=True)
-            else:
-                # Download file
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                self.bucket.get_object_to_file(obj.key, local_path)
+                continue
+
+            # Skip the files already downloaded
+            entry = manifest.files.get(relative_path)
+            if entry is not None and is_up_to_date(local_path, entry):
+                continue
+            downloads.append((obj, local_path, entry))
+
+        run_concurrently(self._download_file, downloads, self.max_workers)
+
+    def _download_file(self, download):
+        obj, local_path, entry = download
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        if obj.size >= self.multipart_threshold:
+            oss2.resumable_download(
+                self.bucket,
+                obj.key,
+                local_path,
+                multiget_threshold=self.multipart_threshold,
+            )
+        else:
+            self.bucket.get_object_to_file(obj.key, local_path)
+
+        if entry is not None and entry.size == obj.size:
+            # Restore the recorded modification time, so that the file is
+            # known as unchanged by the next upload
+            os.utime(local_path, (entry.mtime, entry.mtime))
 
     def upload_folder(self, source_path, destination_path):
         """Upload a local folder to OSS."""
-        for root, dirs, files in os.walk(source_path):
-            # Upload directory structure
-            for d in dirs:
-                dir_path = os.path.join(root, d)
-                oss_dir_path = os.path.join(
-                    destination_path,
-                    os.path.relpath(dir_path, source_path),
-                )
-                # Maintain structure with an empty object
-                self.bucket.put_object(oss_dir_path + "/", b"")
-
-            # Upload files
-            for file in files:
-                local_file_path = os.path.join(root, file)
-                oss_file_path = os.path.join(
-                    destination_path,
-                    os.path.relpath(local_file_path, source_path),
-                )
-
-                local_md5 = calculate_md5(local_file_path)
-
-                try:
-                    oss_md5 = (
-                        self.bucket.head_object(oss_file_path)
-                        .headers["ETag"]
-                        .strip('"')
-                    )
-                except oss2.exceptions.NoSuchKey:
-                    oss_md5 = None
-
-                # Upload if MD5 does not match or file does not exist
-                if local_md5 != oss_md5:
-                    self.bucket.put_object_from_file(
-                        oss_file_path,
-                        local_file_path,
-                    )
+        if not os.path.exists(source_path):
+            return
+
+        previous = self._load_manifest(destination_path)
+        current = scan_folder(source_path, previous)
+
+        # Maintain structure with an empty object per directory
+        run_concurrently(
+            lambda d: self.bucket.put_object(
+                self.path_join(destination_path, d) + "/",
+                b"",
+            ),
+            sorted(current.dirs - previous.dirs),
+            self.max_workers,
+        )
+
+        # Upload the files changed since the previous upload
+        run_concurrently(
+            lambda path: self._upload_file(
+                os.path.join(source_path, *path.split("/")),
+                self.path_join(destination_path, path),
+                current.files[path].size,
+            ),
+            previous.changes(current),
+            self.max_workers,
+        )
+
+        # Files deleted locally are kept in OSS, and in the manifest
+        manifest = Manifest(
+            files={**previous.files, **current.files},
+            dirs=previous.dirs | current.dirs,
+        )
+        if manifest.dumps() != previous.dumps():
+            self.bucket.put_object(
+                self.path_join(destination_path, MANIFEST_NAME),
+                manifest.dumps(),
+            )
+
+    def _upload_file(self, local_path, key, size):
+        if size >= self.multipart_threshold:
+            oss2.resumable_upload(
+                self.bucket,
+                key,
+                local_path,
+                multipart_threshold=self.multipart_threshold,
+            )
+        else:
+            self.bucket.put_object_from_file(key, local_path)
 
     def path_join(self, *args):
         """Join path components for OSS."""
@@ -59,5 +59,12 @@ class ContainerModel(BaseModel):
         ge=0,
     )
 
+    recycle_count: int = Field(
+        0,
+        description="Number of times the container was reset and put back "
+        "into the pool",
+        ge=0,
+    )
+
     class Config:
         extra = "allow"
@@ -23,6 +23,24 @@ class SandboxManagerEnvConfig(BaseModel):
         "",
         description="Folder path in storage.",
     )
+    storage_sync_workers: int = Field(
+        8,
+        ge=1,
+        description="Number of files transferred at once when syncing a "
+        "workspace with the storage.",
+    )
+    workspace_provisioning: Literal["copy", "clone", "overlay"] = Field(
+        "copy",
+        description="How workspaces are provisioned from the local storage: "
+        "'copy', 'clone' (reflinks where supported, copies elsewhere) or "
+        "'overlay' (overlay mount on the storage folder, falling back to "
+        "'clone').",
+    )
+    background_upload: bool = Field(
+        False,
+        description="Upload the workspace of a released sandbox to the "
+        "storage in the background, after its container is removed.",
+    )
     redis_enabled: bool = Field(
         ...,
         description="Indicates if Redis is enabled.",
@@ -54,11 +72,93 @@ class SandboxManagerEnvConfig(BaseModel):
         (49152, 59152),
         description="Range of ports to be used by the manager.",
     )
+    port_reconcile_interval: float = Field(
+        300.0,
+        description="Seconds between two reconciliations of the allocated "
+        "ports with the ports Docker reports in use. Disabled when 0.",
+    )
 
     pool_size: int = Field(
         0,
         description="Number of containers to be kept in the pool.",
     )
+    image_prefetch: Literal["none", "default", "all"] = Field(
+        "none",
+        description="Sandbox images pulled in the background at start "
+        "(docker only): none, those of the default types, or every "
+        "registered sandbox image. Disabled for embedded managers; the "
+        "manager server enables it by default.",
+    )
+    pool_low_watermark: Optional[int] = Field(
+        None,
+        description="Refill a pool in the background once it holds this "
+        "many containers or fewer. Defaults to pool_size - 1.",
+    )
+    pool_max_concurrency: Optional[int] = Field(
+        None,
+        description="Maximum number of pool containers created at once. "
+        "Defaults to 4 for docker, 16 for k8s and 8 for agentrun.",
+    )
+    max_batch_size: int = Field(
+        64,
+        gt=0,
+        description="Maximum number of sandboxes created by one batch "
+        "request.",
+    )
+    pool_warmup_min_ready: float = Field(
+        1.0,
+        gt=0,
+        le=1,
+        description="Fraction of the pool that must be ready before the "
+        "manager starts serving; the rest warms up in the background.",
+    )
+    pool_warmup_timeout: Optional[float] = Field(
+        None,
+        description="Maximum seconds to wait for the pool warm-up.",
+    )
+    pool_replenish_interval: float = Field(
+        5.0,
+        description="Seconds between two background checks of the pool.",
+    )
+    pool_wait_timeout: float = Field(
+        0.0,
+        ge=0,
+        description="Seconds to wait for a pooled container when the pool "
+        "is empty, before creating one. Only applies while the pool is "
+        "replenished in the background.",
+    )
+
+    idle_ttl: Optional[float] = Field(
+        None,
+        description="Release a container once it has not been accessed for "
+        "this many seconds. Disabled when not set.",
+    )
+    idle_ttl_by_type: Optional[Dict[str, float]] = Field(
+        None,
+        description="Per sandbox type idle TTLs in seconds, overriding "
+        "idle_ttl. Example: {'browser': 600, 'base': 1800}",
+    )
+    idle_reap_interval: float = Field(
+        60.0,
+        description="Seconds between two checks for idle containers.",
+    )
+
+    recycle_on_release: bool = Field(
+        False,
+        description="Reset released containers and put them back into the "
+        "pool instead of destroying them, while the pool is not full.",
+    )
+    max_recycles: int = Field(
+        10,
+        description="Maximum number of times a container is recycled "
+        "before being destroyed.",
+    )
+
+    client_idle_timeout: float = Field(
+        300.0,
+        description="Seconds after which an unused connection to a sandbox "
+        "container is closed.",
+    )
 
     # OSS settings
     oss_endpoint: Optional[str] = Field(
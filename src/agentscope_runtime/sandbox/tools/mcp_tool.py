@@ -2,7 +2,7 @@
 from typing import Optional, Any, Dict, Set, List
 
 from ..enums import SandboxType
-from ..box.sandbox import Sandbox
+from ..box.sandbox import AsyncSandbox, Sandbox
 from .sandbox_tool import SandboxTool
 
 
@@ -43,13 +43,14 @@ class MCPTool(SandboxTool):
             )
         self._server_configs = config
 
-    def bind(self, sandbox: Sandbox):
+    def bind(self, sandbox: Sandbox | AsyncSandbox):
         """
         Return a new instance bound with a specific sandbox (immutable mode).
         """
-        if not isinstance(sandbox, Sandbox):
+        if not isinstance(sandbox, (Sandbox, AsyncSandbox)):
             raise TypeError(
-                "The provided sandbox must be an instance of `Sandbox`.",
+                "The provided sandbox must be an instance of `Sandbox` or "
+                "`AsyncSandbox`.",
             )
 
         assert self.sandbox_type == sandbox.sandbox_type, (
@@ -3,7 +3,7 @@ from typing import Optional, Any, Dict
 
 from .tool import Tool
 from ..enums import SandboxType
-from ..box.sandbox import Sandbox
+from ..box.sandbox import AsyncSandbox, Sandbox
 
 
 class SandboxTool(Tool):
@@ -72,16 +72,38 @@ class SandboxTool(Tool):
         box = sandbox or self._sandbox
         if box is None:
             return self._dryrun_call(**kwargs)
-        else:
-            return box.call_tool(self.name, arguments=kwargs)
+        if isinstance(box, AsyncSandbox):
+            raise TypeError(
+                f"Tool `{self.name}` uses an `AsyncSandbox`, call it with "
+                f"`acall`.",
+            )
+        return box.call_tool(self.name, arguments=kwargs)
+
+    @property
+    def is_async(self) -> bool:
+        return isinstance(self._sandbox, AsyncSandbox)
+
+    async def acall(self, *, sandbox: Optional[Any] = None, **kwargs):
+        """
+        Execute the tool call without blocking the event loop: through the
+        async manager of an ``AsyncSandbox``, in a worker thread otherwise.
+        Args:
+            sandbox: Temporarily used sandbox, highest priority
+            **kwargs: Tool parameters
+        """
+        box = sandbox or self._sandbox
+        if isinstance(box, AsyncSandbox):
+            return await box.call_tool(self.name, arguments=kwargs)
+        return await super().acall(sandbox=sandbox, **kwargs)
 
-    def bind(self, sandbox: Sandbox):
+    def bind(self, sandbox: Sandbox | AsyncSandbox):
         """
         Return a new instance bound with a specific sandbox (immutable mode).
         """
-        if not isinstance(sandbox, Sandbox):
+        if not isinstance(sandbox, (Sandbox, AsyncSandbox)):
             raise TypeError(
-                "The provided sandbox must be an instance of `Sandbox`.",
+                "The provided sandbox must be an instance of `Sandbox` or "
+                "`AsyncSandbox`.",
             )
 
         assert self.sandbox_type == sandbox.sandbox_type, (
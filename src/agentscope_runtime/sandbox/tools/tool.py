@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=unused-argument
+import asyncio
 import inspect
 
 from abc import ABC, abstractmethod
@@ -99,6 +100,23 @@ class Tool(ABC):
             }
         """
 
+    @property
+    def is_async(self) -> bool:
+        """Whether the tool must be called with ``acall``."""
+        return False
+
+    async def acall(self, *, sandbox: Optional[Any] = None, **kwargs) -> Dict:
+        """Execute the tool call without blocking the event loop.
+
+        Args:
+            sandbox: Optional sandbox to use for this call
+            **kwargs: Tool parameters
+
+        Returns:
+            Tool execution result, as returned by ``call``
+        """
+        return await asyncio.to_thread(self.call, sandbox=sandbox, **kwargs)
+
     @abstractmethod
     def bind(self, *args, **kwargs) -> "Tool":
         """Bind parameters or context to create a new tool instance.
@@ -129,8 +147,10 @@ class Tool(ABC):
         )
 
     def make_function(self):
-        """Create a function with proper type signatures from schema."""
-        tool_call = self.__call__
+        """Create a function with proper type signatures from schema.
+
+        The function is a coroutine function when the tool ``is_async``.
+        """
         parameters = self.schema["function"]["parameters"]
 
         # Extract properties and required parameters from the schema
@@ -176,14 +196,7 @@ class Tool(ABC):
         # Create the function signature
         new_signature = inspect.Signature(sig_params, return_annotation=Any)
 
-        def generated_function(*args, **kwargs):
-            """
-            Dynamically generated function wrapper for the tool schema.
-
-            This function is created at runtime to match the tool's parameter
-            signature as defined in the schema. It validates arguments and
-            forwards them to the tool's call interface.
-            """
+        def filter_arguments(*args, **kwargs):
             # Bind arguments to signature
             bound = new_signature.bind(*args, **kwargs)
             bound.apply_defaults()
@@ -203,13 +216,34 @@ class Tool(ABC):
 
             # Filter kwargs based on defined properties and remove None
             # values for optional params
-            filtered_kwargs = {
+            return {
                 k: v
                 for k, v in bound.arguments.items()
                 if k in properties and (k in required or v is not None)
             }
 
-            return tool_call(**filtered_kwargs)
+        if self.is_async:
+
+            async def generated_function(*args, **kwargs):
+                """
+                Dynamically generated coroutine wrapper for the tool schema.
+
+                It validates arguments against the tool's parameter
+                signature and awaits the tool's acall interface.
+                """
+                return await self.acall(**filter_arguments(*args, **kwargs))
+
+        else:
+
+            def generated_function(*args, **kwargs):
+                """
+                Dynamically generated function wrapper for the tool schema.
+
+                This function is created at runtime to match the tool's
+                parameter signature as defined in the schema. It validates
+                arguments and forwards them to the tool's call interface.
+                """
+                return self(**filter_arguments(*args, **kwargs))
 
         # Set the correct signature and metadata
         generated_function.__signature__ = new_signature
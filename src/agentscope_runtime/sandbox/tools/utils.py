@@ -21,14 +21,57 @@ def setup_tools(
         tuple: (activated_tools, schemas) if include_schemas=True,
             else only activated_tools.
     """
+    # Connect to sandbox if required
+    if _requires_sandbox(tools, environment_manager):
+        sandboxes = environment_manager.connect_sandbox(
+            session_id=session_id,
+            user_id=user_id,
+            tools=tools,
+        )
+    else:
+        sandboxes = [_dummy_sandbox()]
+
+    return _bind_tools(tools, sandboxes, include_schemas)
+
+
+async def asetup_tools(
+    tools,
+    environment_manager,
+    session_id,
+    user_id,
+    include_schemas=False,
+):
+    """
+    Async counterpart of ``setup_tools``.
+
+    Sandboxes are connected with ``environment_manager.aconnect_sandbox``,
+    so the event loop is not blocked. With an ``AsyncSandboxService``, the
+    tools are bound to ``AsyncSandbox`` objects and must be called with
+    ``acall``.
+
+    Returns:
+        tuple: (activated_tools, schemas) if include_schemas=True,
+            else only activated_tools.
+    """
+    if _requires_sandbox(tools, environment_manager):
+        sandboxes = await environment_manager.aconnect_sandbox(
+            session_id=session_id,
+            user_id=user_id,
+            tools=tools,
+        )
+    else:
+        sandboxes = [_dummy_sandbox()]
+
+    return _bind_tools(tools, sandboxes, include_schemas)
+
+
+def _requires_sandbox(tools, environment_manager) -> bool:
+    """Check the tool types and whether a sandbox needs to be enabled."""
     # Lazy import
     from .tool import Tool
     from .sandbox_tool import SandboxTool
-    from ...sandbox.box.dummy.dummy_sandbox import DummySandbox
 
     enable_sandbox = False
-
-    # Check tool types and determine if sandbox needs to be enabled
     for tool in tools:
         assert isinstance(tool, Tool), f"{tool} must be an instance of Tool"
         if isinstance(tool, SandboxTool):
@@ -38,17 +81,17 @@ def setup_tools(
     # Check environment service
     if enable_sandbox and environment_manager is None:
         raise ValueError("environment_manager is not set")
+    return enable_sandbox
+
+
+def _dummy_sandbox():
+    # Lazy import
+    from ...sandbox.box.dummy.dummy_sandbox import DummySandbox
+
+    return DummySandbox()
 
-    # Connect to sandbox if required
-    if enable_sandbox:
-        sandboxes = environment_manager.connect_sandbox(
-            session_id=session_id,
-            user_id=user_id,
-            tools=tools,
-        )
-    else:
-        sandboxes = [DummySandbox()]
 
+def _bind_tools(tools, sandboxes, include_schemas):
     # Bind tools to sandbox and prepare schemas if required
     schemas = []  # Initialize schemas list
     activated_tools = []  # Initialize activated tools list
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name, protected-access
+import json
+
+import httpx
+import pytest
+
+from agentscope_runtime.sandbox.box.sandbox import AsyncSandbox
+from agentscope_runtime.sandbox.manager import AsyncSandboxManager
+
+
+@pytest.fixture
+def requests_log():
+    return []
+
+
+@pytest.fixture
+def manager(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content or b"{}")
+        requests_log.append((request.url.path, body, request.headers))
+        if request.url.path == "/create_from_pool":
+            return httpx.Response(200, json={"data": "sandbox-1"})
+        if request.url.path == "/call_tool":
+            return httpx.Response(200, json={"data": {"echo": body}})
+        if request.url.path == "/release":
+            return httpx.Response(200, json={"data": True})
+        if request.url.path == "/create_batch_stream":
+            lines = [
+                {"index": i, "container_name": f"sandbox-{i}"}
+                for i in reversed(range(body["count"]))
+            ]
+            return httpx.Response(
+                200,
+                content="".join(json.dumps(line) + "\n" for line in lines),
+            )
+        return httpx.Response(500, json={"detail": "boom"})
+
+    manager = AsyncSandboxManager(
+        base_url="http://manager:8000/",
+        bearer_token="secret",
+    )
+    manager.http_client = httpx.AsyncClient(
+        base_url=manager.base_url,
+        headers=manager.http_client.headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_remote_call_maps_positional_args(manager, requests_log):
+    result = await manager.call_tool("sandbox-1", "run_shell_command", {})
+
+    assert result == {
+        "echo": {
+            "identity": "sandbox-1",
+            "tool_name": "run_shell_command",
+            "arguments": {},
+        },
+    }
+    path, _, headers = requests_log[0]
+    assert path == "/call_tool"
+    assert headers["Authorization"] == "Bearer secret"
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_error_is_reported(manager):
+    result = await manager.get_status("sandbox-1")
+
+    assert result.startswith("Error: HTTP 500 Error")
+    assert "Server Detail: boom" in result
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_sandbox_lifecycle(manager, requests_log):
+    async with AsyncSandbox(
+        base_url="http://manager:8000",
+        manager_api=manager,
+    ) as box:
+        assert box.sandbox_id == "sandbox-1"
+        await box.call_tool("run_ipython_cell", {"code": "1"})
+
+    assert [path for path, _, _ in requests_log] == [
+        "/create_from_pool",
+        "/call_tool",
+        "/release",
+    ]
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_create_batch_is_streamed(manager, requests_log):
+    items = [item async for item in manager.iter_create_batch(count=3)]
+
+    assert items == [
+        {"index": 2, "container_name": "sandbox-2"},
+        {"index": 1, "container_name": "sandbox-1"},
+        {"index": 0, "container_name": "sandbox-0"},
+    ]
+    assert requests_log[0][1] == {
+        "sandbox_type": None,
+        "count": 3,
+        "meta": None,
+    }
+    await manager.aclose()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import inspect
+import json
+from unittest import mock
+
+import httpx
+import pytest
+
+from agentscope_runtime.engine.services.environment_manager import (
+    EnvironmentManager,
+)
+from agentscope_runtime.engine.services.sandbox_service import (
+    AsyncSandboxService,
+)
+from agentscope_runtime.sandbox.box.sandbox import AsyncSandbox
+from agentscope_runtime.sandbox.tools.base import run_ipython_cell
+from agentscope_runtime.sandbox.tools.utils import asetup_tools
+
+
+@pytest.fixture
+def requests_log():
+    return []
+
+
+@pytest.fixture
+def service(requests_log):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content or b"{}")
+        requests_log.append(request.url.path)
+        if request.url.path == "/get_session_mapping":
+            return httpx.Response(200, json={"data": []})
+        if request.url.path == "/create_from_pool":
+            return httpx.Response(200, json={"data": "sandbox-1"})
+        if request.url.path == "/call_tool":
+            return httpx.Response(200, json={"data": {"echo": body}})
+        return httpx.Response(500, json={"detail": "boom"})
+
+    service = AsyncSandboxService(
+        base_url="http://manager:8000",
+        bearer_token="secret",
+    )
+    manager = service.manager_api
+    manager.http_client = httpx.AsyncClient(
+        base_url=manager.base_url,
+        headers=manager.http_client.headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_tools_are_bound_to_async_boxes(service, requests_log):
+    environment_manager = EnvironmentManager(sandbox_service=service)
+
+    with mock.patch(
+        "agentscope_runtime.sandbox.box.sandbox.SandboxManager",
+    ) as sync_manager:
+        tools = await asetup_tools(
+            [run_ipython_cell],
+            environment_manager,
+            session_id="session",
+            user_id="user",
+        )
+
+    sync_manager.assert_not_called()
+    (tool,) = tools
+    assert tool.is_async
+    assert isinstance(tool.sandbox, AsyncSandbox)
+    assert tool.sandbox.manager_api is service.manager_api
+
+    result = await tool.acall(code="1 + 1")
+
+    assert result == {
+        "echo": {
+            "identity": "sandbox-1",
+            "tool_name": "run_ipython_cell",
+            "arguments": {"code": "1 + 1"},
+        },
+    }
+    assert requests_log[-1] == "/call_tool"
+    with pytest.raises(TypeError):
+        tool(code="1 + 1")
+    with pytest.raises(TypeError):
+        environment_manager.connect_sandbox("session", "user")
+    await service.manager_api.aclose()
+
+
+@pytest.mark.asyncio
+async def test_make_function_is_awaitable_for_async_tools(service):
+    box = AsyncSandbox(
+        sandbox_id="sandbox-1",
+        manager_api=service.manager_api,
+    )
+    function = run_ipython_cell.bind(box).make_function()
+
+    assert inspect.iscoroutinefunction(function)
+    result = await function(code="1")
+    assert result["echo"]["arguments"] == {"code": "1"}
+    assert not inspect.iscoroutinefunction(run_ipython_cell.make_function())
+    await service.manager_api.aclose()
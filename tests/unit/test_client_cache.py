@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import time
+
+from agentscope_runtime.sandbox.manager.client_cache import ClientCache
+
+
+class FakeClient:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.needs_health_check = False
+        self.health_checks = 0
+        self.closed = False
+
+    def check_health(self):
+        self.health_checks += 1
+        self.needs_health_check = not self.healthy
+        return self.healthy
+
+    def close(self):
+        self.closed = True
+
+
+def test_client_is_reused_without_health_check():
+    cache = ClientCache()
+    created = []
+
+    def factory():
+        created.append(FakeClient())
+        return created[-1]
+
+    first = cache.get("c1", factory)
+    second = cache.get("c1", factory)
+
+    assert first is second
+    assert len(created) == 1
+    assert first.health_checks == 0
+
+
+def test_health_is_verified_after_failure():
+    cache = ClientCache()
+    client = cache.get("c1", FakeClient)
+
+    client.needs_health_check = True
+    assert cache.get("c1", FakeClient) is client
+    assert client.health_checks == 1
+
+    client.healthy = False
+    client.needs_health_check = True
+    replacement = cache.get("c1", FakeClient)
+    assert replacement is not client
+    assert client.closed
+
+
+def test_evict_and_idle_timeout():
+    cache = ClientCache(idle_timeout=0.05)
+    client = cache.get("c1", FakeClient)
+    cache.evict("c1")
+    assert client.closed
+    assert "c1" not in cache
+
+    idle = cache.get("c2", FakeClient)
+    time.sleep(0.1)
+    cache.get("c3", FakeClient)
+    assert idle.closed
+    assert "c2" not in cache
+    assert len(cache) == 1
@@ -2,6 +2,8 @@
 # pylint: disable=redefined-outer-name, protected-access
 # pylint: disable=too-many-public-methods
 # Mock classes will be provided by pytest-mock plugin
+import asyncio
+import time
 
 import pytest
 
@@ -13,6 +15,7 @@ from agentscope_runtime.engine.schemas.agent_schemas import (
     Role,
 )
 from agentscope_runtime.engine.services.context_manager import (
+    BackgroundWrites,
     ContextComposer,
     ContextManager,
     create_context_manager,
@@ -156,6 +159,142 @@ class TestContextComposer:
         mock_memory_service.search_memory.assert_called_once()
         mock_memory_service.add_memory.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_compose_runs_stages_concurrently(
+        self,
+        mock_session_history_service,
+        mock_memory_service,
+        mocker,
+        sample_session,
+        sample_messages,
+    ):
+        """Test that session, memory and rag stages overlap."""
+
+        async def slow_append(**_):
+            await asyncio.sleep(0.2)
+
+        async def slow_search(**_):
+            await asyncio.sleep(0.2)
+            return [create_message(Role.SYSTEM, "Retrieved memory")]
+
+        async def slow_retrieve(**_):
+            await asyncio.sleep(0.2)
+            return ["doc"]
+
+        mock_session_history_service.append_message.side_effect = slow_append
+        mock_memory_service.search_memory.side_effect = slow_search
+        rag_service = mocker.AsyncMock()
+        rag_service.get_query_text.return_value = "Hi there!"
+        rag_service.retrieve.side_effect = slow_retrieve
+
+        start = time.monotonic()
+        await ContextComposer.compose(
+            session_history_service=mock_session_history_service,
+            memory_service=mock_memory_service,
+            rag_service=rag_service,
+            request_input=sample_messages,
+            session=sample_session,
+        )
+        assert time.monotonic() - start < 0.5
+
+        # The mocked history service does not extend the session, so the
+        # rag document is inserted before the recalled memory.
+        assert [m.content[0].text for m in sample_session.messages] == [
+            "doc",
+            "Retrieved memory",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_compose_skips_stages_missing_deadline(
+        self,
+        mock_memory_service,
+        mocker,
+        sample_session,
+        sample_messages,
+    ):
+        """Test that memory and rag are skipped when they time out."""
+
+        async def slow_search(**_):
+            await asyncio.sleep(1)
+            return [create_message(Role.SYSTEM, "Retrieved memory")]
+
+        async def slow_retrieve(**_):
+            await asyncio.sleep(1)
+            return ["doc"]
+
+        mock_memory_service.search_memory.side_effect = slow_search
+        rag_service = mocker.AsyncMock()
+        rag_service.get_query_text.return_value = "Hi there!"
+        rag_service.retrieve.side_effect = slow_retrieve
+
+        await ContextComposer.compose(
+            memory_service=mock_memory_service,
+            rag_service=rag_service,
+            request_input=sample_messages,
+            session=sample_session,
+            stage_timeouts={"memory": 0.05, "rag": 0.05},
+        )
+
+        assert sample_session.messages == sample_messages
+        mock_memory_service.add_memory.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_compose_does_not_wait_for_add_memory(
+        self,
+        mock_memory_service,
+        sample_session,
+        sample_messages,
+    ):
+        """Test that a slow add_memory does not delay a stage with a
+        deadline, and is still completed."""
+        added = asyncio.Event()
+
+        async def slow_add(**_):
+            await asyncio.sleep(0.5)
+            added.set()
+
+        mock_memory_service.search_memory.return_value = [
+            create_message(Role.SYSTEM, "Retrieved memory"),
+        ]
+        mock_memory_service.add_memory.side_effect = slow_add
+
+        background_writes = BackgroundWrites(max_pending=1)
+        start = time.monotonic()
+        await ContextComposer.compose(
+            memory_service=mock_memory_service,
+            request_input=sample_messages,
+            session=sample_session,
+            stage_timeouts={"memory": 0.05},
+            background_writes=background_writes,
+        )
+        assert time.monotonic() - start < 0.3
+        assert sample_session.messages[0].content[0].text == "Retrieved memory"
+        assert not added.is_set()
+
+        # Other managers do not wait for these writes
+        await ContextManager(memory_service=mock_memory_service).flush()
+        assert not added.is_set()
+
+        await background_writes.flush()
+        assert added.is_set()
+
+    @pytest.mark.asyncio
+    async def test_background_writes_are_bounded(self):
+        """Test background writes wait for a free slot."""
+        release = asyncio.Event()
+        background_writes = BackgroundWrites(max_pending=1)
+
+        await background_writes.spawn(release.wait(), "memory")
+        second = asyncio.create_task(
+            background_writes.spawn(asyncio.sleep(0), "memory"),
+        )
+        await asyncio.sleep(0.05)
+        assert not second.done()
+
+        release.set()
+        await second
+        await background_writes.flush()
+
     @pytest.mark.asyncio
     async def test_compose_without_services(
         self,
@@ -248,6 +387,35 @@ class TestContextManager:
             session_id="test_session_id",
         )
 
+    @pytest.mark.asyncio
+    async def test_compose_session_with_history_window(
+        self,
+        mock_session_history_service,
+        sample_session,
+    ):
+        """Test compose_session forwards the configured history window."""
+        mock_session_history_service.get_session.return_value = sample_session
+        manager = ContextManager(
+            session_history_service=mock_session_history_service,
+            history_window=20,
+        )
+
+        await manager.compose_session(
+            user_id="test_user",
+            session_id="test_session_id",
+        )
+
+        mock_session_history_service.get_session.assert_called_once_with(
+            user_id="test_user",
+            session_id="test_session_id",
+            history_window=20,
+        )
+
+    def test_init_with_negative_history_window(self):
+        """Test ContextManager rejects a negative history window."""
+        with pytest.raises(ValueError, match="history_window"):
+            ContextManager(history_window=-1)
+
     @pytest.mark.asyncio
     async def test_compose_session_without_service(self):
         """Test compose_session method without session service."""
@@ -308,6 +476,105 @@ class TestContextManager:
             messages=sample_messages,
         )
 
+    @pytest.mark.asyncio
+    async def test_append_write_behind(
+        self,
+        mock_session_history_service,
+        mock_memory_service,
+        sample_session,
+    ):
+        """Test write-behind appends are batched, ordered and flushed."""
+        written = []
+        release = asyncio.Event()
+
+        async def slow_append(session, message):
+            await release.wait()
+            written.append([m.content[0].text for m in message])
+
+        mock_session_history_service.append_message.side_effect = slow_append
+        manager = ContextManager(
+            session_history_service=mock_session_history_service,
+            memory_service=mock_memory_service,
+            write_behind=True,
+        )
+
+        async with manager:
+            for i in range(3):
+                await manager.append(
+                    sample_session,
+                    [create_message(Role.ASSISTANT, f"turn {i}")],
+                )
+            # append returned although nothing has been written yet
+            assert written == []
+            release.set()
+
+        # Appends queued before the worker ran are merged into one
+        # ordered write.
+        assert written == [["turn 0", "turn 1", "turn 2"]]
+        mock_memory_service.add_memory.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_append_write_behind_retries(
+        self,
+        mock_session_history_service,
+        sample_session,
+        sample_messages,
+    ):
+        """Test failed write-behind appends are retried."""
+        mock_session_history_service.append_message.side_effect = [
+            ConnectionError("unavailable"),
+            None,
+        ]
+        manager = ContextManager(
+            session_history_service=mock_session_history_service,
+            write_behind=True,
+        )
+
+        await manager.append(sample_session, sample_messages)
+        await manager.flush()
+
+        assert mock_session_history_service.append_message.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_append_write_behind_retries_only_failed_step(
+        self,
+        mock_session_history_service,
+        mock_memory_service,
+        sample_session,
+        sample_messages,
+    ):
+        """Test a failed memory write does not duplicate the history."""
+        mock_memory_service.add_memory.side_effect = [
+            ConnectionError("unavailable"),
+            None,
+        ]
+        manager = ContextManager(
+            session_history_service=mock_session_history_service,
+            memory_service=mock_memory_service,
+            write_behind=True,
+        )
+
+        await manager.append(sample_session, sample_messages)
+        await manager.flush()
+
+        mock_session_history_service.append_message.assert_called_once()
+        assert mock_memory_service.add_memory.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_compose_session_waits_for_write_behind(
+        self,
+        sample_messages,
+    ):
+        """Test a session is loaded only after its queued writes."""
+        manager = ContextManager(write_behind=True)
+
+        async with manager:
+            session = await manager.compose_session("test_user", "s1")
+            await manager.append(session, sample_messages)
+            reloaded = await manager.compose_session("test_user", "s1")
+
+        assert len(reloaded.messages) == len(sample_messages)
+
     def test_register_service_class(self, mocker):
         """Test register method with service class."""
         manager = ContextManager()
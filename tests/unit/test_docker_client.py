@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name, protected-access
+from unittest.mock import MagicMock, patch
+
+import docker
+import pytest
+
+from agentscope_runtime.common.container_clients.docker_client import (
+    STATUS_WATCH,
+    DockerClient,
+    ImageCache,
+)
+from agentscope_runtime.sandbox.model import SandboxManagerEnvConfig
+
+
+@pytest.fixture
+def client():
+    api = MagicMock()
+    api.events.return_value = iter([])
+    with patch("docker.from_env", return_value=api), patch(
+        "agentscope_runtime.common.container_clients.docker_client"
+        ".IMAGE_CACHE",
+        ImageCache(),
+    ):
+        client = DockerClient(
+            config=SandboxManagerEnvConfig(
+                file_system="local",
+                redis_enabled=False,
+                container_deployment="docker",
+                port_range=(50000, 50010),
+            ),
+        )
+        yield client
+        client.close()
+
+
+def test_image_is_verified_once(client):
+    client.client.images.get.return_value = MagicMock(id="sha256:1")
+
+    assert client.ensure_image("sandbox")
+    assert client.ensure_image("sandbox:latest")
+    client.client.images.get.assert_called_once_with("sandbox")
+
+
+def test_missing_image_is_pulled(client):
+    client.client.images.get.side_effect = docker.errors.ImageNotFound("")
+    client.client.images.pull.return_value = MagicMock(id="sha256:1")
+
+    assert client.ensure_image("sandbox:v1")
+    assert client.ensure_image("sandbox:v1")
+    client.client.images.pull.assert_called_once_with("sandbox:v1")
+
+
+def test_failed_pull_is_not_cached(client):
+    client.client.images.get.side_effect = docker.errors.ImageNotFound("")
+    client.client.images.pull.side_effect = docker.errors.APIError("")
+
+    assert not client.ensure_image("sandbox")
+    assert not client.ensure_image("sandbox")
+    assert client.client.images.pull.call_count == 2
+
+
+def test_image_events_invalidate_the_cache(client):
+    client.client.images.get.return_value = MagicMock(id="sha256:1")
+    client.ensure_image("sandbox")
+    client.ensure_image("other")
+
+    STATUS_WATCH._parse_event(
+        {"Type": "image", "Action": "delete", "Actor": {"ID": "sha256:1"}},
+    )
+    assert "sandbox" not in client.image_cache
+    assert "other" not in client.image_cache
+
+    client.ensure_image("sandbox")
+    STATUS_WATCH._parse_event(
+        {"Type": "image", "Action": "pull", "Actor": {"ID": "sandbox:latest"}},
+    )
+    assert "sandbox" not in client.image_cache
+
+
+def test_status_watcher_is_shared_and_lazy(client):
+    other = DockerClient(config=client.config)
+    # No watcher until a status is looked up
+    assert STATUS_WATCH._cache is None
+
+    client.client.containers.get.return_value = MagicMock(
+        attrs={"State": {"Status": "running"}},
+    )
+    assert client.get_status("container") == "running"
+    assert other.get_status("container") == "running"
+    cache = STATUS_WATCH._cache
+    assert cache is client.status_watch.status_cache
+    assert cache._thread.is_alive()
+
+    other.close()
+    other.close()
+    assert STATUS_WATCH._cache is not None
+    client.close()
+    assert STATUS_WATCH._cache is None
+
+
+def test_created_container_is_inspected(client):
+    client.client.containers.get.return_value = MagicMock(
+        attrs={"State": {"Status": "running"}},
+    )
+    # A stale event-fed status, e.g. from the "create" event
+    STATUS_WATCH.status_cache._apply(("container",), "created")
+
+    assert client.inspect_status("container") == "running"
+
+
+def test_ports_in_use_reads_the_cache_once(client):
+    client.client.api.containers.return_value = [
+        {"Id": "running", "Ports": [{"PublicPort": 50001}]},
+        {"Id": "stopped", "Ports": []},
+    ]
+    client.ports_cache.set("stopped", [50002, 50003])
+    client.ports_cache.set("removed", [50004])
+
+    with patch.object(
+        client.ports_cache,
+        "get",
+        side_effect=AssertionError("one read per container"),
+    ):
+        assert client._ports_in_use() == {50001, 50002, 50003}
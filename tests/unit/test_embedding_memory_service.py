@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name, protected-access
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from agentscope_runtime.engine.services.embedding_memory_service import (
+    EmbeddingMemoryService,
+    HashingEmbedder,
+)
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    Message,
+    MessageType,
+    TextContent,
+    ContentType,
+    Role,
+)
+
+
+def create_message(role: str, content: str) -> Message:
+    """Helper function to create a proper Message object."""
+    return Message(
+        type=MessageType.MESSAGE,
+        role=role,
+        content=[TextContent(type=ContentType.TEXT, text=content)],
+    )
+
+
+@pytest_asyncio.fixture
+async def memory_service():
+    service = EmbeddingMemoryService(initial_capacity=2)
+    await service.start()
+    yield service
+    await service.stop()
+
+
+def test_hashing_embedder_is_deterministic():
+    embedder = HashingEmbedder(dimension=32)
+    first = embedder(["hello world", "other text"])
+    second = HashingEmbedder(dimension=32)(["hello world", "other text"])
+    assert first.shape == (2, 32)
+    assert np.array_equal(first, second)
+
+
+@pytest.mark.asyncio
+async def test_search_memory_ranks_by_similarity(
+    memory_service: EmbeddingMemoryService,
+):
+    user_id = "user1"
+    best = create_message(Role.USER, "the capital of france is paris")
+    partial = create_message(Role.USER, "france has good cheese")
+    unrelated = create_message(Role.USER, "completely different topic")
+    await memory_service.add_memory(user_id, [partial, unrelated], "s1")
+    await memory_service.add_memory(user_id, [best], "s2")
+
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "capital of france")],
+        filters={"top_k": 2},
+    )
+    assert retrieved == [best, partial]
+
+
+@pytest.mark.asyncio
+async def test_matrix_grows_by_doubling(
+    memory_service: EmbeddingMemoryService,
+):
+    user_id = "user2"
+    messages = [create_message(Role.USER, f"message {i}") for i in range(5)]
+    await memory_service.add_memory(user_id, messages)
+
+    user_vectors = memory_service._vectors[user_id]
+    assert user_vectors.size == 5
+    assert user_vectors.matrix.shape[0] == 8
+
+    listed = await memory_service.list_memory(
+        user_id,
+        filters={"page_size": 10, "page_num": 1},
+    )
+    assert listed == messages
+
+
+@pytest.mark.asyncio
+async def test_delete_memory(memory_service: EmbeddingMemoryService):
+    user_id = "user3"
+    msg1 = create_message(Role.USER, "apple banana")
+    msg2 = create_message(Role.USER, "banana orange")
+    await memory_service.add_memory(user_id, [msg1], "session1")
+    await memory_service.add_memory(user_id, [msg2], "session2")
+
+    await memory_service.delete_memory(user_id, "session1")
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "banana")],
+    )
+    assert retrieved == [msg2]
+
+    await memory_service.delete_memory(user_id)
+    assert await memory_service.list_memory(user_id) == []
+
+
+@pytest.mark.asyncio
+async def test_custom_embedding_function():
+    calls = []
+
+    def embedding_function(texts):
+        calls.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts])
+
+    service = EmbeddingMemoryService(embedding_function=embedding_function)
+    await service.start()
+    await service.add_memory("user", [create_message(Role.USER, "abc")])
+    retrieved = await service.search_memory(
+        "user",
+        [create_message(Role.USER, "abcd")],
+    )
+    assert len(retrieved) == 1
+    assert calls == [["abc"], ["abcd"]]
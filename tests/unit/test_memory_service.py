@@ -107,6 +107,33 @@ async def test_search_memory_with_top_k(memory_service: InMemoryMemoryService):
     assert retrieved == messages[-3:]
 
 
+@pytest.mark.asyncio
+async def test_search_memory_ranks_by_term_overlap(
+    memory_service: InMemoryMemoryService,
+):
+    user_id = "user_rank"
+    best = create_message(Role.USER, "Paris is the capital of France.")
+    partial = create_message(Role.USER, "France has many cities")
+    recent = create_message(Role.USER, "The weather in Paris")
+    await memory_service.add_memory(user_id, [best, partial], "session1")
+    await memory_service.add_memory(user_id, [recent], "session2")
+
+    search_query = [create_message(Role.USER, "capital of France?")]
+    retrieved = await memory_service.search_memory(
+        user_id,
+        search_query,
+        filters={"top_k": 2},
+    )
+    assert retrieved == [best, partial]
+
+    await memory_service.delete_memory(user_id, "session1")
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "paris france")],
+    )
+    assert retrieved == [recent]
+
+
 @pytest.mark.asyncio
 async def test_search_memory_no_match(memory_service: InMemoryMemoryService):
     user_id = "user_nomatch"
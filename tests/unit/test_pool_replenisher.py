@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import threading
+import time
+
+import pytest
+
+from agentscope_runtime.common.collections import InMemoryQueue, RedisQueue
+from agentscope_runtime.sandbox.enums import SandboxType
+from agentscope_runtime.sandbox.manager.pool_replenisher import (
+    PoolReplenisher,
+    RedisInFlightCreations,
+)
+
+
+class FakeManager:
+    def __init__(self, pool_size, create_delay=0.0, queue=None):
+        self.pool_size = pool_size
+        self.pool_queues = {SandboxType.BASE: queue or InMemoryQueue()}
+        self.create_delay = create_delay
+        self.active = 0
+        self.max_active = 0
+        self.created = 0
+        self._lock = threading.Lock()
+
+    def add_to_pool(self, sandbox_type):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.create_delay)
+        with self._lock:
+            self.active -= 1
+            self.created += 1
+            queue = self.pool_queues[sandbox_type]
+            if queue.size() >= self.pool_size:
+                return False
+            queue.enqueue({"container_name": f"c{self.created}"})
+            return True
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_replenisher_fills_pool_with_bounded_concurrency():
+    manager = FakeManager(pool_size=6, create_delay=0.05)
+    replenisher = PoolReplenisher(
+        manager,
+        pool_size=6,
+        max_concurrency=2,
+        interval=60,
+    )
+    replenisher.start()
+    try:
+        queue = manager.pool_queues[SandboxType.BASE]
+        assert wait_for(lambda: queue.size() == 6)
+        assert manager.max_active <= 2
+        assert manager.created == 6
+    finally:
+        replenisher.stop()
+
+
+def test_replenisher_respects_low_watermark():
+    manager = FakeManager(pool_size=4)
+    replenisher = PoolReplenisher(
+        manager,
+        pool_size=4,
+        low_watermark=1,
+        interval=60,
+    )
+    replenisher.start()
+    try:
+        queue = manager.pool_queues[SandboxType.BASE]
+        assert wait_for(lambda: queue.size() == 4)
+
+        # Above the watermark: nothing is created
+        queue.dequeue()
+        queue.dequeue()
+        replenisher.notify()
+        time.sleep(0.1)
+        assert queue.size() == 2
+
+        # At the watermark: the pool is topped up
+        queue.dequeue()
+        replenisher.notify()
+        assert wait_for(lambda: queue.size() == 4)
+        assert manager.created == 7
+    finally:
+        replenisher.stop()
+
+
+def test_replenisher_rejects_invalid_watermark():
+    with pytest.raises(ValueError):
+        PoolReplenisher(FakeManager(pool_size=2), pool_size=2, low_watermark=2)
+
+
+def test_wait_until_ready_returns_at_min_fraction():
+    manager = FakeManager(pool_size=4, create_delay=0.2)
+    replenisher = PoolReplenisher(
+        manager,
+        pool_size=4,
+        max_concurrency=1,
+        interval=60,
+    )
+    replenisher.start()
+    try:
+        assert replenisher.wait_until_ready(min_ready=0.5)
+        queue = manager.pool_queues[SandboxType.BASE]
+        assert 2 <= queue.size() < 4
+
+        # The rest of the pool keeps warming up in the background
+        assert wait_for(lambda: queue.size() == 4)
+    finally:
+        replenisher.stop()
+
+
+def test_wait_until_ready_gives_up_when_creation_fails():
+    manager = FakeManager(pool_size=2)
+    manager.add_to_pool = lambda sandbox_type: False
+    replenisher = PoolReplenisher(manager, pool_size=2, interval=60)
+    replenisher.start()
+    try:
+        assert not replenisher.wait_until_ready(timeout=2)
+    finally:
+        replenisher.stop()
+
+
+@pytest.fixture
+def redis_client():
+    # Lua scripting support of fakeredis
+    pytest.importorskip("lupa")
+    import fakeredis
+
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def test_replenishers_sharing_a_redis_pool_share_the_budget(redis_client):
+    queue = RedisQueue(redis_client, "pool", maxsize=4)
+    managers = [
+        FakeManager(pool_size=4, create_delay=0.1, queue=queue)
+        for _ in range(2)
+    ]
+    replenishers = [
+        PoolReplenisher(
+            manager,
+            pool_size=4,
+            interval=60,
+            in_flight=RedisInFlightCreations(redis_client),
+        )
+        for manager in managers
+    ]
+    for replenisher in replenishers:
+        replenisher.start()
+    try:
+        assert wait_for(lambda: queue.size() == 4)
+        assert sum(manager.created for manager in managers) == 4
+        assert replenishers[0]._in_flight.pending(managers[0].pool_queues) == 0
+    finally:
+        for replenisher in replenishers:
+            replenisher.stop()
+
+
+def test_expired_creation_leases_are_dropped(redis_client):
+    queue = RedisQueue(redis_client, "pool")
+    pools = {SandboxType.BASE: queue}
+    in_flight = RedisInFlightCreations(redis_client, lease_ttl=0.05)
+
+    assert len(in_flight.reserve(SandboxType.BASE, queue, 3)) == 3
+    assert not in_flight.reserve(SandboxType.BASE, queue, 3)
+    assert in_flight.pending(pools) == 3
+
+    # The leases of a dead process expire
+    time.sleep(0.1)
+    assert in_flight.pending(pools) == 0
+    assert len(in_flight.reserve(SandboxType.BASE, queue, 3)) == 3
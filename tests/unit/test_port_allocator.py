@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import time
+
+import pytest
+
+from agentscope_runtime.common.container_clients.port_allocator import (
+    InMemoryPortAllocator,
+    RedisPortAllocator,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def allocator(request):
+    if request.param == "memory":
+        return InMemoryPortAllocator(range(100, 105))
+
+    # Lua scripting support of fakeredis
+    pytest.importorskip("lupa")
+    import fakeredis
+
+    return RedisPortAllocator(
+        fakeredis.FakeRedis(decode_responses=True),
+        port_range=range(100, 105),
+        key="ports",
+    )
+
+
+def test_allocate_and_release(allocator):
+    assert allocator.allocate(2) == [100, 101]
+    assert allocator.allocate(2) == [102, 103]
+
+    allocator.release([100])
+    # Released ports are reused last
+    assert allocator.allocate(2) == [104, 100]
+    assert allocator.allocate(1) == []
+    assert set(allocator.allocations()) == {100, 101, 102, 103, 104}
+
+
+def test_release_is_idempotent(allocator):
+    allocator.allocate(1)
+    allocator.release([100])
+    allocator.release([100])
+
+    assert allocator.allocate(5) == [101, 102, 103, 104, 100]
+
+
+def test_reconcile_marks_used_and_frees_leaked(allocator):
+    allocator.allocate(2)
+
+    allocator.reconcile(in_use=[101, 103], grace=0)
+    # 100 leaked and is free again, 103 is used outside the allocator
+    assert set(allocator.allocations()) == {101, 103}
+    assert sorted(allocator.allocate(5)) == [100, 102, 104]
+
+
+def test_reconcile_keeps_recent_allocations(allocator):
+    allocator.allocate(1)
+
+    allocator.reconcile(in_use=[], grace=60)
+    assert set(allocator.allocations()) == {100}
+
+    time.sleep(0.01)
+    allocator.reconcile(in_use=[], grace=0)
+    assert allocator.allocations() == {}
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import threading
+import time
+
+import pytest
+
+from agentscope_runtime.common.collections import InMemoryQueue, RedisQueue
+
+
+@pytest.fixture(params=["memory", "redis"])
+def make_queue(request):
+    if request.param == "memory":
+        return InMemoryQueue
+
+    # Lua scripting support of fakeredis, for bounded queues
+    pytest.importorskip("lupa")
+    import fakeredis
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    return lambda maxsize=0: RedisQueue(client, "queue", maxsize=maxsize)
+
+
+def test_fifo_order(make_queue):
+    queue = make_queue()
+    assert queue.dequeue() is None
+    for i in range(3):
+        assert queue.enqueue({"i": i})
+
+    assert queue.peek() == {"i": 0}
+    assert [queue.dequeue() for _ in range(3)] == [{"i": i} for i in range(3)]
+    assert queue.is_empty()
+
+
+def test_maxsize(make_queue):
+    queue = make_queue(maxsize=2)
+    assert queue.enqueue({"i": 0})
+    assert queue.enqueue({"i": 1})
+    assert not queue.enqueue({"i": 2})
+    assert queue.size() == 2
+
+    queue.dequeue()
+    assert queue.enqueue({"i": 2})
+
+
+def test_blocking_dequeue(make_queue):
+    queue = make_queue()
+
+    started = time.monotonic()
+    assert queue.dequeue(timeout=0.2) is None
+    assert time.monotonic() - started >= 0.15
+
+    timer = threading.Timer(0.1, queue.enqueue, args=({"i": 0},))
+    timer.start()
+    started = time.monotonic()
+    assert queue.dequeue(timeout=5) == {"i": 0}
+    assert time.monotonic() - started < 2
+    timer.join()
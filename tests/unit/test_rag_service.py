@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name, protected-access
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentscope_runtime.engine.services.rag_service import (
+    LangChainRAGService,
+    RAGService,
+)
+
+
+class CountingRAGService(RAGService):
+    """RAG service returning canned documents and counting lookups."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    async def _retrieve(self, query: str, k: int) -> list[str]:
+        self.calls.append((query, k))
+        return [f"{query}:{i}" for i in range(k)]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_is_cached_on_normalised_query():
+    service = CountingRAGService()
+
+    first = await service.retrieve("What is  AgentScope?", k=2)
+    second = await service.retrieve("  what is agentscope? ", k=2)
+
+    assert first == second
+    assert len(service.calls) == 1
+    assert service.stats() == {
+        "cache_hits": 1,
+        "cache_misses": 1,
+        "cache_size": 1,
+    }
+
+    await service.retrieve("What is AgentScope?", k=3)
+    assert len(service.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_retrieve_cache_ttl_and_lru(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        "agentscope_runtime.engine.services.rag_service.time.monotonic",
+        lambda: now[0],
+    )
+    service = CountingRAGService(cache_size=2, cache_ttl=10)
+
+    await service.retrieve("a")
+    await service.retrieve("b")
+    await service.retrieve("a")
+    await service.retrieve("c")  # evicts "b", the least recently used
+    assert len(service.calls) == 3
+
+    await service.retrieve("a")
+    assert len(service.calls) == 3
+    await service.retrieve("b")
+    assert len(service.calls) == 4
+
+    now[0] += 11
+    await service.retrieve("a")
+    assert len(service.calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_retrieve_without_cache():
+    service = CountingRAGService(cache_size=0)
+
+    await service.retrieve("query")
+    await service.retrieve("query")
+
+    assert len(service.calls) == 2
+    assert service.stats()["cache_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_langchain_retrieve_is_cached():
+    vectorstore = MagicMock()
+    vectorstore.similarity_search.return_value = [
+        MagicMock(page_content="doc"),
+    ]
+    service = LangChainRAGService(vectorstore=vectorstore, embedding=object())
+
+    assert await service.retrieve("query", k=1) == ["doc"]
+    assert await service.retrieve("query", k=1) == ["doc"]
+    vectorstore.similarity_search.assert_called_once_with("query", k=1)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from agentscope_runtime.common.collections import RedisMapping
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def test_scan_iterates_over_every_page(client):
+    mapping = RedisMapping(client, prefix="session_mapping", scan_count=10)
+    for i in range(95):
+        mapping.set(f"ctx-{i}", [f"c{i}"])
+    client.set("other", "1")
+
+    with patch.object(client, "scan", wraps=client.scan) as scan:
+        keys = set(mapping.scan())
+    assert keys == {f"ctx-{i}" for i in range(95)}
+    assert scan.call_count > 1
+    assert all(call.kwargs["count"] == 10 for call in scan.call_args_list)
+
+    assert set(mapping.scan("ctx-9")) == {"ctx-9"} | {
+        f"ctx-9{i}" for i in range(5)
+    }
+
+
+def test_scan_items_fetches_values_in_batches(client):
+    mapping = RedisMapping(client, scan_count=50)
+    for i in range(120):
+        mapping.set(f"container-{i}", {"container_name": f"container-{i}"})
+    client.rpush("container-pool", "item")
+
+    with patch.object(client, "get") as get, patch.object(
+        client,
+        "mget",
+        wraps=client.mget,
+    ) as mget:
+        items = dict(mapping.scan_items("container-"))
+    get.assert_not_called()
+    assert mget.call_count < 120
+    assert len(items) == 120
+    assert items["container-7"] == {"container_name": "container-7"}
+
+
+def test_scan_escapes_the_prefix(client):
+    mapping = RedisMapping(client)
+    mapping.set("a*b", 1)
+    mapping.set("axb", 2)
+
+    assert dict(mapping.scan_items("a*")) == {"a*b": 1}
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=redefined-outer-name, protected-access
+import asyncio
+import json
+
 import pytest
 import pytest_asyncio
 import fakeredis.aioredis
@@ -197,10 +200,13 @@ async def test_delete_memory_session(memory_service: RedisMemoryService):
     assert len(retrieved) == 1
     assert msg2.dict() == retrieved[0].dict()
 
-    hash_keys = await memory_service._redis.hkeys(
-        memory_service._user_key(user_id),
+    session_ids = await memory_service._redis.smembers(
+        memory_service._index_key(user_id),
+    )
+    assert session_id not in session_ids
+    assert not await memory_service._redis.exists(
+        memory_service._session_key(user_id, session_id),
     )
-    assert session_id not in hash_keys
 
 
 @pytest.mark.asyncio
@@ -214,8 +220,8 @@ async def test_delete_memory_user(memory_service: RedisMemoryService):
 
     await memory_service.delete_memory(user_id)
 
-    keys = await memory_service._redis.keys(memory_service._user_key(user_id))
-    assert memory_service._user_key(user_id) not in keys
+    keys = await memory_service._redis.keys(f"*{user_id}*")
+    assert keys == []
     retrieved = await memory_service.search_memory(
         user_id,
         [create_message(Role.USER, "some")],
@@ -242,3 +248,137 @@ async def test_operations_on_non_existent_user(
     # Should not raise any error
     await memory_service.delete_memory(user_id)
     await memory_service.delete_memory(user_id, "some_session")
+
+
+@pytest.mark.asyncio
+async def test_add_memory_is_append_only(
+    memory_service: RedisMemoryService,
+):
+    user_id = "user_append"
+    await memory_service.delete_user_memory(user_id)
+    msg1 = create_message(Role.USER, "apple banana")
+    msg2 = create_message(Role.USER, "cherry")
+    await memory_service.add_memory(user_id, [msg1], "session1")
+    await memory_service.add_memory(user_id, [msg2], "session1")
+
+    redis_client = memory_service._redis
+    assert await redis_client.smembers(
+        memory_service._index_key(user_id),
+    ) == {"session1"}
+    assert await redis_client.lrange(
+        memory_service._text_key(user_id, "session1"),
+        0,
+        -1,
+    ) == ["apple banana", "cherry"]
+    assert (
+        await redis_client.llen(
+            memory_service._session_key(user_id, "session1"),
+        )
+        == 2
+    )
+
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "cherry")],
+    )
+    assert [m.dict() for m in retrieved] == [msg2.dict()]
+
+
+@pytest.mark.asyncio
+async def test_legacy_hash_memory_is_migrated(
+    memory_service: RedisMemoryService,
+):
+    user_id = "user_legacy"
+    await memory_service.delete_user_memory(user_id)
+    old_msgs = [
+        create_message(Role.USER, "stored in a hash"),
+        create_message(Role.ASSISTANT, "also stored in a hash"),
+    ]
+    await memory_service._redis.hset(
+        memory_service._legacy_user_key(user_id),
+        "session1",
+        json.dumps([m.dict() for m in old_msgs]),
+    )
+
+    assert await memory_service.migrate_legacy_memory() == 1
+    assert not await memory_service._redis.exists(
+        memory_service._legacy_user_key(user_id),
+    )
+
+    new_msg = create_message(Role.USER, "stored in a list")
+    await memory_service.add_memory(user_id, [new_msg], "session1")
+    listed = await memory_service.list_memory(user_id)
+    assert [m.dict() for m in listed] == [
+        m.dict() for m in old_msgs + [new_msg]
+    ]
+
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "hash")],
+    )
+    assert [m.dict() for m in retrieved] == [m.dict() for m in old_msgs]
+
+
+@pytest.mark.asyncio
+async def test_legacy_hash_memory_is_migrated_lazily(
+    memory_service: RedisMemoryService,
+):
+    user_id = "user_lazy"
+    await memory_service.delete_user_memory(user_id)
+    msg = create_message(Role.USER, "legacy message")
+    await memory_service._redis.hset(
+        memory_service._legacy_user_key(user_id),
+        "session1",
+        json.dumps([msg.dict()]),
+    )
+
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "legacy")],
+    )
+    assert [m.dict() for m in retrieved] == [msg.dict()]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_migrations_copy_once(
+    memory_service: RedisMemoryService,
+):
+    user_id = "user_concurrent"
+    await memory_service.delete_user_memory(user_id)
+    msg = create_message(Role.USER, "legacy message")
+    await memory_service._redis.hset(
+        memory_service._legacy_user_key(user_id),
+        "session1",
+        json.dumps([msg.dict()]),
+    )
+
+    await asyncio.gather(
+        *[memory_service._migrate_user(user_id) for _ in range(5)],
+    )
+    listed = await memory_service.list_memory(user_id)
+    assert [m.dict() for m in listed] == [msg.dict()]
+
+
+@pytest.mark.asyncio
+async def test_migrated_users_are_bounded(
+    memory_service: RedisMemoryService,
+    monkeypatch,
+):
+    monkeypatch.setattr(
+        "agentscope_runtime.engine.services.redis_memory_service"
+        "._MIGRATED_USERS_MAXSIZE",
+        2,
+    )
+    for user_id in ("user_a", "user_b", "user_a", "user_c"):
+        await memory_service.list_memory(user_id)
+    assert list(memory_service._migrated_users) == ["user_a", "user_c"]
+
+    # An evicted user is migrated again when it has legacy memories
+    msg = create_message(Role.USER, "late legacy message")
+    await memory_service._redis.hset(
+        memory_service._legacy_user_key("user_b"),
+        "session1",
+        json.dumps([msg.dict()]),
+    )
+    listed = await memory_service.list_memory("user_b")
+    assert [m.dict() for m in listed] == [msg.dict()]
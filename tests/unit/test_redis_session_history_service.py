@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
-# pylint: disable=redefined-outer-name
+# pylint: disable=redefined-outer-name, protected-access
+import asyncio
+import json
+
 import pytest
 import pytest_asyncio
 import fakeredis.aioredis
-from agentscope_runtime.engine.schemas.agent_schemas import TextContent
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    Message,
+    TextContent,
+)
 from agentscope_runtime.engine.services.session_history_service import (
     Session,
 )
@@ -290,3 +296,166 @@ async def test_append_message(
     assert (
         retrieved_session.messages == []
     )  # Empty as it's a newly created session
+
+
+@pytest.mark.asyncio
+async def test_append_message_is_append_only(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that messages are kept in a Redis list apart from metadata."""
+    await session_history_service.delete_user_sessions(user_id)
+    session = await session_history_service.create_session(user_id)
+
+    await asyncio.gather(
+        *[
+            session_history_service.append_message(
+                session,
+                {"role": "user", "content": [TextContent(text=f"msg {i}")]},
+            )
+            for i in range(10)
+        ],
+    )
+
+    redis_client = session_history_service._redis
+    meta = json.loads(
+        await redis_client.get(
+            session_history_service._session_key(user_id, session.id),
+        ),
+    )
+    assert "messages" not in meta
+    assert (
+        await redis_client.llen(
+            session_history_service._messages_key(user_id, session.id),
+        )
+        == 10
+    )
+
+    stored_session = await session_history_service.get_session(
+        user_id,
+        session.id,
+    )
+    assert len(stored_session.messages) == 10
+
+
+@pytest.mark.asyncio
+async def test_legacy_session_is_migrated(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that sessions stored as a single JSON blob are still readable
+    and are moved to the list layout on first access."""
+    await session_history_service.delete_user_sessions(user_id)
+    legacy_session = Session(
+        id="legacy",
+        user_id=user_id,
+        messages=[
+            Message(role="user", content=[TextContent(text="old message")]),
+        ],
+    )
+    redis_client = session_history_service._redis
+    await redis_client.set(
+        session_history_service._session_key(user_id, "legacy"),
+        legacy_session.model_dump_json(),
+    )
+    await redis_client.sadd(
+        session_history_service._index_key(user_id),
+        "legacy",
+    )
+
+    session = await session_history_service.get_session(user_id, "legacy")
+    assert len(session.messages) == 1
+    assert session.messages[0].content[0].text == "old message"
+
+    await session_history_service.append_message(
+        session,
+        {"role": "assistant", "content": [TextContent(text="new message")]},
+    )
+    stored_session = await session_history_service.get_session(
+        user_id,
+        "legacy",
+    )
+    assert [m.content[0].text for m in stored_session.messages] == [
+        "old message",
+        "new message",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_session_with_history_window(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that only the most recent messages are loaded."""
+    await session_history_service.delete_user_sessions(user_id)
+    session = await session_history_service.create_session(user_id)
+    await session_history_service.append_message(
+        session,
+        [
+            {"role": "user", "content": [TextContent(text=f"msg {i}")]}
+            for i in range(5)
+        ],
+    )
+
+    windowed = await session_history_service.get_session(
+        user_id,
+        session.id,
+        history_window=2,
+    )
+    assert [m.content[0].text for m in windowed.messages] == [
+        "msg 3",
+        "msg 4",
+    ]
+
+    empty = await session_history_service.get_session(
+        user_id,
+        session.id,
+        history_window=0,
+    )
+    assert empty.messages == []
+
+    full = await session_history_service.get_session(user_id, session.id)
+    assert len(full.messages) == 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_legacy_migrations_keep_appended_messages(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that a worker migrating a session already migrated by another
+    one does not drop the messages appended meanwhile."""
+    await session_history_service.delete_user_sessions(user_id)
+    legacy_json = Session(
+        id="legacy",
+        user_id=user_id,
+        messages=[
+            Message(role="user", content=[TextContent(text="old message")]),
+        ],
+    ).model_dump_json()
+    redis_client = session_history_service._redis
+    await redis_client.set(
+        session_history_service._session_key(user_id, "legacy"),
+        legacy_json,
+    )
+
+    session = await session_history_service.get_session(user_id, "legacy")
+    await session_history_service.append_message(
+        session,
+        {"role": "assistant", "content": [TextContent(text="new message")]},
+    )
+    # A second worker which read the legacy blob before the migration
+    await session_history_service._migrate_legacy_session(
+        user_id,
+        "legacy",
+        legacy_json,
+    )
+
+    stored_session = await session_history_service.get_session(
+        user_id,
+        "legacy",
+    )
+    assert [m.content[0].text for m in stored_session.messages] == [
+        "old message",
+        "new message",
+    ]
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name, protected-access
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentscope_runtime.sandbox.client import SandboxHttpClient
+from agentscope_runtime.sandbox.enums import SandboxType
+from agentscope_runtime.sandbox.manager import SandboxManager
+from agentscope_runtime.sandbox.model import SandboxManagerEnvConfig
+
+
+@pytest.fixture
+def docker_client():
+    client = MagicMock()
+    client.inspect.return_value = None
+    client.create.return_value = ("container-id", [49152], "localhost")
+    client.get_status.return_value = "running"
+    client.inspect_status.return_value = "running"
+    with patch(
+        "agentscope_runtime.common.container_clients.docker_client"
+        ".DockerClient",
+        return_value=client,
+    ):
+        yield client
+
+
+@pytest.fixture
+def http_client():
+    client = MagicMock(spec=SandboxHttpClient)
+    client.reset.return_value = {"isError": False, "content": []}
+    with patch.object(SandboxManager, "_connect", return_value=client):
+        yield client
+
+
+def make_manager(tmp_path, **kwargs):
+    kwargs.setdefault("pool_size", 0)
+    config = SandboxManagerEnvConfig(
+        file_system="local",
+        redis_enabled=False,
+        container_deployment="docker",
+        default_mount_dir=str(tmp_path / "mounts"),
+        **kwargs,
+    )
+    return SandboxManager(config=config)
+
+
+def test_images_are_prefetched_on_demand(tmp_path, docker_client):
+    with make_manager(tmp_path):
+        docker_client.prefetch_images.assert_not_called()
+
+    with make_manager(tmp_path, image_prefetch="default"):
+        docker_client.prefetch_images.assert_called_once()
+
+
+def test_idle_container_is_released(tmp_path, docker_client):
+    with make_manager(tmp_path, idle_ttl=10) as manager:
+        name = manager.create()
+        assert manager.reap_idle_containers() == []
+
+        manager.access_mapping.set(name, time.time() - 20)
+        assert manager.reap_idle_containers() == [name]
+        assert manager.container_mapping.get(name) is None
+        assert manager.access_mapping.get(name) is None
+        docker_client.remove.assert_called_once()
+
+
+def test_idle_reaper_survives_cleanup(tmp_path, docker_client):
+    with make_manager(tmp_path, idle_ttl=10) as manager:
+        manager.cleanup()
+        assert manager.idle_reaper.running
+    assert not manager.idle_reaper.running
+
+
+def test_access_refreshes_last_access(tmp_path, docker_client):
+    with make_manager(tmp_path, idle_ttl=10) as manager:
+        name = manager.create()
+        manager.access_mapping.set(name, time.time() - 20)
+
+        manager.get_info(name)
+        assert manager.reap_idle_containers() == []
+
+
+def test_internal_lookups_do_not_refresh_last_access(tmp_path, docker_client):
+    with make_manager(tmp_path, idle_ttl=10) as manager:
+        name = manager.create()
+        manager.access_mapping.set(name, time.time() - 20)
+
+        manager.stop(name)
+        assert manager.access_mapping.get(name) < time.time() - 10
+
+
+def test_container_with_call_in_flight_is_not_reaped(
+    tmp_path,
+    docker_client,
+    http_client,
+):
+    with make_manager(tmp_path, idle_ttl=10) as manager:
+        name = manager.create()
+
+        def slow_call(*args):
+            manager.access_mapping.set(name, time.time() - 20)
+            assert manager.reap_idle_containers() == []
+            return {"isError": False, "content": []}
+
+        http_client.call_tool.side_effect = slow_call
+        manager.call_tool(name, "run_ipython_cell", {"code": "1"})
+
+        # Idle again from the end of the call on
+        assert manager.reap_idle_containers() == []
+        manager.access_mapping.set(name, time.time() - 20)
+        assert manager.reap_idle_containers() == [name]
+
+
+def test_ttl_per_sandbox_type(tmp_path, docker_client):
+    with make_manager(
+        tmp_path,
+        idle_ttl=10,
+        idle_ttl_by_type={"base": 1000},
+    ) as manager:
+        name = manager.create()
+        manager.access_mapping.set(name, time.time() - 20)
+        assert manager.reap_idle_containers() == []
+
+
+def test_no_tracking_without_ttl(tmp_path, docker_client):
+    with make_manager(tmp_path) as manager:
+        name = manager.create()
+        assert manager.idle_reaper is None
+        assert manager.access_mapping.get(name) is None
+
+
+def make_recycling_manager(tmp_path, **kwargs):
+    manager = make_manager(
+        tmp_path,
+        pool_size=2,
+        pool_replenish_interval=3600,
+        recycle_on_release=True,
+        **kwargs,
+    )
+    # Make room in the pool
+    manager.pool_queues[SandboxType.BASE].dequeue()
+    return manager
+
+
+def test_released_container_is_recycled(
+    tmp_path,
+    docker_client,
+    http_client,
+):
+    with make_recycling_manager(tmp_path) as manager:
+        name = manager.create(meta={"session_ctx_id": "ctx"})
+        before = manager.container_mapping.get(name)
+
+        assert manager.release(name)
+
+        docker_client.remove.assert_not_called()
+        token = http_client.reset.call_args.kwargs["secret_token"]
+        recycled = manager.container_mapping.get(name)
+        assert recycled["recycle_count"] == 1
+        assert recycled["meta"] == {}
+        assert recycled["runtime_token"] == token != before["runtime_token"]
+        assert recycled["storage_path"] != before["storage_path"]
+        assert manager.session_mapping.get("ctx") is None
+
+        queue = manager.pool_queues[SandboxType.BASE]
+        assert queue.size() == 2
+
+
+def test_cleanup_keeps_recycling_enabled(
+    tmp_path,
+    docker_client,
+    http_client,
+):
+    with make_recycling_manager(tmp_path) as manager:
+        in_use = manager.create()
+        manager.cleanup()
+        docker_client.close.assert_not_called()
+        assert manager.pool_replenisher.running
+
+        # Cleaned up containers are destroyed, not recycled
+        http_client.reset.assert_not_called()
+        assert manager.container_mapping.get(in_use) is None
+
+        name = manager.create()
+        assert manager.release(name)
+        http_client.reset.assert_called_once()
+        assert manager.container_mapping.get(name)["recycle_count"] == 1
+    docker_client.close.assert_called_once()
+    assert not manager.pool_replenisher.running
+
+
+def test_recycle_count_is_capped(tmp_path, docker_client, http_client):
+    with make_recycling_manager(tmp_path, max_recycles=0) as manager:
+        name = manager.create()
+        assert manager.release(name)
+
+        http_client.reset.assert_not_called()
+        docker_client.remove.assert_called_once()
+        assert manager.container_mapping.get(name) is None
+
+
+def test_failed_reset_destroys_container(
+    tmp_path,
+    docker_client,
+    http_client,
+):
+    http_client.reset.return_value = {"isError": True, "content": []}
+    with make_recycling_manager(tmp_path) as manager:
+        name = manager.create()
+        assert manager.release(name)
+
+        docker_client.remove.assert_called_once()
+        assert manager.container_mapping.get(name) is None
+
+
+def test_overlay_workspace_is_not_recycled(
+    tmp_path,
+    docker_client,
+    http_client,
+):
+    with make_recycling_manager(
+        tmp_path,
+        workspace_provisioning="overlay",
+    ) as manager:
+        name = manager.create()
+        assert manager.release(name)
+
+        http_client.reset.assert_not_called()
+        docker_client.remove.assert_called_once()
+
+
+def test_vnc_sandbox_is_not_recycled(tmp_path, docker_client, http_client):
+    config = SandboxManagerEnvConfig(
+        file_system="local",
+        redis_enabled=False,
+        container_deployment="docker",
+        default_mount_dir=str(tmp_path / "mounts"),
+        pool_size=2,
+        pool_replenish_interval=3600,
+        recycle_on_release=True,
+    )
+    with SandboxManager(config=config, default_type="gui") as manager:
+        # Make room in the pool
+        manager.pool_queues[SandboxType.GUI].dequeue()
+        name = manager.create(sandbox_type="gui")
+        assert manager.release(name)
+
+        http_client.reset.assert_not_called()
+        docker_client.remove.assert_called_once()
+        assert manager.container_mapping.get(name) is None
+        assert manager.pool_queues[SandboxType.GUI].size() == 1
+
+
+def test_create_and_release_batch(tmp_path, docker_client):
+    with make_manager(tmp_path) as manager:
+        names = manager.create_batch(count=3, meta={"session_ctx_id": "s"})
+        assert len(set(names)) == 3
+        assert sorted(manager.get_session_mapping("s")) == sorted(names)
+
+        assert manager.release_batch(names) == dict.fromkeys(names, True)
+        assert manager.get_session_mapping("s") == []
+        assert docker_client.remove.call_count == 3
+
+
+def test_iter_create_batch_reports_failures(tmp_path, docker_client):
+    with make_manager(tmp_path) as manager:
+        docker_client.create.side_effect = [
+            ("container-id", [49152], "localhost"),
+            RuntimeError("no capacity"),
+        ]
+        items = list(manager.iter_create_batch(count=2))
+
+        assert sorted(item["index"] for item in items) == [0, 1]
+        assert sum(item["container_name"] is None for item in items) == 1
+
+
+def test_batch_size_is_capped(tmp_path, docker_client):
+    with make_manager(tmp_path, max_batch_size=2) as manager:
+        with pytest.raises(ValueError):
+            manager.create_batch(count=3)
+        docker_client.create.assert_not_called()
+
+
+def test_closed_batch_releases_undelivered_sandboxes(
+    tmp_path,
+    docker_client,
+):
+    docker_client.create.side_effect = [
+        (f"container-{i}", [49152 + i], "localhost") for i in range(3)
+    ]
+    with make_manager(tmp_path) as manager:
+        iterator = manager.iter_create_batch(count=3)
+        kept = next(iterator)["container_name"]
+        iterator.close()
+
+        # Creations not started yet are cancelled, the others released
+        def released():
+            removed = docker_client.remove.call_count
+            return removed == docker_client.create.call_count - 1
+
+        deadline = time.time() + 5
+        while not released() and time.time() < deadline:
+            time.sleep(0.01)
+        assert released()
+        assert list(manager.container_mapping.scan("")) == [kept]
+
+
+def test_uploads_continue_after_cleanup(tmp_path, docker_client):
+    storage_folder = tmp_path / "storage"
+    with make_manager(
+        tmp_path,
+        storage_folder=str(storage_folder),
+        background_upload=True,
+    ) as manager:
+        manager.cleanup()
+
+        name = manager.create()
+        info = manager.get_info(name)
+        write_note(info["mount_dir"])
+        assert manager.release(name)
+        manager._wait_for_upload(info["storage_path"])
+        assert os.path.isfile(f"{info['storage_path']}/notes.txt")
+
+
+def write_note(mount_dir):
+    with open(f"{mount_dir}/notes.txt", "w", encoding="utf-8") as f:
+        f.write("kept")
+
+
+def test_workspace_is_uploaded_in_background(tmp_path, docker_client):
+    storage_folder = tmp_path / "storage"
+    with make_manager(
+        tmp_path,
+        storage_folder=str(storage_folder),
+        background_upload=True,
+    ) as manager:
+        name = manager.create()
+        info = manager.get_info(name)
+        with open(
+            f"{info['mount_dir']}/notes.txt",
+            "w",
+            encoding="utf-8",
+        ) as f:
+            f.write("kept")
+
+        assert manager.release(name)
+        # A new session of the same storage path waits for the upload
+        manager._wait_for_upload(info["storage_path"])
+        with open(
+            f"{info['storage_path']}/notes.txt",
+            encoding="utf-8",
+        ) as f:
+            assert f.read() == "kept"
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import threading
+
+import pytest
+
+from agentscope_runtime.common.collections import (
+    InMemoryMapping,
+    InMemoryQueue,
+    InMemorySessionBindings,
+    RedisMapping,
+    RedisQueue,
+    RedisSessionBindings,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        mappings = [InMemoryMapping() for _ in range(3)]
+        queue = InMemoryQueue()
+        bindings = InMemorySessionBindings(*mappings)
+    else:
+        # Lua scripting support of fakeredis
+        pytest.importorskip("lupa")
+        import fakeredis
+
+        client = fakeredis.FakeRedis(decode_responses=True)
+        mappings = [
+            RedisMapping(client),
+            RedisMapping(client, prefix="session_mapping"),
+            RedisMapping(client, prefix="container_last_access"),
+        ]
+        queue = RedisQueue(client, "pool")
+        bindings = RedisSessionBindings(*mappings)
+    return bindings, queue, *mappings
+
+
+def container(name, meta=None):
+    return {
+        "container_name": name,
+        "ports": [],
+        "meta": meta or {},
+        "extra": {},
+    }
+
+
+def test_bind_and_unbind(store):
+    bindings, _, containers, sessions, accesses = store
+
+    bindings.bind(container("c1"), session_ctx_id="s", accessed_at=1.5)
+    bindings.bind(container("c2"), session_ctx_id="s")
+    bindings.bind(container("c2"), session_ctx_id="s")
+    assert containers.get("c1") == container("c1")
+    assert sessions.get("s") == ["c1", "c2"]
+    assert accesses.get("c1") == 1.5
+    assert accesses.get("c2") is None
+
+    assert bindings.unbind("c1", session_ctx_id="s")
+    assert containers.get("c1") is None
+    assert accesses.get("c1") is None
+    assert sessions.get("s") == ["c2"]
+
+    assert not bindings.unbind("c1", session_ctx_id="s")
+    assert bindings.unbind("c2", session_ctx_id="s")
+    assert sessions.get("s") is None
+
+
+def test_bind_from_pool(store):
+    bindings, queue, containers, sessions, accesses = store
+    assert bindings.bind_from_pool(queue, meta={"session_ctx_id": "s"}) is None
+
+    for name in ("c1", "c2"):
+        containers.set(name, container(name))
+        queue.enqueue(container(name))
+
+    meta = {"session_ctx_id": "s", "options": {}}
+    bound = bindings.bind_from_pool(queue, meta=meta, accessed_at=2.0)
+    assert bound == container("c1", meta)
+    assert containers.get("c1") == bound
+    assert sessions.get("s") == ["c1"]
+    assert accesses.get("c1") == 2.0
+
+    # Without meta, the container is only taken out of the pool
+    assert bindings.bind_from_pool(queue) == container("c2")
+    assert containers.get("c2") == container("c2")
+    assert queue.size() == 0
+
+
+def test_concurrent_binds_keep_every_container(store):
+    bindings, _, _, sessions, _ = store
+
+    threads = [
+        threading.Thread(
+            target=bindings.bind,
+            args=(container(f"c{i}"), "s"),
+        )
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(sessions.get("s")) == sorted(f"c{i}" for i in range(20))
+
+
+def test_bind_from_pool_waits_for_a_container(store):
+    bindings, queue, containers, sessions, _ = store
+    assert bindings.bind_from_pool(queue, timeout=0.1) is None
+
+    containers.set("c1", container("c1"))
+    timer = threading.Timer(0.1, queue.enqueue, args=(container("c1"),))
+    timer.start()
+    bound = bindings.bind_from_pool(
+        queue,
+        meta={"session_ctx_id": "s"},
+        timeout=5,
+    )
+    timer.join()
+    assert bound == container("c1", {"session_ctx_id": "s"})
+    assert containers.get("c1") == bound
+    assert sessions.get("s") == ["c1"]
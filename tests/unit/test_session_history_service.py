@@ -266,3 +266,61 @@ async def test_append_message(
     assert (
         retrieved_session.messages == []
     )  # Empty as it's a newly created session
+
+
+@pytest.mark.asyncio
+async def test_get_session_with_history_window(
+    session_history_service: InMemorySessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that only the most recent messages are loaded."""
+    session = await session_history_service.create_session(user_id)
+    await session_history_service.append_message(
+        session,
+        [
+            {"role": "user", "content": [TextContent(text=f"msg {i}")]}
+            for i in range(5)
+        ],
+    )
+
+    windowed = await session_history_service.get_session(
+        user_id,
+        session.id,
+        history_window=2,
+    )
+    assert [m["content"][0].text for m in windowed.messages] == [
+        "msg 3",
+        "msg 4",
+    ]
+
+    empty = await session_history_service.get_session(
+        user_id,
+        session.id,
+        history_window=0,
+    )
+    assert empty.messages == []
+
+    full = await session_history_service.get_session(user_id, session.id)
+    assert len(full.messages) == 5
+
+
+@pytest.mark.asyncio
+async def test_get_session_shares_messages(
+    session_history_service: InMemorySessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that snapshots share stored messages but not the list."""
+    session = await session_history_service.create_session(user_id)
+    await session_history_service.append_message(
+        session,
+        {"role": "user", "content": [TextContent(text="Hello")]},
+    )
+
+    first = await session_history_service.get_session(user_id, session.id)
+    second = await session_history_service.get_session(user_id, session.id)
+    assert first.messages is not second.messages
+    assert first.messages[0] is second.messages[0]
+
+    first.messages.append({"role": "user", "content": "local only"})
+    refetched = await session_history_service.get_session(user_id, session.id)
+    assert len(refetched.messages) == 1
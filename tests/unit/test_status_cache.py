@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import queue
+import threading
+import time
+
+import pytest
+
+from agentscope_runtime.common.container_clients.status_cache import (
+    ContainerStatusCache,
+    DELETED,
+)
+
+
+class FakeBackend:
+    def __init__(self):
+        self.states = {}
+        self.fetched = []
+        self.events = queue.Queue()
+
+    def fetch(self, key):
+        self.fetched.append(key)
+        return self.states.get(key)
+
+    def watch(self):
+        while True:
+            event = self.events.get()
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    def emit(self, keys, state):
+        self.events.put((keys, state))
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def cache(backend):
+    cache = ContainerStatusCache(
+        fetch=backend.fetch,
+        watch=backend.watch,
+        parse=lambda event: event,
+        retry_interval=0.01,
+    )
+    cache.start()
+    assert wait_for(lambda: cache.live)
+    yield cache
+    cache.stop()
+
+
+def test_events_answer_lookups(cache, backend):
+    backend.emit(("id-1", "name-1"), "running")
+    assert wait_for(lambda: cache.get("name-1") == "running")
+    backend.fetched.clear()
+
+    assert cache.get("id-1") == "running"
+    assert cache.get("name-1") == "running"
+    assert not backend.fetched
+
+    backend.emit(("id-1", "name-1"), "exited")
+    assert wait_for(lambda: cache.get("id-1") == "exited")
+    assert not backend.fetched
+
+
+def test_miss_falls_back_to_fetch_once(cache, backend):
+    backend.states["id-1"] = "running"
+
+    assert cache.get("id-1") == "running"
+    assert cache.get("id-1") == "running"
+    assert backend.fetched == ["id-1"]
+
+
+def test_invalidate_and_delete(cache, backend):
+    backend.emit(("id-1", "name-1"), "running")
+    assert wait_for(lambda: cache.get("id-1") == "running")
+    backend.fetched.clear()
+
+    backend.states["id-1"] = "exited"
+    cache.invalidate("name-1")
+    assert cache.get("id-1") == "exited"
+    assert backend.fetched == ["id-1"]
+
+    backend.states.clear()
+    backend.emit(("id-1", "name-1"), DELETED)
+    assert wait_for(lambda: cache.get("name-1") is None)
+
+
+def test_wait_for_is_woken_up_by_events(cache, backend):
+    backend.states["id-1"] = "created"
+
+    def start_later():
+        time.sleep(0.1)
+        backend.states["id-1"] = "running"
+        backend.emit(("id-1",), "running")
+
+    threading.Thread(target=start_later).start()
+    started = time.monotonic()
+    state = cache.wait_for(
+        "id-1",
+        lambda s: s == "running",
+        timeout=5,
+        poll_interval=5,
+    )
+
+    assert state == "running"
+    assert time.monotonic() - started < 2
+
+
+def test_stream_failure_falls_back_to_fetch(cache, backend):
+    backend.emit(("id-1",), "running")
+    assert wait_for(lambda: cache.get("id-1") == "running")
+
+    backend.events.put(RuntimeError("connection lost"))
+    backend.states["id-1"] = "exited"
+    # Reconnected, without the states possibly missed meanwhile
+    assert wait_for(lambda: cache.get("id-1") == "exited")
@@ -7,6 +7,7 @@ import pytest_asyncio
 from tablestore_for_agent_memory.base.base_memory_store import (
     Session as TablestoreSession,
 )
+from tablestore_for_agent_memory.base.common import Order
 
 from agentscope_runtime.engine.schemas.agent_schemas import (
     ContentType,
@@ -190,6 +191,53 @@ async def test_get_session(
     assert non_existent_session.messages == []
 
 
+@pytest.mark.asyncio
+async def test_get_session_with_history_window(
+    tablestore_session_history_service: TablestoreSessionHistoryService,
+    user_id: str,
+    mock_memory_store,
+) -> None:
+    """Tests that a history window reads only the newest messages."""
+    session_id = "test_session_id"
+    mock_memory_store.get_session.return_value = TablestoreSession(
+        session_id=session_id,
+        user_id=user_id,
+    )
+
+    session = Session(id=session_id, user_id=user_id)
+    # Tablestore returns the newest message first when reading DESC.
+    mock_messages = [
+        convert_message_to_tablestore_message(
+            create_message("user", "second"),
+            session,
+        ),
+        convert_message_to_tablestore_message(
+            create_message("user", "first"),
+            session,
+        ),
+    ]
+    mock_memory_store.list_messages.return_value = AsyncMock()
+    mock_memory_store.list_messages.return_value.__aiter__.return_value = iter(
+        mock_messages,
+    )
+
+    retrieved_session = await tablestore_session_history_service.get_session(
+        user_id,
+        session_id,
+        history_window=2,
+    )
+
+    mock_memory_store.list_messages.assert_called_once_with(
+        session_id=session_id,
+        order=Order.DESC,
+        max_count=2,
+    )
+    assert [m.content[0].text for m in retrieved_session.messages] == [
+        "first",
+        "second",
+    ]
+
+
 @pytest.mark.asyncio
 async def test_delete_session(
     tablestore_session_history_service: TablestoreSessionHistoryService,
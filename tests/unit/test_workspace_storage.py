@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+import os
+from unittest.mock import patch
+
+import oss2
+import pytest
+
+from agentscope_runtime.sandbox.manager.storage import (
+    LocalStorage,
+    OSSStorage,
+)
+from agentscope_runtime.sandbox.manager.storage.manifest import (
+    MANIFEST_NAME,
+    Manifest,
+    scan_folder,
+)
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    write(str(root / "a.txt"), "a")
+    write(str(root / "sub" / "b.txt"), "b")
+    os.makedirs(root / "empty")
+    return str(root)
+
+
+def test_local_storage_copies_only_changed_files(tmp_path, workspace):
+    storage = LocalStorage(max_workers=4)
+    destination = str(tmp_path / "storage")
+
+    storage.upload_folder(workspace, destination)
+    assert os.path.isdir(os.path.join(destination, "empty"))
+    with open(
+        os.path.join(destination, "sub", "b.txt"),
+        encoding="utf-8",
+    ) as f:
+        assert f.read() == "b"
+
+    write(os.path.join(workspace, "a.txt"), "changed")
+    with patch("shutil.copy2") as copy2:
+        storage.upload_folder(workspace, destination)
+    copy2.assert_called_once()
+    assert [os.path.normpath(path) for path in copy2.call_args.args] == [
+        os.path.join(workspace, "a.txt"),
+        os.path.join(destination, "a.txt"),
+    ]
+
+
+def test_scan_folder_reuses_unchanged_hashes(workspace):
+    manifest = scan_folder(workspace)
+    assert set(manifest.files) == {"a.txt", "sub/b.txt"}
+    assert manifest.dirs == {"sub", "empty"}
+
+    with patch(
+        "agentscope_runtime.sandbox.manager.storage.manifest.calculate_md5",
+    ) as md5:
+        assert scan_folder(workspace, manifest).files == manifest.files
+    md5.assert_not_called()
+
+    # Touched but identical: the hash is computed again, and matches
+    os.utime(os.path.join(workspace, "a.txt"), (0, 0))
+    current = scan_folder(workspace, manifest)
+    assert current.files["a.txt"].mtime == 0
+    assert not manifest.changes(current)
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+        self.uploads = []
+
+    def get_object(self, key):
+        if key not in self.objects:
+            raise oss2.exceptions.NoSuchKey(404, {}, b"", {})
+        content = self.objects[key]
+
+        class Result:
+            def read(self):
+                return content
+
+        return Result()
+
+    def put_object(self, key, data):
+        self.objects[key] = data
+
+    def put_object_from_file(self, key, path):
+        self.uploads.append(key)
+        with open(path, "rb") as f:
+            self.objects[key] = f.read()
+
+    def get_object_to_file(self, key, path):
+        with open(path, "wb") as f:
+            f.write(self.objects[key])
+
+
+class FakeObject:
+    def __init__(self, key, size):
+        self.key = key
+        self.size = size
+
+
+@pytest.fixture
+def oss_storage():
+    with patch("oss2.Bucket", return_value=FakeBucket()), patch(
+        "oss2.ObjectIterator",
+        side_effect=lambda bucket, prefix: [
+            FakeObject(key, len(value))
+            for key, value in sorted(bucket.objects.items())
+            if key.startswith(prefix)
+        ],
+    ):
+        yield OSSStorage("id", "secret", "endpoint", "bucket")
+
+
+def test_oss_upload_is_incremental(oss_storage, workspace):
+    bucket = oss_storage.bucket
+
+    oss_storage.upload_folder(workspace, "session")
+    assert sorted(bucket.uploads) == ["session/a.txt", "session/sub/b.txt"]
+    assert "session/empty/" in bucket.objects
+    manifest = Manifest.loads(bucket.objects[f"session/{MANIFEST_NAME}"])
+    assert set(manifest.files) == {"a.txt", "sub/b.txt"}
+
+    bucket.uploads.clear()
+    oss_storage.upload_folder(workspace, "session")
+    assert not bucket.uploads
+
+    write(os.path.join(workspace, "sub", "b.txt"), "changed")
+    oss_storage.upload_folder(workspace, "session")
+    assert bucket.uploads == ["session/sub/b.txt"]
+
+
+def test_oss_download_round_trip(oss_storage, tmp_path, workspace):
+    bucket = oss_storage.bucket
+    oss_storage.upload_folder(workspace, "session")
+    destination = str(tmp_path / "restored")
+
+    oss_storage.download_folder("session", destination)
+    assert not os.path.exists(os.path.join(destination, MANIFEST_NAME))
+    assert os.path.isdir(os.path.join(destination, "empty"))
+    with open(
+        os.path.join(destination, "sub", "b.txt"),
+        encoding="utf-8",
+    ) as f:
+        assert f.read() == "b"
+
+    # Downloaded files keep their recorded state: nothing to upload back
+    bucket.uploads.clear()
+    oss_storage.upload_folder(destination, "session")
+    assert not bucket.uploads
+
+
+def test_local_storage_clone_falls_back_to_copy(tmp_path, workspace):
+    storage = LocalStorage(max_workers=4, provisioning="clone")
+    destination = str(tmp_path / "cloned")
+
+    storage.download_folder(workspace, destination)
+    for path in ("a.txt", os.path.join("sub", "b.txt")):
+        source = os.stat(os.path.join(workspace, path))
+        cloned = os.stat(os.path.join(destination, path))
+        assert (cloned.st_size, cloned.st_mtime) == (
+            source.st_size,
+            source.st_mtime,
+        )
+    assert os.path.isdir(os.path.join(destination, "empty"))
+
+    # Nothing was mounted, releasing leaves the workspace alone
+    storage.release_folder(destination)
+    assert os.path.isfile(os.path.join(destination, "a.txt"))
+
+
+def test_local_storage_overlay(tmp_path, workspace):
+    storage = LocalStorage(provisioning="overlay")
+    destination = str(tmp_path / "overlay")
+
+    storage.download_folder(workspace, destination)
+    if not os.path.ismount(destination):
+        # Without overlay support, the workspace is cloned instead
+        assert not os.path.exists(destination + ".overlay")
+        with open(os.path.join(destination, "a.txt"), encoding="utf-8") as f:
+            assert f.read() == "a"
+        pytest.skip("overlay mounts are not supported here")
+
+    write(os.path.join(destination, "a.txt"), "changed")
+    os.remove(os.path.join(destination, "sub", "b.txt"))
+    with open(os.path.join(workspace, "a.txt"), encoding="utf-8") as f:
+        assert f.read() == "a"
+
+    # The overlay is unmounted before its lower layer is written
+    storage.upload_folder(destination, workspace)
+    assert not os.path.ismount(destination)
+    storage.release_folder(destination)
+    assert not os.path.exists(destination + ".overlay")
+    with open(os.path.join(workspace, "a.txt"), encoding="utf-8") as f:
+        assert f.read() == "changed"
+    assert not os.path.exists(os.path.join(workspace, "sub", "b.txt"))
+
+
+def test_local_storage_merges_overlay_layer(tmp_path, workspace):
+    storage = LocalStorage(provisioning="overlay")
+    destination = str(tmp_path / "unmounted")
+    layers = destination + ".overlay"
+    upper = os.path.join(layers, "upper")
+    os.makedirs(destination)
+    write(os.path.join(layers, "lower"), workspace)
+    write(os.path.join(upper, "a.txt"), "changed")
+    write(os.path.join(upper, "new", "c.txt"), "c")
+    # fuse-overlayfs whiteout and opaque directory markers
+    write(os.path.join(upper, "sub", ".wh.b.txt"), "")
+    write(os.path.join(upper, "empty", ".wh..wh..opq"), "")
+    write(os.path.join(upper, "empty", "d.txt"), "d")
+    write(os.path.join(workspace, "empty", "old.txt"), "old")
+
+    storage.upload_folder(destination, workspace)
+
+    assert not os.path.exists(layers)
+    with open(os.path.join(workspace, "a.txt"), encoding="utf-8") as f:
+        assert f.read() == "changed"
+    assert os.path.isfile(os.path.join(workspace, "new", "c.txt"))
+    assert sorted(os.listdir(os.path.join(workspace, "sub"))) == []
+    assert sorted(os.listdir(os.path.join(workspace, "empty"))) == ["d.txt"]